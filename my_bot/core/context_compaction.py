@@ -0,0 +1,137 @@
+# /my_bot/core/context_compaction.py
+"""
+Context Compaction
+
+Keeps the agent transcript inside the model's context window.
+
+Tool results are compacted before they are fed back to the LLM: JSON results
+keep their structure but lose empty fields, long lists are cut to their first
+items with a count of the rest, and long strings are shortened; plain-text
+results have blank and repeated lines removed and are cut in the middle
+(the head and tail are usually the most useful parts).
+
+If the transcript still doesn't fit, the oldest tool results are compacted
+further, so the newest results and the system prompt / tool definitions
+(the cached prompt prefix) stay intact.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4  # Rough estimate for English text and JSON
+MAX_TOOL_OUTPUT_CHARS = 6000  # ~1500 tokens per tool result
+MIN_TOOL_OUTPUT_CHARS = 800  # Floor when squeezing older results to make room
+MAX_LIST_ITEMS = 10
+MAX_STRING_CHARS = 500
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _compact_value(value: Any, max_list_items: int, max_string_chars: int) -> Any:
+    if isinstance(value, dict):
+        compacted = {}
+        for key, item in value.items():
+            if item is None or item == '' or item == [] or item == {}:
+                continue
+            compacted[key] = _compact_value(item, max_list_items, max_string_chars)
+        return compacted
+    if isinstance(value, list):
+        items = [_compact_value(item, max_list_items, max_string_chars) for item in value[:max_list_items]]
+        if len(value) > max_list_items:
+            items.append(f"... {len(value) - max_list_items} more items")
+        return items
+    if isinstance(value, str) and len(value) > max_string_chars:
+        return value[:max_string_chars] + f"... [{len(value) - max_string_chars} chars truncated]"
+    return value
+
+
+def _compact_text(text: str, max_chars: int) -> str:
+    lines = []
+    previous = None
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line.strip() or line == previous:
+            continue
+        lines.append(line)
+        previous = line
+    text = "\n".join(lines)
+
+    if len(text) <= max_chars:
+        return text
+    head = max_chars * 2 // 3
+    tail = max_chars - head
+    omitted = len(text) - head - tail
+    return f"{text[:head]}\n[... {omitted} chars omitted ...]\n{text[-tail:]}"
+
+
+def compact_tool_output(content: str, max_chars: int = MAX_TOOL_OUTPUT_CHARS) -> str:
+    """
+    Shrink a tool result to about max_chars, keeping JSON results valid JSON.
+
+    Results already under the limit are returned unchanged.
+    """
+    if len(content) <= max_chars:
+        return content
+
+    stripped = content.strip()
+    if stripped[:1] in ('{', '['):
+        try:
+            data = json.loads(stripped)
+        except ValueError:
+            data = None
+        if data is not None:
+            # Tighten list/string limits until it fits (or we run out of room to tighten)
+            max_list_items, max_string_chars = MAX_LIST_ITEMS, MAX_STRING_CHARS
+            while True:
+                compacted = json.dumps(
+                    _compact_value(data, max_list_items, max_string_chars), separators=(',', ':'), default=str
+                )
+                if len(compacted) <= max_chars or (max_list_items <= 1 and max_string_chars <= 50):
+                    break
+                max_list_items = max(max_list_items // 2, 1)
+                max_string_chars = max(max_string_chars // 2, 50)
+            if len(compacted) <= max_chars:
+                return compacted
+            return _compact_text(compacted, max_chars)
+
+    return _compact_text(content, max_chars)
+
+
+def fit_messages_to_context(messages: List[Dict[str, Any]], max_tokens: int) -> List[Dict[str, Any]]:
+    """
+    Compact older tool results until the transcript's estimated size fits max_tokens.
+
+    Only tool messages are touched (oldest first); system, user and assistant
+    messages are left as they are. Messages are updated in place.
+
+    Returns:
+        The same list of messages
+    """
+    def total_tokens() -> int:
+        return sum(estimate_tokens(str(message.get('content') or '')) for message in messages)
+
+    used = total_tokens()
+    if used <= max_tokens:
+        return messages
+
+    # Oldest first, so the newest tool results stay at full size for as long as possible
+    for i in [i for i, message in enumerate(messages) if message.get('role') == 'tool']:
+        content = str(messages[i].get('content') or '')
+        if len(content) <= MIN_TOOL_OUTPUT_CHARS:
+            continue
+        messages[i] = {**messages[i], 'content': compact_tool_output(content, MIN_TOOL_OUTPUT_CHARS)}
+        used = total_tokens()
+        if used <= max_tokens:
+            break
+
+    if used > max_tokens:
+        logger.warning(f"Transcript still ~{used} tokens after compacting tool results (budget {max_tokens})")
+    else:
+        logger.info(f"Compacted older tool results to fit context (~{used}/{max_tokens} tokens)")
+    return messages
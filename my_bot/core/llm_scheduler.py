@@ -0,0 +1,207 @@
+# /my_bot/core/llm_scheduler.py
+"""
+LLM Request Scheduler
+
+Sits in front of the LLM so concurrent analysts don't pile up behind Ollama:
+
+- At most LLM_MAX_CONCURRENCY queries run at once, matching the number of
+  requests Ollama serves in parallel (OLLAMA_NUM_PARALLEL); the rest wait here
+  instead of timing out inside Ollama's own queue.
+- Waiting requests are served round-robin per user, so one analyst firing off
+  several questions doesn't push everyone else back.
+- Queued callers get their position in line (and updates as it changes) so
+  the bots can tell the user why they're waiting.
+- A keep-warm thread pings Ollama whenever it has been idle for a while, so the
+  model is never evicted between questions.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+LLM_MAX_CONCURRENCY = int(os.environ.get("OLLAMA_NUM_PARALLEL", 2))
+QUEUE_FEEDBACK_INTERVAL_SECONDS = 5  # How often a waiting request re-checks its position
+KEEP_WARM_INTERVAL_SECONDS = 4 * 60  # Below Ollama's default 5 minute keep_alive
+OLLAMA_GENERATE_URL = os.environ.get("OLLAMA_GENERATE_URL", "http://localhost:11434/api/generate")
+
+
+class _Ticket:
+    """A request waiting for a slot"""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.granted = threading.Event()
+        self.enqueued_at = time.time()
+
+
+class LLMScheduler:
+    """Bounded-concurrency, per-user fair queue for LLM requests."""
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY):
+        self.max_concurrency = max(max_concurrency, 1)
+        self._lock = threading.Lock()
+        self._active = 0
+        # user -> waiting tickets (oldest first); dict order is the round-robin order
+        self._queues: "OrderedDict[str, Deque[_Ticket]]" = OrderedDict()
+        self._last_activity = time.time()
+
+        self._keep_warm_stop = threading.Event()
+        self._keep_warm_thread: Optional[threading.Thread] = None
+
+        self.stats = {'served': 0, 'queued': 0, 'total_wait_seconds': 0.0, 'max_wait_seconds': 0.0}
+
+    @contextmanager
+    def slot(self, user_id: str, on_queued: Optional[Callable[[int], None]] = None):
+        """
+        Hold one LLM slot for the duration of the block, waiting in line if all are busy.
+
+        Args:
+            user_id: Who the request is for (fairness is per user)
+            on_queued: Called with the 1-based position in line when the request has to
+                       wait, again whenever that position changes, and with 0 once
+                       the request gets its slot
+        """
+        ticket = _Ticket(user_id)
+        with self._lock:
+            if self._active < self.max_concurrency and not self._queues:
+                self._active += 1
+                ticket.granted.set()
+            else:
+                self._queues.setdefault(user_id, deque()).append(ticket)
+                self.stats['queued'] += 1
+
+        if not ticket.granted.is_set():
+            self._wait(ticket, on_queued)
+
+        waited = time.time() - ticket.enqueued_at
+        with self._lock:
+            self.stats['served'] += 1
+            self.stats['total_wait_seconds'] += waited
+            self.stats['max_wait_seconds'] = max(self.stats['max_wait_seconds'], waited)
+            self._last_activity = time.time()
+        if waited >= 1:
+            logger.info(f"LLM request for {user_id} waited {waited:.1f}s for a slot")
+
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _wait(self, ticket: _Ticket, on_queued: Optional[Callable[[int], None]]):
+        def notify(position: int):
+            if on_queued:
+                try:
+                    on_queued(position)
+                except Exception as e:
+                    logger.warning(f"Queue position callback failed: {e}")
+
+        last_position = None
+        while not ticket.granted.is_set():
+            position = self.queue_position(ticket)
+            if position and position != last_position:
+                last_position = position
+                logger.info(f"LLM request for {ticket.user_id} queued at position {position}")
+                notify(position)
+            ticket.granted.wait(QUEUE_FEEDBACK_INTERVAL_SECONDS)
+        if last_position is not None:
+            notify(0)
+
+    def _release(self):
+        """Free a slot and hand it to the next user in round-robin order."""
+        with self._lock:
+            self._last_activity = time.time()
+            if self._queues:
+                user_id, tickets = next(iter(self._queues.items()))
+                ticket = tickets.popleft()
+                # Served users go to the back of the rotation
+                del self._queues[user_id]
+                if tickets:
+                    self._queues[user_id] = tickets
+                ticket.granted.set()  # Slot passes straight to the waiter
+                return
+            self._active -= 1
+
+    def queue_position(self, ticket: _Ticket) -> int:
+        """1-based position of a waiting ticket in dispatch order (0 if it isn't waiting)."""
+        with self._lock:
+            # Dispatch takes each user's oldest ticket in rotation order, round after round
+            position = 0
+            queues = list(self._queues.values())
+            for round_index in range(max((len(q) for q in queues), default=0)):
+                for tickets in queues:
+                    if round_index < len(tickets):
+                        position += 1
+                        if tickets[round_index] is ticket:
+                            return position
+            return 0
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            waiting = sum(len(tickets) for tickets in self._queues.values())
+            served = self.stats['served']
+            return {
+                'max_concurrency': self.max_concurrency,
+                'active': self._active,
+                'waiting': waiting,
+                'served': served,
+                'queued_total': self.stats['queued'],
+                'avg_wait_seconds': round(self.stats['total_wait_seconds'] / served, 2) if served else 0.0,
+                'max_wait_seconds': round(self.stats['max_wait_seconds'], 2),
+            }
+
+    def start_keep_warm(self, model_name: str, keep_alive: int = -1,
+                        interval_seconds: float = KEEP_WARM_INTERVAL_SECONDS):
+        """Ping Ollama whenever no request has run for interval_seconds, so the model stays loaded."""
+        if self._keep_warm_thread is not None and self._keep_warm_thread.is_alive():
+            return
+
+        def keep_warm():
+            while not self._keep_warm_stop.wait(interval_seconds):
+                with self._lock:
+                    idle = time.time() - self._last_activity
+                if idle < interval_seconds:
+                    continue
+                try:
+                    # A generate call without a prompt loads the model (and resets keep_alive) without generating
+                    response = requests.post(
+                        OLLAMA_GENERATE_URL,
+                        json={"model": model_name, "keep_alive": keep_alive},
+                        timeout=120
+                    )
+                    response.raise_for_status()
+                    with self._lock:
+                        self._last_activity = time.time()
+                    logger.debug(f"Keep-warm ping for {model_name} after {idle:.0f}s idle")
+                except Exception as e:
+                    logger.warning(f"Keep-warm ping for {model_name} failed: {e}")
+
+        self._keep_warm_stop.clear()
+        self._keep_warm_thread = threading.Thread(target=keep_warm, name="llm-keep-warm", daemon=True)
+        self._keep_warm_thread.start()
+        logger.info(f"Keep-warm pings enabled for {model_name} every {interval_seconds:.0f}s of idle time")
+
+    def stop_keep_warm(self):
+        self._keep_warm_stop.set()
+
+
+# Global instance
+_llm_scheduler = None
+_llm_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get or create global LLM scheduler instance."""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        with _llm_scheduler_lock:
+            if _llm_scheduler is None:
+                _llm_scheduler = LLMScheduler()
+    return _llm_scheduler
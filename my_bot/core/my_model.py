@@ -21,6 +21,7 @@ Created for Security Operations
 """
 import logging
 import time
+from typing import Callable, Optional
 
 from my_bot.core.session_manager import get_session_manager
 from my_bot.core.state_manager import get_state_manager
@@ -615,7 +616,8 @@ def initialize_model_and_agent():
     return success
 
 
-def ask(user_message: str, user_id: str = "default", room_id: str = "default") -> dict:
+def ask(user_message: str, user_id: str = "default", room_id: str = "default",
+        on_queued: Optional[Callable[[int], None]] = None) -> dict:
     """
     SOC Q&A function with persistent sessions and enhanced error recovery:
 
@@ -637,6 +639,8 @@ def ask(user_message: str, user_id: str = "default", room_id: str = "default") -
         user_message: The user's question or request
         user_id: Unique identifier for the user (default: "default")
         room_id: Unique identifier for the chat room (default: "default")
+        on_queued: Called with the position in line if the query has to wait
+            for the LLM, again as the position changes, and with 0 once it runs
 
     Returns:
         dict: {
@@ -709,12 +713,9 @@ def ask(user_message: str, user_id: str = "default", room_id: str = "default") -
                 'tokens_per_sec': 0.0
             }
 
-        # Get session manager for persistent sessions
+        # Get session manager for persistent sessions (expired sessions are cleaned up in the background)
         session_manager = get_session_manager()
 
-        # Clean up old sessions periodically
-        session_manager.cleanup_old_sessions()
-
         # Get conversation context from session history
         conversation_context = session_manager.get_conversation_context(session_key)
 
@@ -776,8 +777,7 @@ def ask(user_message: str, user_id: str = "default", room_id: str = "default") -
             final_response = "✅ System online and ready"
 
             # Store simple interaction in session
-            session_manager.add_message(session_key, "user", query)
-            session_manager.add_message(session_key, "assistant", final_response)
+            session_manager.add_messages(session_key, [("user", query), ("assistant", final_response)])
 
             elapsed = time.time() - start_time
             if elapsed > 25:
@@ -818,8 +818,9 @@ def ask(user_message: str, user_id: str = "default", room_id: str = "default") -
             from src.utils.tool_logging import set_logging_context
             set_logging_context(session_key)
 
-            # execute_query now returns a dict with content, token counts, and timing data
-            result = state_manager.execute_query(agent_input)
+            # execute_query now returns a dict with content, token counts, and timing data.
+            # Each LLM call inside it waits for a scheduler slot, queued fairly per user.
+            result = state_manager.execute_query(agent_input, user_id=user_id, on_queued=on_queued)
             final_response = result['content']
             input_tokens = result['input_tokens']
             output_tokens = result['output_tokens']
@@ -839,8 +840,7 @@ def ask(user_message: str, user_id: str = "default", room_id: str = "default") -
             tokens_per_sec = 0.0
 
         # Store user message and bot response in session
-        session_manager.add_message(session_key, "user", query)
-        session_manager.add_message(session_key, "assistant", final_response)
+        session_manager.add_messages(session_key, [("user", query), ("assistant", final_response)])
 
         elapsed = time.time() - start_time
         if elapsed > 25:
@@ -920,7 +920,6 @@ def ask_stream(user_message: str, user_id: str = "default", room_id: str = "defa
 
         # Get session manager
         session_manager = get_session_manager()
-        session_manager.cleanup_old_sessions()
 
         # Get conversation context
         conversation_context = session_manager.get_conversation_context(session_key)
@@ -945,8 +944,7 @@ def ask_stream(user_message: str, user_id: str = "default", room_id: str = "defa
         simple_query = query.lower().strip()
         if simple_query in ['hi', 'status', 'health', 'are you working']:
             response = "✅ System online and ready"
-            session_manager.add_message(session_key, "user", query)
-            session_manager.add_message(session_key, "assistant", response)
+            session_manager.add_messages(session_key, [("user", query), ("assistant", response)])
             yield response
             return
 
@@ -959,15 +957,14 @@ def ask_stream(user_message: str, user_id: str = "default", room_id: str = "defa
         from src.utils.tool_logging import set_logging_context
         set_logging_context(session_key)
 
-        # Stream response
+        # Stream response (each LLM call waits for a scheduler slot if all are busy)
         full_response = ""
-        for token in state_manager.execute_query_stream(agent_input):
+        for token in state_manager.execute_query_stream(agent_input, user_id=user_id):
             full_response += token
             yield token
 
         # Store conversation
-        session_manager.add_message(session_key, "user", query)
-        session_manager.add_message(session_key, "assistant", full_response)
+        session_manager.add_messages(session_key, [("user", query), ("assistant", full_response)])
 
     except Exception as e:
         logging.error(f"Ask stream function failed: {e}")
@@ -17,6 +17,12 @@ from pathlib import Path
 from typing import Dict, Any, Set, LiteralString
 import psutil
 
+from my_bot.core.llm_scheduler import get_llm_scheduler
+from src.utils.tool_cache import get_tool_cache
+
+# Upper bounds (seconds) of the tool latency histogram buckets; the last bucket is open-ended
+TOOL_LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120)
+
 
 class PerformanceMonitor:
     """Thread-safe performance monitoring for the bot"""
@@ -42,6 +48,9 @@ class PerformanceMonitor:
         # Error tracking
         self.total_errors = 0
 
+        # Tool latency tracking (tool name -> histogram and counters)
+        self.tool_latency: Dict[str, Dict[str, Any]] = {}
+
         # Active sessions (user -> last_activity_time)
         self.active_sessions: Dict[str, float] = {}
         self.session_timeout = 300  # 5 minutes
@@ -86,6 +95,52 @@ class PerformanceMonitor:
             # Clean up old sessions
             self._cleanup_old_sessions()
 
+    def record_tool_latency(self, tool_name: str, seconds: float, error: bool = False, over_budget: bool = False):
+        """Record how long a tool call took (over_budget: the agent stopped waiting before it finished)"""
+        with self.lock:
+            stats = self.tool_latency.get(tool_name)
+            if stats is None:
+                stats = {
+                    'count': 0,
+                    'total_seconds': 0.0,
+                    'max_seconds': 0.0,
+                    'errors': 0,
+                    'over_budget': 0,
+                    'buckets': [0] * (len(TOOL_LATENCY_BUCKETS) + 1)
+                }
+                self.tool_latency[tool_name] = stats
+
+            stats['count'] += 1
+            stats['total_seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+            if error:
+                stats['errors'] += 1
+            if over_budget:
+                stats['over_budget'] += 1
+
+            bucket = next((i for i, bound in enumerate(TOOL_LATENCY_BUCKETS) if seconds <= bound), len(TOOL_LATENCY_BUCKETS))
+            stats['buckets'][bucket] += 1
+
+    def get_tool_latency_stats(self) -> Dict[str, Any]:
+        """Per-tool latency histograms (bucket label -> count) with count, average and max"""
+        with self.lock:
+            return self._tool_latency_summary()
+
+    def _tool_latency_summary(self) -> Dict[str, Any]:
+        """Format tool latency stats (caller holds the lock)"""
+        labels = [f"<={bound}s" for bound in TOOL_LATENCY_BUCKETS] + [f">{TOOL_LATENCY_BUCKETS[-1]}s"]
+        return {
+            tool_name: {
+                'count': stats['count'],
+                'avg_seconds': round(stats['total_seconds'] / stats['count'], 3),
+                'max_seconds': round(stats['max_seconds'], 3),
+                'errors': stats['errors'],
+                'over_budget': stats['over_budget'],
+                'histogram': dict(zip(labels, stats['buckets']))
+            }
+            for tool_name, stats in self.tool_latency.items()
+        }
+
     def end_user_session(self, user_id: str):
         """Mark user session as ended"""
         with self.lock:
@@ -124,6 +179,9 @@ class PerformanceMonitor:
             uptime_seconds = time.time() - self.start_time
             uptime_hours = uptime_seconds / 3600
 
+            tool_cache_stats = get_tool_cache().get_stats()
+            tool_latency = self._tool_latency_summary()
+
             return {
                 'concurrent_users': len(self.concurrent_users),
                 'peak_concurrent_users': self.peak_concurrent_users,
@@ -134,6 +192,10 @@ class PerformanceMonitor:
                 'total_errors': self.total_errors,
                 'uptime_hours': round(uptime_hours, 1),
                 'active_sessions': len(self.active_sessions),
+                'cache_hit_rate': tool_cache_stats['hit_rate'],
+                'tool_cache': tool_cache_stats,
+                'tool_latency': tool_latency,
+                'llm_queue': get_llm_scheduler().get_stats(),
                 'system': {
                     'memory_percent': memory.percent,
                     'memory_available_gb': round(memory.available / (1024 ** 3), 2),
@@ -154,6 +216,10 @@ class PerformanceMonitor:
             warnings.append(f"High CPU usage: {cpu_percent}%")
         if len(self.concurrent_users) > 50:
             warnings.append(f"High concurrent users: {len(self.concurrent_users)}")
+        llm_queue = get_llm_scheduler().get_stats()
+        if llm_queue['waiting'] > llm_queue['max_concurrency']:
+            warnings.append(f"LLM queue backing up: {llm_queue['waiting']} waiting for "
+                            f"{llm_queue['max_concurrency']} slots")
 
         return "; ".join(warnings) if warnings else None
 
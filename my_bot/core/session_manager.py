@@ -5,19 +5,28 @@ Persistent Session Manager
 Provides persistent conversation storage using SQLite database.
 Maintains conversation context across bot restarts and provides
 efficient session management with automatic cleanup.
+
+Each thread keeps one WAL-mode connection open instead of connecting per call,
+recent turns of each session are kept in an in-memory ring buffer so building
+context doesn't touch the database, and expired sessions are removed by a
+background timer rather than on every query.
 """
 
 import sqlite3
 import json
 import logging
 import os
+import threading
+from collections import deque
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Deque, List, Dict, Optional, Tuple
 from contextlib import contextmanager
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+CLEANUP_INTERVAL_SECONDS = 10 * 60  # How often expired sessions are removed in the background
+
 
 class PersistentSessionManager:
     """Manages persistent conversation sessions using SQLite"""
@@ -40,12 +49,27 @@ class PersistentSessionManager:
         self._cleanup_interval = 10  # Run cleanup every 10 messages per session
         self._session_insert_counts: Dict[str, int] = {}  # Track inserts per session
 
+        # One connection per thread, reused across calls
+        self._local = threading.local()
+
+        # Recent turns per session: session_key -> deque of (role, content, timestamp), oldest first.
+        # A session is loaded from the database the first time it's seen after a restart.
+        self._recent: Dict[str, Deque[Tuple[str, str, str]]] = {}
+        self._recent_lock = threading.Lock()
+
         self._init_database()
+        self._cleanup_stop = threading.Event()
+        self._cleanup_thread = threading.Thread(
+            target=self._cleanup_loop, name="session-cleanup", daemon=True
+        )
+        self._cleanup_thread.start()
         logger.info(f"Persistent session manager initialized with database: {db_path}")
     
     def _init_database(self):
         """Initialize the SQLite database with required tables"""
         with self._get_db_connection() as conn:
+            # WAL lets readers work while a message is being written
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS conversations (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -75,39 +99,58 @@ class PersistentSessionManager:
 
             conn.commit()
     
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10.0)
+            conn.row_factory = sqlite3.Row  # Enable column access by name
+            conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL; skips an fsync per commit
+            self._local.conn = conn
+        return conn
+
     @contextmanager
     def _get_db_connection(self):
-        """Get database connection with proper error handling"""
+        """Get this thread's database connection with proper error handling"""
         conn = None
         try:
-            conn = sqlite3.connect(self.db_path, timeout=10.0)
-            conn.row_factory = sqlite3.Row  # Enable column access by name
+            conn = self._connection()
             yield conn
         except sqlite3.Error as e:
             logger.error(f"Database error: {e}")
             if conn:
                 conn.rollback()
             raise
-        finally:
-            if conn:
-                conn.close()
-    
+
     def add_message(self, session_key: str, role: str, content: str) -> bool:
         """Add a message to the conversation session"""
+        return self.add_messages(session_key, [(role, content)])
+
+    def add_messages(self, session_key: str, messages: List[Tuple[str, str]]) -> bool:
+        """Add several (role, content) messages to a session in one transaction"""
+        if not messages:
+            return True
         try:
             timestamp = datetime.now().isoformat()
+            rows = [(session_key, role, content, timestamp) for role, content in messages]
+
+            # Load the ring buffer before inserting: loading it afterwards would read these
+            # rows from the database and the extend below would then add them a second time
+            recent = self._recent_messages(session_key)
 
             with self._get_db_connection() as conn:
-                # Insert new message
-                conn.execute("""
+                conn.executemany("""
                     INSERT INTO conversations (session_key, role, content, timestamp)
                     VALUES (?, ?, ?, ?)
-                """, (session_key, role, content, timestamp))
+                """, rows)
 
                 conn.commit()
 
+            with self._recent_lock:
+                recent.extend((role, content, timestamp) for role, content in messages)
+
             # Track insert count and only run cleanup periodically (not on every insert)
-            self._session_insert_counts[session_key] = self._session_insert_counts.get(session_key, 0) + 1
+            self._session_insert_counts[session_key] = self._session_insert_counts.get(session_key, 0) + len(rows)
 
             if self._session_insert_counts[session_key] >= self._cleanup_interval:
                 self._cleanup_session(session_key)
@@ -119,6 +162,28 @@ class PersistentSessionManager:
             logger.error(f"Failed to add message to session {session_key}: {e}")
             return False
 
+    def _recent_messages(self, session_key: str) -> Deque[Tuple[str, str, str]]:
+        """Ring buffer of a session's recent turns, loaded from the database on first use"""
+        with self._recent_lock:
+            recent = self._recent.get(session_key)
+        if recent is not None:
+            return recent
+
+        with self._get_db_connection() as conn:
+            cursor = conn.execute("""
+                SELECT role, content, timestamp
+                FROM conversations
+                WHERE session_key = ?
+                ORDER BY id DESC
+                LIMIT ?
+            """, (session_key, self.max_context_messages))
+            rows = [(row['role'], row['content'], row['timestamp']) for row in cursor.fetchall()]
+
+        rows.reverse()  # Oldest first
+        with self._recent_lock:
+            # Another thread may have loaded (and appended to) it meanwhile
+            return self._recent.setdefault(session_key, deque(rows, maxlen=self.max_context_messages))
+
     def _cleanup_session(self, session_key: str) -> int:
         """Clean up old messages for a session, keeping only the most recent N messages.
 
@@ -163,45 +228,37 @@ class PersistentSessionManager:
             # Calculate cutoff time (messages older than this will be excluded)
             cutoff_time = (datetime.now() - timedelta(hours=self.session_timeout_hours)).isoformat()
 
-            with self._get_db_connection() as conn:
-                # Get recent messages for this session within the timeout window
-                cursor = conn.execute("""
-                    SELECT role, content, timestamp
-                    FROM conversations
-                    WHERE session_key = ?
-                    AND timestamp >= ?
-                    ORDER BY timestamp DESC
-                    LIMIT ?
-                """, (session_key, cutoff_time, self.max_context_messages))
-
-                messages = cursor.fetchall()
+            # Recent messages for this session within the timeout window, served from memory
+            recent = self._recent_messages(session_key)
+            with self._recent_lock:
+                messages = [msg for msg in reversed(recent) if msg[2] >= cutoff_time]  # Newest first
 
-                if not messages:
-                    return ""
+            if not messages:
+                return ""
 
-                # Build context working backwards, respecting character limits
-                context_parts = []
-                total_chars = 0
+            # Build context working backwards, respecting character limits
+            context_parts = []
+            total_chars = 0
 
-                for msg in messages:  # Already ordered DESC, so newest first
-                    role_display = "User" if msg['role'] == "user" else "Assistant"
-                    msg_text = f"{role_display}: {msg['content']}"
+            for role, content, _ in messages:
+                role_display = "User" if role == "user" else "Assistant"
+                msg_text = f"{role_display}: {content}"
 
-                    # Check if adding this message would exceed character limit
-                    if total_chars + len(msg_text) + 100 > self.max_context_chars:
-                        break
+                # Check if adding this message would exceed character limit
+                if total_chars + len(msg_text) + 100 > self.max_context_chars:
+                    break
 
-                    context_parts.append(msg_text)
-                    total_chars += len(msg_text) + 1
+                context_parts.append(msg_text)
+                total_chars += len(msg_text) + 1
 
-                if context_parts:
-                    # Reverse to get chronological order (oldest first)
-                    context_parts.reverse()
-                    context = "\n\nPrevious conversation:\n" + "\n".join(context_parts) + "\n\nCurrent question:"
-                    logger.debug(f"Context for {session_key}: {len(context_parts)} messages, {len(context)} chars")
-                    return context
+            if context_parts:
+                # Reverse to get chronological order (oldest first)
+                context_parts.reverse()
+                context = "\n\nPrevious conversation:\n" + "\n".join(context_parts) + "\n\nCurrent question:"
+                logger.debug(f"Context for {session_key}: {len(context_parts)} messages, {len(context)} chars")
+                return context
 
-                return ""
+            return ""
 
         except Exception as e:
             logger.error(f"Failed to get context for session {session_key}: {e}")
@@ -220,15 +277,34 @@ class PersistentSessionManager:
                 
                 deleted_count = cursor.rowcount
                 conn.commit()
-                
-                if deleted_count > 0:
-                    logger.info(f"Cleaned up {deleted_count} old conversation messages")
-                
-                return deleted_count
-                
+
+            # Forget idle sessions so the ring buffers don't grow with every session ever seen
+            with self._recent_lock:
+                for session_key in [key for key, recent in self._recent.items()
+                                    if not recent or recent[-1][2] < cutoff_time]:
+                    del self._recent[session_key]
+
+            if deleted_count > 0:
+                logger.info(f"Cleaned up {deleted_count} old conversation messages")
+
+            return deleted_count
+
         except Exception as e:
             logger.error(f"Failed to cleanup old sessions: {e}")
             return 0
+
+    def _cleanup_loop(self):
+        """Remove expired sessions every CLEANUP_INTERVAL_SECONDS until close()"""
+        while not self._cleanup_stop.wait(CLEANUP_INTERVAL_SECONDS):
+            self.cleanup_old_sessions()
+
+    def close(self):
+        """Stop the background cleanup and close this thread's connection"""
+        self._cleanup_stop.set()
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
     
     def get_session_info(self, session_key: str = None) -> Dict:
         """Get session information for debugging"""
@@ -332,10 +408,14 @@ class PersistentSessionManager:
                 
                 deleted_count = cursor.rowcount
                 conn.commit()
-                
-                logger.info(f"Deleted session {session_key}: {deleted_count} messages")
-                return deleted_count > 0
-                
+
+            with self._recent_lock:
+                self._recent.pop(session_key, None)
+            self._session_insert_counts.pop(session_key, None)
+
+            logger.info(f"Deleted session {session_key}: {deleted_count} messages")
+            return deleted_count > 0
+
         except Exception as e:
             logger.error(f"Failed to delete session {session_key}: {e}")
             return False
@@ -343,11 +423,14 @@ class PersistentSessionManager:
 
 # Global session manager instance
 _session_manager = None
+_session_manager_lock = threading.Lock()
 
 
 def get_session_manager() -> PersistentSessionManager:
     """Get global session manager instance (singleton)"""
     global _session_manager
     if _session_manager is None:
-        _session_manager = PersistentSessionManager()
+        with _session_manager_lock:
+            if _session_manager is None:
+                _session_manager = PersistentSessionManager()
     return _session_manager
\ No newline at end of file
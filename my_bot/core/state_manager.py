@@ -10,11 +10,13 @@ import atexit
 import logging
 import os
 import signal
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional
+from typing import Callable, Optional
 
 from langchain_ollama import ChatOllama, OllamaEmbeddings
 
+from my_bot.core.context_compaction import compact_tool_output, estimate_tokens, fit_messages_to_context
+from my_bot.core.llm_scheduler import get_llm_scheduler
+from my_bot.core.tool_runner import get_tool_runner
 from my_bot.document.document_processor import DocumentProcessor
 from my_bot.tools.crowdstrike_tools import (
     get_device_containment_status, get_device_online_status, get_device_details_cs,
@@ -56,6 +58,8 @@ class SecurityBotStateManager:
     # Context window configuration
     NUM_CTX = 16384  # Ollama context window size in tokens
     CONTEXT_WARNING_THRESHOLD = 0.80  # Warn when context usage exceeds 80%
+    RESPONSE_TOKEN_RESERVE = 1024  # Context left free for the model's reply when fitting the transcript
+    KEEP_ALIVE = -1  # Keep the model (and its prompt cache) loaded in Ollama indefinitely
 
     # System prompt for the security operations assistant
     SYSTEM_PROMPT = """You are an expert Security Operations Center (SOC) assistant. You combine deep technical expertise with genuine helpfulness to support SOC analysts and security engineers.
@@ -95,10 +99,34 @@ VERIFICATION REQUIREMENTS:
 RESPONSE STYLE: Use markdown formatting. Lead with the answer, keep it scannable - analysts are busy."""
 
     def _get_system_prompt(self) -> str:
-        """Return system prompt with current date injected."""
+        """Return system prompt with current date injected.
+
+        The date goes last so the tool definitions and the static prompt form a
+        byte-identical prefix across requests, which Ollama can reuse from its cache.
+        """
         from datetime import datetime
         today = datetime.now().strftime("%B %d, %Y")  # e.g., "January 27, 2026"
-        return f"Today's date is {today}.\n\n{self.SYSTEM_PROMPT}"
+        return f"{self.SYSTEM_PROMPT}\n\nToday's date is {today}."
+
+    def _tool_messages(self, tool_calls) -> list:
+        """Run tool calls and compact their results before they go back to the LLM."""
+        messages = get_tool_runner().run(tool_calls, self.available_tools)
+        for message in messages:
+            message['content'] = compact_tool_output(message['content'])
+        return messages
+
+    @staticmethod
+    def _prompt_overhead_tokens(input_tokens: int, messages: list) -> int:
+        """Prompt tokens Ollama reported beyond the estimated size of messages."""
+        return max(input_tokens - sum(estimate_tokens(str(m.get('content') or '')) for m in messages), 0)
+
+    def _fit_to_context(self, messages: list, prompt_overhead_tokens: int) -> None:
+        """Compact older tool results if the next prompt would crowd the context window.
+
+        prompt_overhead_tokens covers what isn't in messages (tool definitions, chat template).
+        """
+        budget = int(self.NUM_CTX * self.CONTEXT_WARNING_THRESHOLD) - prompt_overhead_tokens - self.RESPONSE_TOKEN_RESERVE
+        fit_messages_to_context(messages, max(budget, 0))
 
     def __init__(self):
         # Configuration
@@ -201,7 +229,7 @@ RESPONSE STYLE: Use markdown formatting. Lead with the answer, keep it scannable
             self.llm = ChatOllama(
                 model=self.model_config.llm_model_name,
                 temperature=self.model_config.temperature,
-                keep_alive=-1,  # Keep model loaded indefinitely in Ollama memory
+                keep_alive=self.KEEP_ALIVE,  # Keep model loaded indefinitely in Ollama memory
                 num_ctx=self.NUM_CTX,  # Context window for tool definitions
                 client_kwargs={'timeout': 300.0},  # 5 minute timeout to prevent indefinite hangs
             )
@@ -374,9 +402,18 @@ RESPONSE STYLE: Use markdown formatting. Lead with the answer, keep it scannable
             logging.error(f"Failed to initialize agent: {e}")
             return False
 
-    def execute_query(self, query: str) -> dict:
+    def execute_query(self, query: str, user_id: str = "default",
+                      on_queued: Optional[Callable[[int], None]] = None) -> dict:
         """Execute query using native tool calling
 
+        Each LLM call waits for a scheduler slot and gives it back before the
+        requested tools run, so slow tools don't hold up other users' queries.
+
+        Args:
+            query: The query (with any conversation context prepended)
+            user_id: Who the query is for (the scheduler queues fairly per user)
+            on_queued: Passed to LLMScheduler.slot for queue position updates
+
         Returns:
             dict: {
                 'content': str,
@@ -404,10 +441,14 @@ RESPONSE STYLE: Use markdown formatting. Lead with the answer, keep it scannable
             max_iterations = 10  # Safety limit to prevent infinite loops
             iteration = 0
             response = None
+            prompt_overhead_tokens = 0  # Prompt tokens not accounted for by messages (learned from iteration 1)
 
             while iteration < max_iterations:
                 iteration += 1
-                response = self.llm_with_tools.invoke(messages)
+                if iteration > 1:
+                    self._fit_to_context(messages, prompt_overhead_tokens)
+                with get_llm_scheduler().slot(user_id, on_queued):
+                    response = self.llm_with_tools.invoke(messages)
 
                 # Extract token usage and timing from response metadata
                 iter_input_tokens = 0
@@ -422,6 +463,8 @@ RESPONSE STYLE: Use markdown formatting. Lead with the answer, keep it scannable
 
                 total_input_tokens += iter_input_tokens
                 total_output_tokens += iter_output_tokens
+                if iteration == 1:
+                    prompt_overhead_tokens = self._prompt_overhead_tokens(iter_input_tokens, messages)
 
                 # Log context utilization metrics
                 if iter_input_tokens > 0:
@@ -454,28 +497,8 @@ RESPONSE STYLE: Use markdown formatting. Lead with the answer, keep it scannable
                 # Add the AI message with tool calls to conversation
                 messages.append({"role": "assistant", "content": response.content})
 
-                # Execute tool calls in parallel
-                def execute_single_tool(tool_call):
-                    tool_name = tool_call['name']
-                    tool_args = tool_call.get('args', {})
-                    tool_id = tool_call['id']
-                    logging.info(f"Executing tool: {tool_name}")
-
-                    if tool_name in self.available_tools:
-                        try:
-                            tool_result = self.available_tools[tool_name].invoke(tool_args)
-                        except Exception as e:
-                            tool_result = f"Error executing {tool_name}: {str(e)}"
-                    else:
-                        tool_result = f"Tool {tool_name} not found"
-
-                    return {"role": "tool", "content": str(tool_result), "tool_call_id": tool_id}
-
-                # Run tools in parallel with ThreadPoolExecutor
-                with ThreadPoolExecutor(max_workers=5) as executor:
-                    futures = {executor.submit(execute_single_tool, tc): tc for tc in response.tool_calls}
-                    for future in as_completed(futures):
-                        messages.append(future.result())
+                # Execute tool calls in parallel (results kept in request order, large outputs compacted)
+                messages.extend(self._tool_messages(response.tool_calls))
 
             # Debug: Log if response is empty
             if response and (not response.content or len(response.content.strip()) == 0):
@@ -514,10 +537,11 @@ RESPONSE STYLE: Use markdown formatting. Lead with the answer, keep it scannable
                 'tokens_per_sec': 0.0
             }
 
-    def execute_query_stream(self, query: str):
+    def execute_query_stream(self, query: str, user_id: str = "default"):
         """Execute query using native tool calling with streaming support
 
         Yields tokens as they are generated for real-time streaming to clients.
+        Like execute_query, a scheduler slot is held only while the LLM is working.
         """
         try:
             messages = [
@@ -526,43 +550,32 @@ RESPONSE STYLE: Use markdown formatting. Lead with the answer, keep it scannable
             ]
 
             # Get initial response (may contain tool calls)
-            response = self.llm_with_tools.invoke(messages)
+            with get_llm_scheduler().slot(user_id):
+                response = self.llm_with_tools.invoke(messages)
 
             # If there are tool calls, execute them first then stream final response
             if hasattr(response, 'tool_calls') and response.tool_calls:
+                usage = getattr(response, 'usage_metadata', None) or {}
+                prompt_overhead_tokens = self._prompt_overhead_tokens(usage.get('input_tokens', 0), messages)
+
                 # Add the AI message with tool calls to conversation
                 messages.append({"role": "assistant", "content": response.content})
 
-                # Execute tool calls in parallel
-                def execute_single_tool(tool_call):
-                    tool_name = tool_call['name']
-                    tool_args = tool_call.get('args', {})
-                    tool_id = tool_call['id']
-
-                    if tool_name in self.available_tools:
-                        try:
-                            tool_result = self.available_tools[tool_name].invoke(tool_args)
-                        except Exception as e:
-                            tool_result = f"Error executing {tool_name}: {str(e)}"
-                    else:
-                        tool_result = f"Tool {tool_name} not found"
-
-                    return {"role": "tool", "content": str(tool_result), "tool_call_id": tool_id}
-
-                with ThreadPoolExecutor(max_workers=5) as executor:
-                    futures = {executor.submit(execute_single_tool, tc): tc for tc in response.tool_calls}
-                    for future in as_completed(futures):
-                        messages.append(future.result())
+                # Execute tool calls in parallel (results kept in request order, large outputs compacted)
+                messages.extend(self._tool_messages(response.tool_calls))
+                self._fit_to_context(messages, prompt_overhead_tokens)
 
                 # Stream final response with tool results
-                for chunk in self.llm_with_tools.stream(messages):
-                    if hasattr(chunk, 'content') and chunk.content:
-                        yield chunk.content
+                with get_llm_scheduler().slot(user_id):
+                    for chunk in self.llm_with_tools.stream(messages):
+                        if hasattr(chunk, 'content') and chunk.content:
+                            yield chunk.content
             else:
                 # No tool calls, stream direct response
-                for chunk in self.llm_with_tools.stream(messages):
-                    if hasattr(chunk, 'content') and chunk.content:
-                        yield chunk.content
+                with get_llm_scheduler().slot(user_id):
+                    for chunk in self.llm_with_tools.stream(messages):
+                        if hasattr(chunk, 'content') and chunk.content:
+                            yield chunk.content
 
         except Exception as e:
             yield f"Error: {str(e)}"
@@ -573,6 +586,8 @@ RESPONSE STYLE: Use markdown formatting. Lead with the answer, keep it scannable
             # Clear references to force cleanup
             self.llm = None
             self.embeddings = None
+            get_tool_runner().shutdown()
+            get_llm_scheduler().stop_keep_warm()
 
         except Exception as e:
             logging.error(f"Error during shutdown: {e}")
@@ -603,7 +618,7 @@ RESPONSE STYLE: Use markdown formatting. Lead with the answer, keep it scannable
         return ChatOllama(
             model=self.model_config.llm_model_name,
             temperature=temperature,
-            keep_alive=-1,
+            keep_alive=self.KEEP_ALIVE,
             num_ctx=self.NUM_CTX,
             client_kwargs={'timeout': 300.0},  # 5 minute timeout to prevent indefinite hangs
         )
@@ -666,11 +681,13 @@ RESPONSE STYLE: Use markdown formatting. Lead with the answer, keep it scannable
 
             # Use keep_alive=-1 to keep model loaded indefinitely
             # This ensures the model stays in Ollama memory and doesn't get unloaded
-            self.llm.keep_alive = -1  # -1 means keep alive indefinitely
+            self.llm.keep_alive = self.KEEP_ALIVE  # -1 means keep alive indefinitely
 
             response = self.llm.invoke("Hello")
             if response:
                 logging.info("Fast warmup completed successfully - model will stay loaded in memory")
+                # Keep it loaded even if something else on the Ollama host evicts it while we're idle
+                get_llm_scheduler().start_keep_warm(self.model_config.llm_model_name, self.KEEP_ALIVE)
                 return True
             else:
                 logging.warning("Fast warmup returned empty response")
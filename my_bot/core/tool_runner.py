@@ -0,0 +1,211 @@
+# /my_bot/core/tool_runner.py
+"""
+Tool Runner
+
+Long-lived thread pool that executes the LLM's tool calls for the agent loop.
+
+- Each tool gets a latency budget. When a call runs past it, the agent gets a
+  "still waiting" tool result and moves on instead of stalling the whole turn;
+  the call keeps running in the background, and an identical call made while
+  it's still in flight joins it instead of starting over. Once it finishes, its
+  result is kept for LATE_RESULT_TTL_SECONDS so asking again picks it up.
+- At most MAX_BACKGROUND_CALLS_PER_TOOL over-budget calls per tool keep running,
+  so one slow API can't tie up every shared worker.
+- Tool results come back in the order the LLM requested them, so the prompt
+  for the next iteration doesn't depend on which API answered first.
+- Every call's latency is recorded in the PerformanceMonitor histograms.
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from my_bot.core.performance_monitor import get_performance_monitor
+
+logger = logging.getLogger(__name__)
+
+TOOL_WORKERS = 8  # Shared by all concurrent queries
+DEFAULT_TOOL_BUDGET_SECONDS = 45
+LATE_RESULT_TTL_SECONDS = 10 * 60  # How long a finished over-budget result waits to be picked up
+MAX_BACKGROUND_CALLS_PER_TOOL = 2  # Over-budget calls per tool allowed to keep a worker busy
+
+# Tools that routinely take longer than the default budget
+TOOL_BUDGET_SECONDS = {
+    'analyze_tipper_novelty': 180,
+    'analyze_threat_text': 180,
+    'generate_executive_summary': 120,
+    'run_qradar_aql_query': 120,
+    'search_qradar_by_ip': 90,
+    'search_qradar_by_domain': 90,
+    'search_intelx': 90,
+    'search_darkweb_intelx': 90,
+    'run_tests': 300,
+}
+
+
+def get_tool_budget(tool_name: str) -> float:
+    """Latency budget (seconds) for a tool."""
+    return TOOL_BUDGET_SECONDS.get(tool_name, DEFAULT_TOOL_BUDGET_SECONDS)
+
+
+class ToolRunner:
+    """Executes tool calls on a shared pool with per-tool latency budgets."""
+
+    def __init__(self, max_workers: int = TOOL_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+        self._in_flight: Dict[str, Future] = {}  # call key -> running future
+        self._background: Dict[str, Set[Future]] = {}  # tool name -> over-budget futures still running
+        self._late_results: Dict[str, Tuple[float, Future]] = {}  # call key -> (expires_at, finished future)
+        self._lock = threading.Lock()
+
+    def _invoke(self, tool: Any, tool_name: str, tool_args: dict) -> str:
+        start_time = time.time()
+        error = False
+        try:
+            return str(tool.invoke(tool_args))
+        except Exception as e:
+            error = True
+            return f"Error executing {tool_name}: {str(e)}"
+        finally:
+            elapsed = time.time() - start_time
+            get_performance_monitor().record_tool_latency(
+                tool_name, elapsed, error=error, over_budget=elapsed > get_tool_budget(tool_name)
+            )
+
+    @staticmethod
+    def _call_key(tool_name: str, tool_args: dict) -> str:
+        return f"{tool_name}:{json.dumps(tool_args, sort_keys=True, default=str)}"
+
+    def _submit(self, tool: Any, tool_name: str, tool_args: dict) -> Optional[Future]:
+        """
+        Start a tool call, join an identical call that's still running, or pick up
+        the result of one that finished after its budget ran out.
+
+        Returns:
+            The call's future, or None if the tool already has MAX_BACKGROUND_CALLS_PER_TOOL
+            over-budget calls running
+        """
+        key = self._call_key(tool_name, tool_args)
+        now = time.time()
+        with self._lock:
+            for late_key in [k for k, (expires_at, _) in self._late_results.items() if expires_at <= now]:
+                del self._late_results[late_key]
+            late = self._late_results.pop(key, None)
+            if late is not None:
+                logger.info(f"Returning late result of {tool_name}")
+                return late[1]
+            future = self._in_flight.get(key)
+            if future is not None and not future.done():
+                logger.info(f"Joining in-flight call to {tool_name}")
+                return future
+            if len(self._background.get(tool_name, ())) >= MAX_BACKGROUND_CALLS_PER_TOOL:
+                return None
+            future = self._executor.submit(self._invoke, tool, tool_name, tool_args)
+            self._in_flight[key] = future
+
+        def _forget(done_future: Future):
+            with self._lock:
+                if self._in_flight.get(key) is done_future:
+                    del self._in_flight[key]
+                background = self._background.get(tool_name)
+                if background and done_future in background:
+                    # Over budget: nobody has seen this result yet, so keep it for the next identical call
+                    background.discard(done_future)
+                    if not background:
+                        del self._background[tool_name]
+                    if not done_future.cancelled():
+                        self._late_results[key] = (time.time() + LATE_RESULT_TTL_SECONDS, done_future)
+
+        future.add_done_callback(_forget)
+        return future
+
+    def _move_to_background(self, key: str, tool_name: str, future: Future):
+        """Count an over-budget call against its tool's background slots and keep its result when it finishes."""
+        with self._lock:
+            if not future.done():
+                self._background.setdefault(tool_name, set()).add(future)
+            elif not future.cancelled():
+                # Finished right after its budget ran out
+                self._late_results[key] = (time.time() + LATE_RESULT_TTL_SECONDS, future)
+
+    def run(self, tool_calls: List[dict], available_tools: Dict[str, Any]) -> List[dict]:
+        """
+        Execute the tool calls from one LLM response concurrently.
+
+        Args:
+            tool_calls: Tool calls from the LLM response (name, args, id)
+            available_tools: Tool name -> LangChain tool
+
+        Returns:
+            Tool messages in the same order as tool_calls
+        """
+        start_time = time.time()
+        pending = []
+        for tool_call in tool_calls:
+            tool_name = tool_call['name']
+            tool = available_tools.get(tool_name)
+            if tool is None:
+                pending.append((tool_call, None, None))
+                continue
+            logger.info(f"Executing tool: {tool_name}")
+            tool_args = tool_call.get('args', {})
+            pending.append((tool_call, self._call_key(tool_name, tool_args), self._submit(tool, tool_name, tool_args)))
+
+        # Wait until every call has finished or used up its budget
+        for tool_call, _, future in pending:
+            if future is not None:
+                remaining = get_tool_budget(tool_call['name']) - (time.time() - start_time)
+                wait([future], timeout=max(remaining, 0))
+
+        messages = []
+        for tool_call, key, future in pending:
+            tool_name = tool_call['name']
+            if key is None:
+                content = f"Tool {tool_name} not found"
+            elif future is None:
+                logger.warning(f"Tool {tool_name} already has {MAX_BACKGROUND_CALLS_PER_TOOL} over-budget calls running")
+                content = (
+                    f"{tool_name} is busy: earlier lookups are still running past their time budget. Answer with "
+                    f"the information available and tell the user to retry this lookup in a few minutes."
+                )
+            elif future.done():
+                content = future.result()
+            else:
+                budget = get_tool_budget(tool_name)
+                logger.warning(f"Tool {tool_name} exceeded its {budget}s budget; continuing without it")
+                self._move_to_background(key, tool_name, future)
+                content = (
+                    f"Still waiting on {tool_name}: no result after {budget:g}s. The lookup is still running "
+                    f"in the background. Answer with the information available and tell the user this "
+                    f"result is pending; asking again with the same request within "
+                    f"{LATE_RESULT_TTL_SECONDS // 60} minutes will pick it up."
+                )
+            messages.append({"role": "tool", "content": content, "tool_call_id": tool_call['id']})
+        return messages
+
+    def shutdown(self):
+        """Stop accepting work and cancel queued calls; running tool calls finish in the background."""
+        # Cancelling ourselves instead of shutdown(cancel_futures=True), which needs Python 3.9
+        with self._lock:
+            queued = list(self._in_flight.values())
+        for future in queued:
+            future.cancel()  # No-op for calls already running
+        self._executor.shutdown(wait=False)
+
+
+# Global instance
+_tool_runner = None
+_tool_runner_lock = threading.Lock()
+
+
+def get_tool_runner() -> ToolRunner:
+    """Get or create global tool runner instance."""
+    global _tool_runner
+    if _tool_runner is None:
+        with _tool_runner_lock:
+            if _tool_runner is None:
+                _tool_runner = ToolRunner()
+    return _tool_runner
@@ -9,16 +9,16 @@ Uses ChromaDB for persistent vector storage.
 """
 
 import hashlib
+import json
 import logging
 import os
 import time
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 import chromadb
-import requests
 from langchain_community.document_loaders import (
-    PyPDFDirectoryLoader,
+    PyPDFLoader,
     UnstructuredExcelLoader,
     UnstructuredWordDocumentLoader,
 )
@@ -33,104 +33,37 @@ try:
 except ImportError:
     from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from src.utils.embedding_service import get_embedding_service
+
 
 # Collection name for documents
 DOCUMENTS_COLLECTION = "local_documents"
 
+# File-level manifest kept next to the ChromaDB data: file -> size, mtime, content hash, chunk ids
+MANIFEST_FILENAME = "document_manifest.json"
+MANIFEST_VERSION = 1
 
-class OllamaEmbeddingFunction:
-    """Custom embedding function using Ollama API with batch support."""
-
-    def __init__(self, model: str = "nomic-embed-text", batch_size: int = 50):
-        self.model = model
-        self.api_url = "http://localhost:11434/api/embed"
-        self.batch_size = batch_size  # Max texts per API call
-
-    def __call__(self, input: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts using batch API calls."""
-        if not input:
-            return []
-
-        # For small inputs, use single batch call
-        if len(input) <= self.batch_size:
-            return self._embed_batch(input)
-
-        # For large inputs, process in parallel batches
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.xlsx', '.xls')
 
-        all_embeddings = [None] * len(input)  # Pre-allocate to maintain order
-        batches = []
 
-        # Split into batches with their original indices
-        for i in range(0, len(input), self.batch_size):
-            batch_texts = input[i:i + self.batch_size]
-            batches.append((i, batch_texts))
+def _file_sha256(path: str) -> str:
+    """Content hash of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
-        logging.info(f"Processing {len(input)} texts in {len(batches)} parallel batches...")
 
-        # Process batches in parallel (limit workers to avoid overwhelming Ollama)
-        max_workers = min(4, len(batches))
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_batch = {
-                executor.submit(self._embed_batch, batch_texts): (start_idx, batch_texts)
-                for start_idx, batch_texts in batches
-            }
+class OllamaEmbeddingFunction:
+    """Embedding function backed by the shared, cached Ollama embedding service."""
 
-            for future in as_completed(future_to_batch):
-                start_idx, batch_texts = future_to_batch[future]
-                try:
-                    batch_embeddings = future.result()
-                    for j, embedding in enumerate(batch_embeddings):
-                        all_embeddings[start_idx + j] = embedding
-                except Exception as e:
-                    logging.error(f"Batch embedding failed at index {start_idx}: {e}")
-                    # Fallback: try individual embeddings for failed batch
-                    for j, text in enumerate(batch_texts):
-                        try:
-                            all_embeddings[start_idx + j] = self._embed_single(text)
-                        except Exception as inner_e:
-                            logging.error(f"Single embedding fallback failed: {inner_e}")
-                            raise
-
-        return all_embeddings
-
-    def _embed_batch(self, texts: List[str], max_retries: int = 3) -> List[List[float]]:
-        """Generate embeddings for a batch of texts in a single API call."""
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(
-                    self.api_url,
-                    json={"model": self.model, "input": texts},
-                    timeout=120  # Longer timeout for batches
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result["embeddings"]
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logging.warning(f"Batch embedding failed (attempt {attempt + 1}): {e}")
-                    time.sleep(2)
-                else:
-                    raise RuntimeError(f"Failed to embed batch of {len(texts)} texts: {e}")
+    def __init__(self, model: str = "nomic-embed-text"):
+        self.model = model
 
-    def _embed_single(self, text: str, max_retries: int = 3) -> List[float]:
-        """Generate embedding for a single text (fallback method)."""
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(
-                    self.api_url,
-                    json={"model": self.model, "input": text},
-                    timeout=60
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result["embeddings"][0]
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logging.warning(f"Embedding failed (attempt {attempt + 1}): {e}")
-                    time.sleep(2)
-                else:
-                    raise RuntimeError(f"Failed to embed text: {e}")
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        """Generate embeddings for a list of texts, reusing cached ones."""
+        return get_embedding_service().embed(self.model, input)
 
 
 class ChromaRetriever(BaseRetriever):
@@ -182,6 +115,7 @@ class DocumentProcessor:
             # Convert old faiss_index_path to chroma path
             chroma_path = str(Path(pdf_directory).parent / "chroma_documents")
         self.chroma_path = chroma_path
+        self.manifest_path = Path(chroma_path) / MANIFEST_FILENAME
 
         self._client: Optional[chromadb.PersistentClient] = None
         self._collection = None
@@ -225,36 +159,43 @@ class DocumentProcessor:
         hash_input = f"{source}:{content[:200]}"
         return hashlib.md5(hash_input.encode()).hexdigest()
 
+    def _list_document_files(self) -> List[str]:
+        """Names of the supported documents in the folder (sorted for stable processing order)."""
+        return sorted(
+            fname for fname in os.listdir(self.pdf_directory)
+            if os.path.isfile(os.path.join(self.pdf_directory, fname))
+            and os.path.splitext(fname)[1].lower() in SUPPORTED_EXTENSIONS
+        )
+
+    def load_document_file(self, fname: str) -> List:
+        """Load a single document from the folder. Raises on loader errors."""
+        ext = os.path.splitext(fname)[1].lower()
+
+        if ext == ".pdf":
+            # Same source path format PyPDFDirectoryLoader produced, so chunk ids stay stable
+            loader = PyPDFLoader(str(Path(self.pdf_directory) / fname))
+        elif ext in [".doc", ".docx"]:
+            loader = UnstructuredWordDocumentLoader(os.path.join(self.pdf_directory, fname))
+        elif ext in [".xlsx", ".xls"]:
+            loader = UnstructuredExcelLoader(os.path.join(self.pdf_directory, fname))
+        else:
+            return []
+
+        documents = loader.load()
+        logging.debug(f"Loaded {ext} document: {fname}")
+        return documents
+
     def load_documents_from_folder(self) -> List:
         """Load documents from the specified folder"""
         documents = []
-        pdf_loaded = False
 
         if not os.path.exists(self.pdf_directory):
             logging.warning(f"Folder does not exist: {self.pdf_directory}")
             return documents
 
-        for fname in os.listdir(self.pdf_directory):
-            fpath = os.path.join(self.pdf_directory, fname)
-            if not os.path.isfile(fpath):
-                continue
-
-            ext = os.path.splitext(fname)[1].lower()
-
+        for fname in self._list_document_files():
             try:
-                if ext == ".pdf" and not pdf_loaded:
-                    loader = PyPDFDirectoryLoader(self.pdf_directory)
-                    documents.extend(loader.load())
-                    pdf_loaded = True
-                    logging.debug(f"Loaded PDF documents from {self.pdf_directory}")
-                elif ext in [".doc", ".docx"]:
-                    loader = UnstructuredWordDocumentLoader(fpath)
-                    documents.extend(loader.load())
-                    logging.debug(f"Loaded Word document: {fname}")
-                elif ext in [".xlsx", ".xls"]:
-                    loader = UnstructuredExcelLoader(fpath)
-                    documents.extend(loader.load())
-                    logging.debug(f"Loaded Excel document: {fname}")
+                documents.extend(self.load_document_file(fname))
             except Exception as e:
                 logging.error(f"Failed to load {fname}: {e}")
 
@@ -276,84 +217,176 @@ class DocumentProcessor:
         logging.debug(f"Split into {len(texts)} text chunks.")
         return texts
 
+    def _load_manifest(self) -> Dict[str, Any]:
+        """Load the file manifest; a missing, unreadable or outdated manifest counts as empty."""
+        empty = {
+            "version": MANIFEST_VERSION,
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "files": {},
+        }
+        try:
+            with open(self.manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return empty
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable document manifest {self.manifest_path}: {e}")
+            return empty
+
+        if manifest.get("version") != MANIFEST_VERSION:
+            return empty
+        if manifest.get("chunk_size") != self.chunk_size or manifest.get("chunk_overlap") != self.chunk_overlap:
+            logging.info("Chunk settings changed since last sync - re-indexing all documents")
+            return empty
+        return manifest
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        """Write the manifest atomically (temp file + rename)."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_name(self.manifest_path.name + '.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        temp_path.replace(self.manifest_path)
+
+    def _load_chunks_from_collection(self) -> List[Document]:
+        """Read the indexed chunks back from ChromaDB (used for BM25 without re-parsing files)."""
+        result = self.collection.get(include=['documents', 'metadatas'])
+        return [
+            Document(page_content=content or "", metadata=metadata or {})
+            for content, metadata in zip(result['documents'] or [], result['metadatas'] or [])
+        ]
+
     def sync_documents(self, embeddings=None, batch_size: int = 10) -> bool:
-        """Add new documents to ChromaDB. Skips already-indexed chunks."""
+        """
+        Incrementally sync the folder into ChromaDB using the file manifest.
+
+        Unchanged files (same size and mtime, or same content hash) are skipped
+        before parsing. New and modified files are parsed, chunked and embedded;
+        chunks a modified file no longer produces are deleted, and chunks of
+        removed files are purged.
+        """
         if not os.path.exists(self.pdf_directory):
             logging.warning(f"PDF directory '{self.pdf_directory}' does not exist.")
             return False
 
-        files_in_dir = [f for f in os.listdir(self.pdf_directory)
-                        if f.endswith(('.pdf', '.docx', '.doc', '.xlsx', '.xls'))]
+        files_in_dir = self._list_document_files()
         if not files_in_dir:
             logging.warning(f"PDF directory '{self.pdf_directory}' has no documents.")
             return False
 
-        logging.debug(f"Loading documents from: {self.pdf_directory}")
-        documents = self.load_documents_from_folder()
+        start_time = time.time()
+        manifest = self._load_manifest()
+        previous_files: Dict[str, Dict[str, Any]] = manifest["files"]
+        if previous_files and self.collection.count() == 0:
+            logging.info("ChromaDB collection is empty - ignoring stale document manifest")
+            previous_files = {}
 
-        if not documents:
-            logging.warning(f"No documents could be loaded from '{self.pdf_directory}'.")
-            return False
+        current_files: Dict[str, Dict[str, Any]] = {}
+        changed = []  # (fname, new entry without chunk ids, previous entry or None)
+
+        for fname in files_in_dir:
+            fpath = os.path.join(self.pdf_directory, fname)
+            stat = os.stat(fpath)
+            entry = previous_files.get(fname)
 
-        logging.debug(f"Loaded {len(documents)} documents.")
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                current_files[fname] = entry
+                continue
 
-        # Create text chunks
-        texts = self.create_text_chunks(documents)
-        self.all_documents = texts
+            content_hash = _file_sha256(fpath)
+            if entry and entry["sha256"] == content_hash:
+                # Touched but not changed
+                current_files[fname] = {**entry, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+                continue
 
-        # Get existing IDs to avoid duplicates
-        existing_ids = set()
-        try:
-            result = self.collection.get()
-            existing_ids = set(result['ids']) if result['ids'] else set()
-            logging.debug(f"ChromaDB has {len(existing_ids)} existing chunks")
-        except Exception as e:
-            logging.warning(f"Could not get existing IDs: {e}")
+            changed.append((fname, {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": content_hash}, entry))
+
+        removed = [fname for fname in previous_files if fname not in files_in_dir]
+        stale_ids = set()
+        for fname in removed:
+            stale_ids.update(previous_files[fname]["chunk_ids"])
 
-        # Prepare new chunks
         ids = []
         documents_content = []
         metadatas = []
+        pending_ids = set()
 
-        total_chunks = len(texts)
-        print(f"   Processing {total_chunks} text chunks...", flush=True)
-
-        for i, doc in enumerate(texts):
-            doc_id = self._generate_doc_id(doc.page_content, doc.metadata.get('source', ''))
+        if changed:
+            print(f"   Processing {len(changed)} new or modified documents...", flush=True)
 
-            # Skip if already indexed
-            if doc_id in existing_ids:
+        for fname, new_entry, old_entry in changed:
+            try:
+                chunks = self.create_text_chunks(self.load_document_file(fname))
+            except Exception as e:
+                logging.error(f"Failed to load {fname}: {e}")
+                # Keep the previous chunks (if any) and retry on the next sync
+                if old_entry:
+                    current_files[fname] = old_entry
                 continue
 
-            if (i + 1) % 20 == 0 or i == 0:
-                print(f"   Processing chunk {i + 1}/{total_chunks}...", flush=True)
+            file_ids = []
+            file_chunks = {}
+            for doc in chunks:
+                doc_id = self._generate_doc_id(doc.page_content, doc.metadata.get('source', ''))
+                if doc_id not in file_chunks:
+                    file_ids.append(doc_id)
+                    file_chunks[doc_id] = doc
+
+            to_embed = [doc_id for doc_id in file_ids if doc_id not in pending_ids]
+            if old_entry is None and to_embed:
+                # New to the manifest: skip chunks already embedded (e.g. indexed before the manifest existed)
+                try:
+                    existing = set(self.collection.get(ids=to_embed, include=[])['ids'] or [])
+                    to_embed = [doc_id for doc_id in to_embed if doc_id not in existing]
+                except Exception as e:
+                    logging.warning(f"Could not check existing chunks for {fname}: {e}")
 
-            ids.append(doc_id)
-            documents_content.append(doc.page_content)
-            metadatas.append(doc.metadata)
+            for doc_id in to_embed:
+                pending_ids.add(doc_id)
+                ids.append(doc_id)
+                documents_content.append(file_chunks[doc_id].page_content)
+                metadatas.append(file_chunks[doc_id].metadata)
 
-        if not ids:
-            logging.info("No new chunks to add")
-            return True
+            if old_entry:
+                stale_ids.update(set(old_entry["chunk_ids"]) - set(file_ids))
+            current_files[fname] = {**new_entry, "chunk_ids": file_ids}
+
+        # Chunk ids are content-derived, so another file may still own a "stale" id
+        for entry in current_files.values():
+            stale_ids.difference_update(entry["chunk_ids"])
 
-        # Generate embeddings and upsert to ChromaDB
-        print(f"   Embedding and upserting {len(ids)} new chunks...", flush=True)
         try:
-            embeddings_list = self._embedding_fn(documents_content)
+            if ids:
+                print(f"   Embedding and upserting {len(ids)} new chunks...", flush=True)
+                embeddings_list = self._embedding_fn(documents_content)
+                self.collection.upsert(
+                    ids=ids,
+                    documents=documents_content,
+                    metadatas=metadatas,
+                    embeddings=embeddings_list
+                )
+            if stale_ids:
+                self.collection.delete(ids=list(stale_ids))
+        except Exception as e:
+            logging.error(f"Error syncing documents to ChromaDB: {e}", exc_info=True)
+            return False
 
-            self.collection.upsert(
-                ids=ids,
-                documents=documents_content,
-                metadatas=metadatas,
-                embeddings=embeddings_list
-            )
+        manifest["files"] = current_files
+        try:
+            self._save_manifest(manifest)
+        except OSError as e:
+            logging.warning(f"Could not write document manifest {self.manifest_path}: {e}")
 
-            logging.debug(f"Added {len(ids)} chunks to ChromaDB")
-            return True
+        if ids or stale_ids or not self.all_documents:
+            self.all_documents = self._load_chunks_from_collection()
 
-        except Exception as e:
-            logging.error(f"Error adding to ChromaDB: {e}", exc_info=True)
-            return False
+        unchanged = len(files_in_dir) - len(changed)
+        logging.info(
+            f"Document sync: {unchanged} unchanged, {len(changed)} new/modified, {len(removed)} removed files; "
+            f"{len(ids)} chunks embedded, {len(stale_ids)} chunks deleted in {time.time() - start_time:.1f}s"
+        )
+        return True
 
     def load_vector_store(self, embeddings=None) -> bool:
         """Load existing vector store (ChromaDB loads automatically)."""
@@ -365,13 +398,11 @@ class DocumentProcessor:
 
             logging.debug(f"ChromaDB collection has {count} chunks")
 
-            # Load documents for BM25 retriever if not already loaded
+            # Load chunks for BM25 retriever if not already loaded (from ChromaDB, no re-parsing)
             if not self.all_documents:
-                logging.debug("Loading documents for BM25 retriever...")
-                documents = self.load_documents_from_folder()
-                if documents:
-                    self.all_documents = self.create_text_chunks(documents)
-                    logging.debug(f"Loaded {len(self.all_documents)} documents for BM25")
+                logging.debug("Loading indexed chunks for BM25 retriever...")
+                self.all_documents = self._load_chunks_from_collection()
+                logging.debug(f"Loaded {len(self.all_documents)} documents for BM25")
 
             return True
 
@@ -506,6 +537,12 @@ class DocumentProcessor:
         except Exception as e:
             logging.warning(f"Could not delete collection: {e}")
 
+        # The manifest describes the deleted collection
+        try:
+            self.manifest_path.unlink()
+        except FileNotFoundError:
+            pass
+
         # Reset internal state
         self.retriever = None
         self.all_documents = []
@@ -23,6 +23,10 @@ from langchain_core.tools import tool
 
 from services.abusech import AbuseCHClient
 from src.utils.tool_decorator import log_tool_call
+from src.utils.tool_cache import cache_tool_result, HOUR
+
+# Reputation lookups are cached (shared across sessions) for this long
+REPUTATION_TTL = 4 * HOUR
 
 logger = logging.getLogger(__name__)
 
@@ -206,6 +210,7 @@ def _format_ip_result(data: dict) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def check_domain_abusech(domain: str) -> str:
     """Check if a domain is associated with malware distribution or malicious activity.
 
@@ -242,6 +247,7 @@ def check_domain_abusech(domain: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def check_ip_abusech(ip_address: str) -> str:
     """Check if an IP address is a known malware C2 server or malicious host.
 
@@ -14,6 +14,10 @@ from langchain_core.tools import tool
 
 from services.abuseipdb import AbuseIPDBClient, ABUSE_CATEGORIES
 from src.utils.tool_decorator import log_tool_call
+from src.utils.tool_cache import cache_tool_result, HOUR
+
+# Reputation lookups are cached (shared across sessions) for this long
+REPUTATION_TTL = 4 * HOUR
 
 logger = logging.getLogger(__name__)
 
@@ -153,6 +157,7 @@ def _format_domain_result(data: dict) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def lookup_ip_abuseipdb(ip_address: str) -> str:
     """Look up an IP address in AbuseIPDB for abuse reports and reputation.
 
@@ -184,6 +189,7 @@ def lookup_ip_abuseipdb(ip_address: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def lookup_domain_abuseipdb(domain: str) -> str:
     """Look up a domain in AbuseIPDB by checking its resolved IP addresses.
 
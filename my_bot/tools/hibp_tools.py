@@ -21,6 +21,10 @@ from langchain_core.tools import tool
 
 from services.hibp import HIBPClient
 from src.utils.tool_decorator import log_tool_call
+from src.utils.tool_cache import cache_tool_result, HOUR
+
+# Breach data changes slowly; cache lookups for this long
+BREACH_TTL = 12 * HOUR
 
 logger = logging.getLogger(__name__)
 
@@ -240,6 +244,7 @@ def _format_breach_info(data: dict) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=BREACH_TTL, case_insensitive=True)
 def check_email_hibp(email: str) -> str:
     """Check if an email address has been pwned or involved in known data breaches.
 
@@ -274,6 +279,7 @@ def check_email_hibp(email: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=BREACH_TTL, case_insensitive=True)
 def check_domain_hibp(domain: str) -> str:
     """Check common email addresses for a domain against known data breaches.
 
@@ -314,6 +320,7 @@ def check_domain_hibp(domain: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=BREACH_TTL, case_insensitive=True)
 def get_breach_info_hibp(breach_name: str) -> str:
     """Get detailed information about a specific data breach.
 
@@ -21,6 +21,7 @@ from langchain_core.tools import tool
 
 from services.intelx import IntelligenceXClient, get_client
 from src.utils.tool_decorator import log_tool_call
+from src.utils.tool_cache import cache_tool_result, HOUR
 
 logger = logging.getLogger(__name__)
 
@@ -153,6 +154,7 @@ def _format_search_result(data: dict) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=HOUR, case_insensitive=True)
 def search_intelx(search_term: str) -> str:
     """Search IntelligenceX for dark web, leak, and paste site mentions.
 
@@ -186,6 +188,7 @@ def search_intelx(search_term: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=HOUR, case_insensitive=True)
 def search_darkweb_intelx(search_term: str) -> str:
     """Search IntelligenceX specifically for dark web (Tor/I2P) mentions only.
 
@@ -17,6 +17,7 @@ def get_bot_metrics() -> str:
         import psutil
         from datetime import datetime, timedelta
         from pathlib import Path
+        from src.utils.tool_cache import get_tool_cache
 
         # Load conversation data
         csv_path = Path(__file__).parent.parent.parent / "data/transient/logs/pokedex_conversations.csv"
@@ -89,7 +90,7 @@ def get_bot_metrics() -> str:
                 'process_memory_mb': round(psutil.Process().memory_info().rss / (1024 ** 2), 1)
             },
             'top_users_week': top_users_week.to_dict() if len(top_users_week) > 0 else {},
-            'cache_hit_rate': 85,  # Mock value
+            'cache_hit_rate': get_tool_cache().get_stats()['hit_rate'],  # Tool result cache
             'total_errors': 0,  # Could be calculated from response analysis
             'total_lifetime_errors': 0,
             'uptime_hours': 0.5,  # Mock value
@@ -12,6 +12,10 @@ from langchain_core.tools import tool
 
 from services.recorded_future import RecordedFutureClient
 from src.utils.tool_decorator import log_tool_call
+from src.utils.tool_cache import cache_tool_result, HOUR
+
+# Reputation lookups are cached (shared across sessions) for this long
+REPUTATION_TTL = 4 * HOUR
 
 # Lazy-initialized Recorded Future client
 _rf_client: Optional[RecordedFutureClient] = None
@@ -194,6 +198,7 @@ def _format_actor_summary(summary: dict) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def lookup_ip_recorded_future(ip_address: str) -> str:
     """Look up an IP address in Recorded Future for threat intelligence.
 
@@ -216,6 +221,7 @@ def lookup_ip_recorded_future(ip_address: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def lookup_domain_recorded_future(domain: str) -> str:
     """Look up a domain in Recorded Future for threat intelligence.
 
@@ -242,6 +248,7 @@ def lookup_domain_recorded_future(domain: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def lookup_hash_recorded_future(file_hash: str) -> str:
     """Look up a file hash in Recorded Future for malware intelligence.
 
@@ -264,6 +271,7 @@ def lookup_hash_recorded_future(file_hash: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL)
 def lookup_url_recorded_future(url: str) -> str:
     """Look up a URL in Recorded Future for threat intelligence.
 
@@ -286,6 +294,7 @@ def lookup_url_recorded_future(url: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def lookup_cve_recorded_future(cve_id: str) -> str:
     """Look up a CVE/vulnerability in Recorded Future for intelligence.
 
@@ -307,6 +316,7 @@ def lookup_cve_recorded_future(cve_id: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def search_threat_actor_recorded_future(actor_name: str) -> str:
     """Search for a threat actor in Recorded Future.
 
@@ -328,6 +338,7 @@ def search_threat_actor_recorded_future(actor_name: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL)
 def triage_for_phishing_recorded_future(indicator: str) -> str:
     """Triage an indicator (domain, URL, or IP) for phishing risk using Recorded Future.
 
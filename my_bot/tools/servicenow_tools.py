@@ -13,6 +13,7 @@ from langchain_core.tools import tool
 
 from services.service_now import ServiceNowClient
 from src.utils.tool_decorator import log_tool_call
+from src.utils.tool_cache import cache_tool_result, HOUR
 
 # Lazy-initialized ServiceNow client
 _servicenow_client: Optional[ServiceNowClient] = None
@@ -97,6 +98,7 @@ def _format_host_details(details: dict, hostname: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=HOUR, case_insensitive=True)
 def get_host_details_snow(hostname: str) -> str:
     """Get host/device details from ServiceNow CMDB.
 
@@ -20,6 +20,10 @@ from langchain_core.tools import tool
 
 from services.shodan_monitor import ShodanClient
 from src.utils.tool_decorator import log_tool_call
+from src.utils.tool_cache import cache_tool_result, HOUR
+
+# Reputation lookups are cached (shared across sessions) for this long
+REPUTATION_TTL = 4 * HOUR
 
 logger = logging.getLogger(__name__)
 
@@ -230,6 +234,7 @@ def _format_domain_result(data: dict) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def lookup_ip_shodan(ip_address: str) -> str:
     """Look up an IP address in Shodan for exposed services and vulnerabilities.
 
@@ -262,6 +267,7 @@ def lookup_ip_shodan(ip_address: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def lookup_domain_shodan(domain: str) -> str:
     """Look up a domain's infrastructure in Shodan for exposed services.
 
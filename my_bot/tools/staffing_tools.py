@@ -18,11 +18,31 @@ from src.secops import (
     get_shift_lead,
     get_basic_shift_staffing,
     get_shift_ticket_metrics,  # Uses exact timestamps for accurate metrics
-    get_shift_security_actions
+    get_shift_security_actions,
+    seconds_until_next_shift
 )
 
 # Import tool logging decorator
 from src.utils.tool_decorator import log_tool_call
+from src.utils.tool_cache import cache_tool_result
+
+
+# Staffing only changes at shift boundaries, so these are cached until the next shift starts
+@cache_tool_result(ttl=seconds_until_next_shift)
+def _current_shift_teams() -> dict:
+    """Current shift's teams with blank entries removed."""
+    teams = {}
+    for team, members in get_staffing_data().items():
+        if members:
+            clean_members = [member for member in members if member and member.strip()]
+            if clean_members:
+                teams[team] = clean_members
+    return teams
+
+
+@cache_tool_result(ttl=seconds_until_next_shift, case_insensitive=True)
+def _shift_lead(day_name: str, shift_name: str):
+    return get_shift_lead(day_name, shift_name)
 
 
 @tool
@@ -59,17 +79,9 @@ def get_current_shift_info() -> str:
 def get_current_staffing() -> str:
     """Get current shift staffing information."""
     try:
-        staffing_data = get_staffing_data()
+        teams = _current_shift_teams()
         current_shift = get_current_shift()
         eastern_time = datetime.now(pytz.timezone('US/Eastern'))
-        
-        # Clean up the staffing data
-        teams = {}
-        for team, members in staffing_data.items():
-            if members:
-                clean_members = [member for member in members if member and member.strip()]
-                if clean_members:
-                    teams[team] = clean_members
 
         # Create simple structured data
         result = {
@@ -106,7 +118,7 @@ def get_shift_lead_info(day_name: str = None, shift_name: str = None) -> str:
         if shift_name is None:
             shift_name = get_current_shift()
 
-        shift_lead = get_shift_lead(day_name, shift_name.lower())
+        shift_lead = _shift_lead(day_name, shift_name.lower())
 
         result = {
             "day": day_name,
@@ -16,6 +16,7 @@ from langchain_core.tools import tool
 
 from services.urlscan import URLScanClient
 from src.utils.tool_decorator import log_tool_call
+from src.utils.tool_cache import cache_tool_result, HOUR
 
 logger = logging.getLogger(__name__)
 
@@ -231,6 +232,7 @@ def _format_scan_result(data: dict, url: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=HOUR, case_insensitive=True)
 def search_urlscan(domain: str) -> str:
     """Search URLScan.io for existing scans of a domain.
 
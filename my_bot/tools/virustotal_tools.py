@@ -14,6 +14,10 @@ from langchain_core.tools import tool
 
 from services.virustotal import VirusTotalClient
 from src.utils.tool_decorator import log_tool_call
+from src.utils.tool_cache import cache_tool_result, HOUR
+
+# Reputation lookups are cached (shared across sessions) for this long
+REPUTATION_TTL = 4 * HOUR
 
 # Lazy-initialized VirusTotal client
 _vt_client: Optional[VirusTotalClient] = None
@@ -182,6 +186,7 @@ def _format_hash_result(data: dict) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def lookup_ip_virustotal(ip_address: str) -> str:
     """Look up an IP address in VirusTotal for threat intelligence.
 
@@ -205,6 +210,7 @@ def lookup_ip_virustotal(ip_address: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def lookup_domain_virustotal(domain: str) -> str:
     """Look up a domain in VirusTotal for threat intelligence.
 
@@ -228,6 +234,7 @@ def lookup_domain_virustotal(domain: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL)
 def lookup_url_virustotal(url: str) -> str:
     """Look up a URL in VirusTotal for threat intelligence.
 
@@ -251,6 +258,7 @@ def lookup_url_virustotal(url: str) -> str:
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=REPUTATION_TTL, case_insensitive=True)
 def lookup_hash_virustotal(file_hash: str) -> str:
     """Look up a file hash in VirusTotal for malware analysis.
 
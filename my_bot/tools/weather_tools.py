@@ -9,10 +9,15 @@ from langchain_core.tools import tool
 
 # Import tool logging decorator
 from src.utils.tool_decorator import log_tool_call
+from src.utils.tool_cache import cache_tool_result, MINUTE
+
+# Weather is cached briefly; it changes but not by the minute
+WEATHER_TTL = 10 * MINUTE
 
 
 @tool
 @log_tool_call
+@cache_tool_result(ttl=WEATHER_TTL, case_insensitive=True)
 def get_weather_info(city: str) -> str:
     """Get current weather information for a specific city."""
     try:
@@ -36,8 +36,13 @@ def add_approved_testing_entry(
     if not submit_date:
         submit_date = datetime.now().strftime("%m/%d/%Y")
 
-    current_entries = list_handler.get_list_data_by_name(approved_testing_list_name)
-    master_entries = list_handler.get_list_data_by_name(approved_testing_master_list_name)
+    # Read fresh with versions: saving stale data would overwrite concurrent additions
+    current = list_handler.read_for_update(approved_testing_list_name)
+    master = list_handler.read_for_update(approved_testing_master_list_name)
+    if current is None or master is None:
+        raise ValueError("Approved testing lists were not found in XSOAR.")
+    current_version, current_entries = current
+    master_version, master_entries = master
 
     all_items = (items_of_tester + ', ' + items_to_be_tested).strip(', ')
     usernames_list = [u.strip() for u in usernames.split(',')] if usernames else []
@@ -111,8 +116,8 @@ def add_approved_testing_entry(
                 "expiry_date": expiry_date,
                 "submitter_ip_address": submitter_ip_address,
             })
-    list_handler.save(approved_testing_list_name, current_entries)
-    list_handler.save(approved_testing_master_list_name, master_entries)
+    list_handler.save(approved_testing_list_name, current_entries, current_version)
+    list_handler.save(approved_testing_master_list_name, master_entries, master_version)
 
     new_item = {
         "description": description,
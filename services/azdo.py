@@ -43,6 +43,26 @@ def fetch_work_items(query: str, project: str = None):
     Returns:
         List of work items with fields or empty list if no work items are found.
     """
+    all_work_items = []
+    for page in iter_work_item_pages(query, project):
+        all_work_items.extend(page)
+    return all_work_items
+
+
+def iter_work_item_pages(query: str, project: str = None, page_size: int = 50):
+    """
+    Yield work items for a WIQL query one details page at a time.
+
+    Lets callers process large result sets without holding every work item in memory.
+
+    Args:
+        query (str): The WIQL query string.
+        project (str): The project name. If None, uses the DE project from config or defaults to 'Detection-Engineering'.
+        page_size (int): Work items per details request (AZDO caps this at 200).
+
+    Yields:
+        Lists of work items with fields, in query order. Failed pages are logged and skipped.
+    """
     # Execute WIQL query to get work item IDs
     # Use provided project or default to DE project
     if project is None:
@@ -56,51 +76,47 @@ def fetch_work_items(query: str, project: str = None):
         response = azdo_session.post(wiql_endpoint, headers=headers, json=query_body)
         if response is None:
             logger.error("Failed to query work items after all retries")
-            return []
+            return
 
         response.raise_for_status()
         work_item_ids = [item['id'] for item in response.json().get('workItems', [])]
 
-        if not work_item_ids:
-            logger.info("No work items found for query")
-            return []
-
-        logger.debug(f"Found {len(work_item_ids)} work items, fetching details in batches of 50")
-
-        # Fetch work item details in batches of 50
-        batch_size = 50
-        all_work_items = []
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Error executing WIQL query: {e}")
+        if "404" in str(e):
+            logger.error(f"URL not found: {wiql_endpoint}")
+            logger.error(f"Please verify AZDO_ORGANIZATION and AZDO_DE_PROJECT in .env match your Azure DevOps setup")
+        return
 
-        for i in range(0, len(work_item_ids), batch_size):
-            batch_ids = work_item_ids[i:i + batch_size]
-            ids_param = ",".join(map(str, batch_ids))
+    if not work_item_ids:
+        logger.info("No work items found for query")
+        return
 
-            # Get work item details for this batch
-            work_items_endpoint = f'{organization_url}/_apis/wit/workitems?ids={ids_param}&$expand=fields&api-version=7.0'
+    logger.debug(f"Found {len(work_item_ids)} work items, fetching details in batches of {page_size}")
 
-            try:
-                batch_response = azdo_session.get(work_items_endpoint, headers=headers)
-                if batch_response is None:
-                    logger.error(f"Failed to fetch work items for batch {batch_ids} after all retries")
-                    continue
+    for i in range(0, len(work_item_ids), page_size):
+        batch_ids = work_item_ids[i:i + page_size]
+        ids_param = ",".join(map(str, batch_ids))
 
-                batch_response.raise_for_status()
-                batch_items = batch_response.json().get('value', [])
-                all_work_items.extend(batch_items)
+        # Get work item details for this batch
+        work_items_endpoint = f'{organization_url}/_apis/wit/workitems?ids={ids_param}&$expand=fields&api-version=7.0'
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Error fetching work items for batch {batch_ids}: {e}")
-                time.sleep(2)  # Brief pause before continuing with next batch
+        try:
+            batch_response = azdo_session.get(work_items_endpoint, headers=headers)
+            if batch_response is None:
+                logger.error(f"Failed to fetch work items for batch {batch_ids} after all retries")
                 continue
 
-        return all_work_items
+            batch_response.raise_for_status()
+            batch_items = batch_response.json().get('value', [])
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error executing WIQL query: {e}")
-        if "404" in str(e):
-            logger.error(f"URL not found: {wiql_endpoint}")
-            logger.error(f"Please verify AZDO_ORGANIZATION and AZDO_DE_PROJECT in .env match your Azure DevOps setup")
-        return []
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching work items for batch {batch_ids}: {e}")
+            time.sleep(2)  # Brief pause before continuing with next batch
+            continue
+
+        if batch_items:
+            yield batch_items
 
 
 def get_stories_from_area_path(area_path):
@@ -6,6 +6,7 @@ urllib3.disable_warnings(InsecureRequestWarning)
 import concurrent.futures
 import logging
 import sys
+import threading
 import time
 from datetime import datetime
 from enum import Enum
@@ -26,6 +27,18 @@ logger = logging.getLogger(__name__)
 DATA_DIR = Path(__file__).parent.parent / "data" / "transient" / "epp_device_tagging"
 CS_FETCH_MAX_WORKERS = 10
 
+# Bulk lookup limits
+HOSTNAME_FILTER_BATCH_SIZE = 100  # Hostnames per FQL filter (keeps the query string a sane length)
+DEVICE_QUERY_LIMIT = 5000  # Max device ids per query_devices_by_filter call
+DEVICE_DETAILS_BATCH_SIZE = 1000  # Device ids per get_device_details_v2 call
+ONLINE_STATE_BATCH_SIZE = 100  # Max device ids per get_online_state call
+
+# hostname (lowercase) -> (device_id, cached_at), shared by all clients in the process.
+# Device ids only change when a host is reinstalled, so entries live for a day.
+DEVICE_ID_CACHE_TTL_SECONDS = 24 * 60 * 60
+_device_id_cache: Dict[str, tuple] = {}
+_device_id_cache_lock = threading.Lock()
+
 # Get robust HTTP session instance
 http_session = get_session()
 
@@ -137,30 +150,146 @@ class CrowdStrikeClient:
             logger.warning(f"CrowdStrike API authentication failed: {self.last_error}")
             return False
 
-    def get_device_ids_batch(self, hostnames, batch_size=100):
-        """Get device IDs for multiple hostnames in batches"""
-        results = {}
-        for i in range(0, len(hostnames), batch_size):
-            batch = hostnames[i:i + batch_size]
-            host_filter = f"hostname:['{'', ''.join(batch)}']"
+    def resolve_device_ids(self, hostnames: List[str],
+                           details: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, str]:
+        """
+        Resolve hostnames to device ids with batched filter queries.
+
+        Resolved ids are cached per process. A hostname with several devices
+        (e.g. after a reinstall) maps to the most recently seen one, like get_device_id().
 
+        Args:
+            hostnames: Hostnames to resolve
+            details: Optional dict to fill with device id -> device details for every
+                resolved device. Details fetched while resolving are reused; only
+                devices that came from the id cache need another request.
+
+        Returns:
+            Dict of hostname (as given) -> device id; hostnames not found are left out
+        """
+        now = time.time()
+        results: Dict[str, str] = {}
+        missing: Dict[str, List[str]] = {}  # lowercase hostname -> hostnames as given
+        with _device_id_cache_lock:
+            for hostname in hostnames:
+                cached = _device_id_cache.get(hostname.lower())
+                if cached and now - cached[1] < DEVICE_ID_CACHE_TTL_SECONDS:
+                    results[hostname] = cached[0]
+                else:
+                    missing.setdefault(hostname.lower(), []).append(hostname)
+
+        names = list(missing)
+        for i in range(0, len(names), HOSTNAME_FILTER_BATCH_SIZE):
+            batch = names[i:i + HOSTNAME_FILTER_BATCH_SIZE]
+            host_filter = "hostname:[" + ", ".join(f"'{name}'" for name in batch) + "]"
             response = self.hosts_client.query_devices_by_filter(
                 filter=host_filter,
-                limit=len(batch)
+                sort='last_seen.desc',
+                limit=DEVICE_QUERY_LIMIT
             )
+            if response.get("status_code") != 200:
+                logger.warning(f"Device id lookup failed for {len(batch)} hostnames: HTTP {response.get('status_code')}")
+                continue
+
+            device_ids = response["body"].get("resources", [])
+            batch_details = self.get_devices_details(device_ids)
+            resolved = {}
+            for device_id in device_ids:  # Most recently seen first
+                hostname = (batch_details.get(device_id, {}).get("hostname") or "").lower()
+                if hostname in missing and hostname not in resolved:
+                    resolved[hostname] = device_id
+                    if details is not None:
+                        details[device_id] = batch_details[device_id]
+
+            with _device_id_cache_lock:
+                for hostname, device_id in resolved.items():
+                    _device_id_cache[hostname] = (device_id, now)
+            for hostname, device_id in resolved.items():
+                for original in missing[hostname]:
+                    results[original] = device_id
+
+        if details is not None:
+            cached_ids = [device_id for device_id in dict.fromkeys(results.values()) if device_id not in details]
+            details.update(self.get_devices_details(cached_ids))
+        return results
 
-            if response.get("status_code") == 200:
-                device_ids = response["body"].get("resources", [])
-                if device_ids:
-                    details = self.hosts_client.get_device_details(ids=device_ids)
-                    if details.get("status_code") == 200:
-                        for device in details["body"].get("resources", []):
-                            hostname = device.get("hostname")
-                            device_id = device.get("device_id")
-                            if hostname and device_id:
-                                results[hostname] = device_id
+    def get_devices_details(self, device_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Details for many devices, DEVICE_DETAILS_BATCH_SIZE ids per request.
 
-        return results
+        Returns:
+            Dict of device id -> device details; ids that couldn't be fetched are left out
+        """
+        details: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(device_ids), DEVICE_DETAILS_BATCH_SIZE):
+            batch = device_ids[i:i + DEVICE_DETAILS_BATCH_SIZE]
+            response = self.hosts_client.get_device_details_v2(ids=batch)
+            if response.get("status_code") != 200:
+                logger.warning(f"Device details lookup failed for {len(batch)} ids: HTTP {response.get('status_code')}")
+                continue
+            for device in response["body"].get("resources", []):
+                if device.get("device_id"):
+                    details[device["device_id"]] = device
+        return details
+
+    def _get_states_by_id(self, device_ids: List[str]) -> Dict[str, str]:
+        """Online state per device id, ONLINE_STATE_BATCH_SIZE devices per request."""
+        unique_ids = list(dict.fromkeys(device_ids))
+        state_by_id: Dict[str, str] = {}
+        for i in range(0, len(unique_ids), ONLINE_STATE_BATCH_SIZE):
+            batch = unique_ids[i:i + ONLINE_STATE_BATCH_SIZE]
+            response = self.hosts_client.get_online_state(ids=batch)
+            if response.get("status_code") != 200:
+                logger.warning(f"Online state lookup failed for {len(batch)} devices: HTTP {response.get('status_code')}")
+                continue
+            for resource in response["body"].get("resources", []):
+                state_by_id[resource.get("id")] = resource.get("state")
+        return state_by_id
+
+    def get_online_states(self, hostnames: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Online state for many hostnames: batched id resolution, then up to
+        ONLINE_STATE_BATCH_SIZE devices per state request.
+
+        A host whose cached device id doesn't come back online is resolved again (in
+        one batch), since a reimaged host gets a new device id while its old record
+        keeps reporting offline.
+
+        Returns:
+            Dict of hostname -> state ('online', 'offline', 'unknown'), or None
+            if the host isn't in CrowdStrike or its state couldn't be fetched
+        """
+        started = time.time()
+        device_ids = self.resolve_device_ids(hostnames)
+        with _device_id_cache_lock:
+            from_cache = [hostname for hostname in device_ids
+                          if _device_id_cache.get(hostname.lower(), (None, started))[1] < started]
+        states: Dict[str, Optional[str]] = {hostname: None for hostname in hostnames}
+        state_by_id = self._get_states_by_id(list(device_ids.values()))
+
+        recheck = [hostname for hostname in from_cache if state_by_id.get(device_ids[hostname]) != "online"]
+        if recheck:
+            with _device_id_cache_lock:
+                for hostname in recheck:
+                    _device_id_cache.pop(hostname.lower(), None)
+            refreshed = self.resolve_device_ids(recheck)
+            for hostname in recheck:
+                if hostname not in refreshed:
+                    del device_ids[hostname]
+            changed = [device_id for hostname, device_id in refreshed.items() if device_id != device_ids[hostname]]
+            device_ids.update(refreshed)
+            state_by_id.update(self._get_states_by_id(changed))
+
+        stale = []
+        for hostname, device_id in device_ids.items():
+            states[hostname] = state_by_id.get(device_id)
+            if states[hostname] is None:
+                stale.append(hostname.lower())
+        if stale:
+            # The device may have been removed or reinstalled; resolve it again next time
+            with _device_id_cache_lock:
+                for hostname in stale:
+                    _device_id_cache.pop(hostname, None)
+        return states
 
     def get_device_id(self, hostname: str) -> Optional[str]:
         """Retrieve the device ID for a given hostname"""
@@ -321,16 +450,36 @@ class CrowdStrikeClient:
         )
 
     def get_device_online_state(self, hostname: str) -> Optional[str]:
-        """Get the online state for a single hostname."""
+        """Get the online state for a single hostname.
+
+        Uses the shared device id cache: a cached host that is online costs one state
+        request; anything else costs an id lookup plus a state request, as before the
+        cache. For many hosts use get_online_states() instead.
+        """
+        key = hostname.lower()
+        with _device_id_cache_lock:
+            cached = _device_id_cache.get(key)
+        cached_id = cached[0] if cached and time.time() - cached[1] < DEVICE_ID_CACHE_TTL_SECONDS else None
+
+        state = self._get_states_by_id([cached_id]).get(cached_id) if cached_id else None
+        if state == "online":
+            return state
+
+        # Not cached, or the cached device isn't online: a reimaged host has a new device id
+        # while its old record keeps reporting offline, so resolve the most recently seen one
         device_id = self.get_device_id(hostname)
         if not device_id:
+            with _device_id_cache_lock:
+                _device_id_cache.pop(key, None)
             return None
-        response = self.hosts_client.get_online_state(ids=[device_id])
-        if response.get("status_code") == 200:
-            resources = response['body'].get('resources', [])
-            if resources:
-                return resources[0].get('state')
-        return None
+        if device_id != cached_id:
+            state = self._get_states_by_id([device_id]).get(device_id)
+        with _device_id_cache_lock:
+            if state is None:
+                _device_id_cache.pop(key, None)
+            else:
+                _device_id_cache[key] = (device_id, time.time())
+        return state
 
     def get_detections(
         self,
@@ -27,6 +27,7 @@ logger = logging.getLogger(__name__)
 config = get_config()
 TOKEN_FILE = Path(__file__).parent.parent / "data/transient/service_now_access_token.json"
 DATA_DIR = Path(__file__).parent.parent / "data/transient/epp_device_tagging"
+HOSTS_DETAILS_MAX_WORKERS = 30  # Concurrent CMDB lookups in get_hosts_details(); the rate limit is the real bound
 
 
 class ServiceNowTokenManager:
@@ -232,6 +233,40 @@ class ServiceNowClient:
 
         return {"name": hostname, "status": "Not Found"}
 
+    def get_hosts_details(self, hostnames, max_workers=HOSTS_DETAILS_MAX_WORKERS):
+        """Get host details for many hostnames over this client's pooled session.
+
+        The CMDB endpoints only take one name per request, so lookups run concurrently
+        (bounded by the client's rate limit) and each short name is looked up once,
+        however many times it appears.
+
+        Returns:
+            dict of hostname (as given) -> host details, same shape as get_host_details()
+        """
+        def short_name_of(hostname):
+            return hostname.split('.')[0].lower() if hostname and isinstance(hostname, str) else hostname
+
+        by_short_name = {}
+        for hostname in hostnames:
+            by_short_name.setdefault(short_name_of(hostname), hostname)
+
+        details_by_short_name = {}
+        start_time = time.time()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.get_host_details, hostname): short_name for short_name, hostname in by_short_name.items()}
+            for idx, future in enumerate(tqdm(concurrent.futures.as_completed(futures), total=len(futures), desc="Looking up hosts in ServiceNow", disable=not sys.stdout.isatty()), 1):
+                short_name = futures[future]
+                try:
+                    details_by_short_name[short_name] = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching details for {by_short_name[short_name]}: {e}")
+                    details_by_short_name[short_name] = {"name": by_short_name[short_name], "error": str(e), "status": "ServiceNow API Error", "category": ""}
+                if idx % 1000 == 0 or idx == len(futures):
+                    elapsed = time.time() - start_time
+                    logger.info(f"ServiceNow lookups: {idx}/{len(futures)} hosts ({idx / elapsed if elapsed > 0 else 0:.1f} hosts/s)")
+
+        return {hostname: details_by_short_name[short_name_of(hostname)] for hostname in hostnames}
+
     def _search_endpoint(self, endpoint, hostname, max_retries=3):
         """Search a specific endpoint for hostname with retry logic for rate limiting."""
         params = {'name': hostname}
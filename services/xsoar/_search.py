@@ -6,12 +6,15 @@ Handles ticket search and pagination for XSOAR incidents.
 import json
 import logging
 import os
+import re
 import socket
 import sys
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from http.client import RemoteDisconnected
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from demisto_client.demisto_api.models import SearchIncidentsData
@@ -26,6 +29,37 @@ log = logging.getLogger(__name__)
 # Default configuration
 DEFAULT_PAGE_SIZE = int(os.getenv('XSOAR_PAGE_SIZE', '2000'))
 
+# Concurrent (time-sliced) fetch configuration
+# Workers share one rate-limit gate, so a 429 on any slice pauses all of them
+PARALLEL_FETCH_WORKERS = int(os.getenv('XSOAR_PARALLEL_FETCH_WORKERS', '4'))
+PARALLEL_FETCH_SLICE_DAYS = int(os.getenv('XSOAR_PARALLEL_FETCH_SLICE_DAYS', '30'))
+
+# Matches created-range clauses such as created:>=2025-01-01T00:00:00Z or created:<"2025-01-01T00:00:00Z"
+_CREATED_BOUND_RE = re.compile(r'(?<![\w-])created:(>=|<=|>|<)"?(\d{4}-\d{2}-\d{2}T[0-9:.]+(?:Z|[+-]\d{2}:\d{2})?)"?')
+
+
+class RateLimitGate:
+    """Shared back-off point for concurrent fetch workers.
+
+    When any worker hits a 429, every worker waits until the back-off expires
+    instead of each one hammering the API independently.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def wait(self) -> None:
+        """Block until the current back-off (if any) has expired."""
+        delay = self._resume_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def backoff(self, seconds: float) -> None:
+        """Pause all workers for at least the given number of seconds."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.time() + seconds)
+
 
 def test_connectivity(client, base_url: str) -> None:
     """
@@ -71,7 +105,8 @@ def get_tickets(
     team_name: str,
     period: Optional[Dict[str, Any]] = None,
     size: int = 20000,
-    paginate: bool = True
+    paginate: bool = True,
+    parallel: bool = False
 ) -> List[Dict[str, Any]]:
     """
     Fetch security incidents from XSOAR using demisto-py SDK.
@@ -84,6 +119,8 @@ def get_tickets(
         period: Optional time period filter
         size: Maximum number of results (used when paginate=False)
         paginate: Whether to fetch all results with pagination
+        parallel: Split the query's created range into time slices and fetch them
+            concurrently (only applies when paginate=True)
 
     Returns:
         List of incident dictionaries
@@ -101,6 +138,8 @@ def get_tickets(
         log.error("This may indicate network issues, API outage, or authentication problems")
         raise
 
+    if paginate and parallel:
+        return _fetch_parallel(client, full_query, period)
     if paginate:
         return _fetch_paginated(client, full_query, period)
     return _fetch_unpaginated(client, full_query, period, size)
@@ -110,7 +149,10 @@ def _fetch_paginated(
     client,
     query: str,
     period: Optional[Dict[str, Any]],
-    page_size: int = None
+    page_size: int = None,
+    gate: Optional[RateLimitGate] = None,
+    stats: Optional[Dict[str, Any]] = None,
+    show_progress: bool = True
 ) -> List[Dict[str, Any]]:
     """
     Fetch tickets with pagination using demisto-py SDK.
@@ -120,6 +162,9 @@ def _fetch_paginated(
         query: XSOAR query string
         period: Optional time period filter
         page_size: Number of results per page (default from env var or 2000)
+        gate: Optional rate-limit gate shared with other concurrent fetches
+        stats: Optional dict that receives page and retry counts for this fetch
+        show_progress: Whether to show a progress bar when running interactively
 
     Returns:
         List of all fetched incident dictionaries
@@ -132,9 +177,11 @@ def _fetch_paginated(
     max_pages = 100
     server_error_retry_count = 0
     max_server_error_retries = 3
+    pages_fetched = 0
+    total_retries = 0
 
     # Create progress bar if running interactively
-    use_progress_bar = sys.stdout.isatty() or os.getenv('FORCE_PROGRESS_BAR', '').lower() == 'true'
+    use_progress_bar = show_progress and (sys.stdout.isatty() or os.getenv('FORCE_PROGRESS_BAR', '').lower() == 'true')
     pbar = tqdm(
         desc="Fetching tickets",
         unit=" tickets",
@@ -152,6 +199,9 @@ def _fetch_paginated(
 
     try:
         while page < max_pages:
+            if gate is not None:
+                gate.wait()
+
             filter_data: Dict[str, Any] = {
                 "query": query,
                 "page": page,
@@ -185,6 +235,7 @@ def _fetch_paginated(
 
                 # Reset error counter on success
                 server_error_retry_count = 0
+                pages_fetched += 1
 
                 # Extract data from response
                 raw_data = response.data if hasattr(response, 'data') else []
@@ -223,6 +274,7 @@ def _fetch_paginated(
             except (RemoteDisconnected, ProtocolError, ConnectionError, requests.exceptions.ConnectionError) as e:
                 # Handle connection errors with retry
                 server_error_retry_count += 1
+                total_retries += 1
                 if server_error_retry_count > max_server_error_retries:
                     log.error(f"Exceeded max connection error retries ({max_server_error_retries})")
                     break
@@ -238,6 +290,7 @@ def _fetch_paginated(
                 # Handle server errors (502, 503, 504) with retry
                 if e.status in [502, 503, 504]:
                     server_error_retry_count += 1
+                    total_retries += 1
                     if server_error_retry_count > max_server_error_retries:
                         log.error(f"Exceeded max server error retries ({max_server_error_retries}) for status {e.status}")
                         break
@@ -252,8 +305,12 @@ def _fetch_paginated(
                 # Handle rate limiting
                 elif e.status == 429:
                     backoff_time = 10  # Wait 10 seconds for rate limiting
+                    total_retries += 1
                     log.warning(f"Rate limit hit (429) on page {page}. Backing off for {backoff_time} seconds...")
-                    time.sleep(backoff_time)
+                    if gate is not None:
+                        gate.backoff(backoff_time)  # Pauses every worker; wait() happens at loop top
+                    else:
+                        time.sleep(backoff_time)
                     continue  # Retry same page
 
                 else:
@@ -278,6 +335,169 @@ def _fetch_paginated(
         log.debug(f"Returning {len(all_tickets)} tickets collected before error")
         return all_tickets  # Return what we have so far
 
+    finally:
+        if stats is not None:
+            stats.update({"pages": pages_fetched, "retries": total_retries, "tickets": len(all_tickets)})
+
+
+def _split_created_range(query: str) -> Tuple[Optional[Tuple[str, datetime]], Optional[Tuple[str, datetime]], str]:
+    """
+    Pull the created-range clauses out of a query.
+
+    Args:
+        query: XSOAR query string
+
+    Returns:
+        (lower bound, upper bound, query without created clauses). Bounds are
+        (operator, UTC datetime) tuples or None when the query doesn't have one.
+    """
+    lower = upper = None
+    for operator, value in _CREATED_BOUND_RE.findall(query):
+        bound_time = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if bound_time.tzinfo is None:
+            bound_time = bound_time.replace(tzinfo=timezone.utc)
+        bound = (operator, bound_time.astimezone(timezone.utc))
+        if operator.startswith('>'):
+            lower = bound
+        else:
+            upper = bound
+    remainder = ' '.join(_CREATED_BOUND_RE.sub('', query).split())
+    return lower, upper, remainder
+
+
+def _build_time_slices(
+    lower: Tuple[str, datetime],
+    upper: Optional[Tuple[str, datetime]],
+    slice_days: int
+) -> List[Tuple[str, str]]:
+    """
+    Partition a created range into non-overlapping query clauses.
+
+    The outer edges keep the original operators; interior edges use >= / < so
+    every incident falls into exactly one slice. Without an upper bound, the
+    newest slice is left open-ended so it also catches incidents created mid-fetch.
+
+    Returns:
+        List of (label, created clause) tuples, newest slice first
+    """
+    def fmt(dt: datetime) -> str:
+        return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    start = lower[1]
+    end = upper[1] if upper else datetime.now(timezone.utc)
+    edges = [start]
+    while edges[-1] + timedelta(days=slice_days) < end:
+        edges.append(edges[-1] + timedelta(days=slice_days))
+    edges.append(end)
+
+    slices = []
+    for i in range(len(edges) - 1):
+        low_op = lower[0] if i == 0 else '>='
+        clause = f"created:{low_op}{fmt(edges[i])}"
+        if i < len(edges) - 2:
+            clause += f" created:<{fmt(edges[i + 1])}"
+        elif upper:
+            clause += f" created:{upper[0]}{fmt(edges[i + 1])}"
+        slices.append((f"{edges[i]:%Y-%m-%d}..{edges[i + 1]:%Y-%m-%d}", clause))
+    return list(reversed(slices))
+
+
+def _fetch_slice(
+    client,
+    query: str,
+    label: str,
+    period: Optional[Dict[str, Any]],
+    page_size: Optional[int],
+    gate: RateLimitGate
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Fetch one time slice sequentially and return its tickets plus a timing report."""
+    report: Dict[str, Any] = {"slice": label}
+    start = time.time()
+    tickets = _fetch_paginated(client, query, period, page_size, gate=gate, stats=report, show_progress=False)
+    report["seconds"] = time.time() - start
+    return tickets, report
+
+
+def _fetch_parallel(
+    client,
+    query: str,
+    period: Optional[Dict[str, Any]],
+    page_size: int = None,
+    workers: int = None,
+    slice_days: int = None,
+    report: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch tickets concurrently by splitting the query's created range into time slices.
+
+    Each slice is paginated independently on a bounded worker pool. All workers share
+    a RateLimitGate so a 429 backs everyone off. Results are deduped by id and returned
+    newest first, matching _fetch_paginated's created-descending order. Queries without
+    a created lower bound fall back to sequential pagination.
+
+    Args:
+        client: XSOAR demisto-py client
+        query: XSOAR query string (must contain created:> or created:>= to be sliced)
+        period: Optional time period filter
+        page_size: Number of results per page (default from env var or 2000)
+        workers: Max concurrent slices (default XSOAR_PARALLEL_FETCH_WORKERS)
+        slice_days: Width of each time slice in days (default XSOAR_PARALLEL_FETCH_SLICE_DAYS)
+        report: Optional list that receives per-slice timing/retry dicts
+
+    Returns:
+        List of all fetched incident dictionaries
+    """
+    workers = workers or PARALLEL_FETCH_WORKERS
+    slice_days = slice_days or PARALLEL_FETCH_SLICE_DAYS
+
+    lower, upper, base_query = _split_created_range(query)
+    if lower is None:
+        log.debug("No created lower bound in query - falling back to sequential pagination")
+        return _fetch_paginated(client, query, period, page_size)
+
+    slices = _build_time_slices(lower, upper, slice_days)
+    if len(slices) == 1:
+        return _fetch_paginated(client, query, period, page_size)
+
+    log.debug(f"Parallel fetch: {len(slices)} slices of {slice_days}d across {workers} workers")
+    gate = RateLimitGate()
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    slice_reports: List[Dict[str, Any]] = []
+    fetch_start = time.time()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_fetch_slice, client, f"{base_query} {clause}", label, period, page_size, gate): label
+            for label, clause in slices
+        }
+        for future in as_completed(futures):
+            tickets, slice_report = future.result()
+            results[futures[future]] = tickets
+            slice_reports.append(slice_report)
+
+    # Reassemble newest slice first and dedupe by id (slices shouldn't overlap, but be safe)
+    all_tickets = []
+    seen_ids = set()
+    for label, _ in slices:
+        for ticket in results[label]:
+            ticket_id = ticket.get('id')
+            if ticket_id in seen_ids:
+                continue
+            seen_ids.add(ticket_id)
+            all_tickets.append(ticket)
+
+    elapsed = time.time() - fetch_start
+    slice_time = sum(r["seconds"] for r in slice_reports)
+    log.info(f"Parallel fetch complete: {len(all_tickets)} tickets from {len(slices)} slices in {elapsed:.2f}s "
+             f"(sum of slice times {slice_time:.2f}s, retries {sum(r['retries'] for r in slice_reports)})")
+    for slice_report in sorted(slice_reports, key=lambda r: r["slice"]):
+        log.info(f"  slice {slice_report['slice']}: {slice_report['tickets']} tickets, "
+                 f"{slice_report['pages']} pages, {slice_report['retries']} retries, {slice_report['seconds']:.2f}s")
+
+    if report is not None:
+        report.extend(slice_reports)
+    return all_tickets
+
 
 def _fetch_unpaginated(
     client,
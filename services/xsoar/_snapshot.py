@@ -0,0 +1,282 @@
+"""
+XSOAR Shared Ticket Snapshot
+
+Fetches a superset of tickets once (e.g. 12 months of team tickets) and answers
+later get_tickets() queries locally, so a batch of chart jobs that all ask for
+overlapping slices of the same incidents costs one XSOAR fetch instead of many.
+
+A snapshot is only used by TicketHandlers it is passed to explicitly
+(TicketHandler(env, snapshot=...)); nothing else in the process sees it.
+
+Only a small subset of the XSOAR query language is evaluated locally:
+- field:value / field:"phrase" / -field:"" on top-level and custom fields
+- status:closed (and the other status names)
+- created/closed/modified range clauses (>=, <=, >, <)
+- parenthesised groups of alternatives joined with "or"
+
+Queries must also stay inside the superset: every ticket they can match has to
+have a team type (a type clause containing the team name). Anything else
+(unknown syntax, period filters, ranges outside the snapshot, unparsable dates,
+queries without a team type clause, a snapshot older than SNAPSHOT_TTL_MINUTES)
+is reported as unanswerable and the caller falls back to the API.
+"""
+import copy
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+log = logging.getLogger(__name__)
+
+# Tickets created or changed after the load aren't in the snapshot, so it stops answering
+# once it is this old (covers the nightly chart groups, 00:02 through 00:17 plus their runtime)
+SNAPSHOT_TTL_MINUTES = 30
+
+STATUS_VALUES = {'pending': 0, 'active': 1, 'closed': 2, 'done': 2, 'archived': 3, 'archive': 3}
+DATE_FIELDS = {'created', 'closed', 'modified', 'occurred'}
+
+_TOKEN_RE = re.compile(r'\(|\)|-?[\w.]+:(?:>=|<=|>|<)?(?:"[^"]*"|[^\s()]*)|\S+')
+_TERM_RE = re.compile(r'^(-?)([\w.]+):(>=|<=|>|<)?(?:"([^"]*)"|([^\s()]*))$')
+_WORD_RE = re.compile(r'\w+')
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+class UnsupportedQuery(Exception):
+    """Raised when a query uses syntax the local evaluator can't answer faithfully."""
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse an XSOAR timestamp (ISO string, possibly with nanoseconds) to aware UTC."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _words(value: Any) -> List[str]:
+    return _WORD_RE.findall(str(value).lower()) if value is not None else []
+
+
+def _field_value(ticket: Dict[str, Any], field: str) -> Any:
+    """Look up a field the way XSOAR does: system fields first, then CustomFields."""
+    if field in ticket:
+        return ticket[field]
+    return (ticket.get('CustomFields') or {}).get(field)
+
+
+def _compile_term(term: str) -> Predicate:
+    """Compile a single field clause into a predicate."""
+    match = _TERM_RE.match(term)
+    if not match:
+        raise UnsupportedQuery(term)
+    negate, field, op, quoted, bare = match.groups()
+    value = quoted if quoted is not None else bare
+
+    if op:
+        if field not in DATE_FIELDS:
+            raise UnsupportedQuery(term)
+        try:
+            bound = _parse_datetime(value)
+        except ValueError:
+            raise UnsupportedQuery(term)
+        if bound is None:
+            raise UnsupportedQuery(term)
+        compare = {
+            '>=': lambda dt: dt >= bound,
+            '<=': lambda dt: dt <= bound,
+            '>': lambda dt: dt > bound,
+            '<': lambda dt: dt < bound,
+        }[op]
+
+        def predicate(ticket: Dict[str, Any]) -> bool:
+            dt = _parse_datetime(ticket.get(field))
+            return dt is not None and compare(dt)
+
+    elif field == 'status':
+        status = STATUS_VALUES.get(value.lower()) if not value.isdigit() else int(value)
+        if status is None:
+            raise UnsupportedQuery(term)
+
+        def predicate(ticket: Dict[str, Any]) -> bool:
+            return int(ticket.get('status') or 0) == status
+
+    elif field in DATE_FIELDS:
+        raise UnsupportedQuery(term)
+
+    elif quoted == '':
+        def predicate(ticket: Dict[str, Any]) -> bool:
+            field_value = _field_value(ticket, field)
+            return field_value is None or str(field_value).strip() == ''
+
+    else:
+        # Analyzed text match: bare values match a word, quoted values match a phrase
+        needle = _words(value)
+        if not needle:
+            raise UnsupportedQuery(term)
+
+        def predicate(ticket: Dict[str, Any]) -> bool:
+            haystack = _words(_field_value(ticket, field))
+            width = len(needle)
+            return any(haystack[i:i + width] == needle for i in range(len(haystack) - width + 1))
+
+    if negate:
+        return lambda ticket, p=predicate: not p(ticket)
+    return predicate
+
+
+def compile_query(query: str) -> List[Predicate]:
+    """
+    Compile a query into a list of predicates that must all hold.
+
+    Raises:
+        UnsupportedQuery: If the query uses syntax outside the supported subset
+    """
+    tokens = _TOKEN_RE.findall(query)
+    predicates: List[Predicate] = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token.lower() == 'and':
+            i += 1
+            continue
+        if token == '(':
+            alternatives: List[Predicate] = []
+            i += 1
+            while i < len(tokens) and tokens[i] != ')':
+                if tokens[i].lower() != 'or':
+                    alternatives.append(_compile_term(tokens[i]))
+                i += 1
+            if i == len(tokens) or not alternatives:
+                raise UnsupportedQuery(query)
+            predicates.append(lambda ticket, alts=alternatives: any(p(ticket) for p in alts))
+        elif token in (')',) or token.lower() == 'or':
+            raise UnsupportedQuery(query)
+        else:
+            predicates.append(_compile_term(token))
+        i += 1
+    return predicates
+
+
+def _created_lower_bound(query: str) -> Optional[datetime]:
+    """Return the query's created:> / created:>= bound, or None if it has none or it can't be parsed."""
+    bounds = re.findall(r'(?<![\w-])created:>=?"?([^\s")]+)"?', query)
+    try:
+        return max((_parse_datetime(b) for b in bounds), default=None) if bounds else None
+    except ValueError:
+        return None
+
+
+def _is_team_type_term(term: str, team_words: List[str]) -> bool:
+    """True for a positive type clause whose value contains the team name (e.g. type:"ACME Qradar Alert")."""
+    match = _TERM_RE.match(term)
+    if not match:
+        return False
+    negate, field, op, quoted, bare = match.groups()
+    if negate or op or field != 'type':
+        return False
+    words = _words(quoted if quoted is not None else bare)
+    width = len(team_words)
+    return any(words[i:i + width] == team_words for i in range(len(words) - width + 1))
+
+
+def _within_team_types(query: str, team_words: List[str]) -> bool:
+    """
+    True if the query only matches team-type tickets: it has a top-level team type
+    clause, or a parenthesised group whose alternatives are all team type clauses.
+    """
+    tokens = _TOKEN_RE.findall(query)
+    i = 0
+    while i < len(tokens):
+        if tokens[i] == '(':
+            group = []
+            i += 1
+            while i < len(tokens) and tokens[i] != ')':
+                if tokens[i].lower() != 'or':
+                    group.append(tokens[i])
+                i += 1
+            if group and all(_is_team_type_term(term, team_words) for term in group):
+                return True
+        elif _is_team_type_term(tokens[i], team_words):
+            return True
+        i += 1
+    return False
+
+
+class TicketSnapshot:
+    """In-memory superset of tickets that can answer narrower queries locally."""
+
+    def __init__(self, tickets: List[Dict[str, Any]], created_from: datetime, superset_query: str, team_name: str):
+        self.tickets = sorted(
+            tickets,
+            key=lambda t: _parse_datetime(t.get('created')) or datetime.min.replace(tzinfo=timezone.utc),
+            reverse=True
+        )
+        self.created_from = created_from
+        self.superset_query = superset_query
+        self.team_words = _words(team_name)
+        self.loaded_at = time.time()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def expired(self) -> bool:
+        return time.time() - self.loaded_at > SNAPSHOT_TTL_MINUTES * 60
+
+    def answer(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer a query from the snapshot.
+
+        Returns:
+            Matching tickets (copies, newest first) or None if the query can't be
+            answered faithfully and must go to the API
+        """
+        if self.expired:
+            self.misses += 1
+            log.debug(f"Snapshot miss (older than {SNAPSHOT_TTL_MINUTES} minutes): {query[:120]}")
+            return None
+        if not _within_team_types(query, self.team_words):
+            self.misses += 1
+            log.debug(f"Snapshot miss (not limited to {' '.join(self.team_words)} ticket types): {query[:120]}")
+            return None
+        lower_bound = _created_lower_bound(query)
+        if lower_bound is None or lower_bound < self.created_from:
+            self.misses += 1
+            log.debug(f"Snapshot miss (created range not covered): {query[:120]}")
+            return None
+        try:
+            predicates = compile_query(query)
+        except UnsupportedQuery as e:
+            self.misses += 1
+            log.debug(f"Snapshot miss (unsupported clause {e}): {query[:120]}")
+            return None
+
+        matches = [copy.deepcopy(t) for t in self.tickets if all(p(t) for p in predicates)]
+        self.hits += 1
+        log.info(f"Answered query from shared ticket snapshot: {len(matches)} tickets ({query[:120]})")
+        return matches
+
+
+def load_snapshot(ticket_handler, team_name: str, days_back: int = 366) -> TicketSnapshot:
+    """
+    Fetch the superset once.
+
+    Args:
+        ticket_handler: PROD TicketHandler used for the superset fetch
+        team_name: Team ticket type prefix
+        days_back: Created-date lookback of the superset (366 covers the 12-month charts)
+
+    Returns:
+        The snapshot; pass it to TicketHandler(..., snapshot=...) to query it
+    """
+    created_from = (datetime.now(timezone.utc) - timedelta(days=days_back)).replace(hour=0, minute=0, second=0, microsecond=0)
+    superset_query = f"type:{team_name} created:>={created_from.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+
+    start = time.time()
+    tickets = ticket_handler.get_tickets(superset_query, paginate=True, parallel=True)
+    snapshot = TicketSnapshot(tickets, created_from, superset_query, team_name)
+    log.info(f"Loaded shared ticket snapshot: {len(tickets)} tickets since {created_from:%Y-%m-%d} in {time.time() - start:.2f}s")
+    return snapshot
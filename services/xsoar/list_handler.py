@@ -6,12 +6,27 @@ Handles all XSOAR list operations including:
 - Getting list data and version by name
 - Saving lists (JSON and text formats)
 - Adding items to lists
+
+Lists are cached per environment (shared by every ListHandler in the process)
+as (version, parsed data). A read within LIST_CACHE_TTL_SECONDS costs no
+request; an older or missing entry is refreshed by downloading just that list.
+Versions come from the /lists dump, which also refreshes every cached list at
+once. Saving a list invalidates its entry.
+
+Cached reads may be up to LIST_CACHE_TTL_SECONDS old, so they must not feed a
+save. Read-modify-write callers use read_for_update(), which returns the data
+and version from one fresh /lists response, and pass that version to save() /
+save_as_text(). XSOAR then rejects the save if the list changed in between.
+add_item_to_list re-reads and re-applies the change once when that happens.
 """
+import copy
 import inspect
 import json
 import logging
+import threading
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
 
 from src.utils.xsoar_enums import XsoarEnvironment
 from ._client import ApiException, get_prod_client, get_dev_client
@@ -19,6 +34,21 @@ from ._utils import _parse_generic_response
 
 log = logging.getLogger(__name__)
 
+LIST_CACHE_TTL_SECONDS = 60  # Reads within this window are served without a request
+
+# environment -> list name -> {'version', 'data', 'fetched_at'}; version is None when
+# the entry came from a single-list download (which doesn't report it)
+_list_cache: Dict[XsoarEnvironment, Dict[str, Dict[str, Any]]] = {}
+_list_cache_lock = threading.Lock()
+
+
+def _parse_list_data(data: Any) -> Any:
+    """JSON lists come back parsed; text lists (and anything else) as they are."""
+    try:
+        return json.loads(data)
+    except (TypeError, json.JSONDecodeError):
+        return data
+
 
 class ListHandler:
     """Handler for XSOAR list operations."""
@@ -36,6 +66,9 @@ class ListHandler:
             self.client = get_dev_client()
         else:
             raise ValueError(f"Invalid environment: {environment}. Must be XsoarEnvironment.PROD or XsoarEnvironment.DEV")
+        self.environment = environment
+        with _list_cache_lock:
+            self._cache = _list_cache.setdefault(environment, {})
 
     def get_all_lists(self) -> List[Dict[str, Any]]:
         """
@@ -64,7 +97,10 @@ class ListHandler:
 
             result = _parse_generic_response(response)
             # Result should be a list, but if it's a dict, return empty list
-            return result if isinstance(result, list) else []
+            if not isinstance(result, list):
+                return []
+            self._remember_all(result)
+            return result
         except ApiException as e:
             elapsed = time.time() - start_time
             log.error(f"Error in get_all_lists after {elapsed:.2f}s (called by {caller_file}:{caller_function}): {e}")
@@ -74,98 +110,200 @@ class ListHandler:
             log.error(f"Unexpected error in get_all_lists after {elapsed:.2f}s (called by {caller_file}:{caller_function}): {e}")
             return []
 
+    def _remember_all(self, all_lists: List[Dict[str, Any]]):
+        """Refresh the cache from a /lists dump, re-parsing only lists whose version changed."""
+        now = time.time()
+        with _list_cache_lock:
+            for item in all_lists:
+                list_name = item.get('id')
+                if list_name is None:
+                    continue
+                entry = self._cache.get(list_name)
+                if entry is not None and entry['version'] is not None and entry['version'] == item.get('version'):
+                    entry['fetched_at'] = now
+                    continue
+                self._cache[list_name] = {
+                    'version': item.get('version'),
+                    'data': _parse_list_data(item.get('data')),
+                    'fetched_at': now,
+                }
+
+    def _cached_entry(self, list_name: str) -> Optional[Dict[str, Any]]:
+        with _list_cache_lock:
+            entry = self._cache.get(list_name)
+        if entry is not None and time.time() - entry['fetched_at'] < LIST_CACHE_TTL_SECONDS:
+            return entry
+        return None
+
+    def _download_list(self, list_name: str) -> Optional[Dict[str, Any]]:
+        """Fetch one list's data (no version) and cache it; None if it doesn't exist or the call fails."""
+        try:
+            response = self.client.generic_request(
+                path=f'/lists/download/{quote(list_name, safe="")}',
+                method='GET'
+            )
+        except ApiException as e:
+            if e.status != 404:
+                log.warning(f"Downloading list '{list_name}' failed, falling back to /lists: {e}")
+            return None
+        if not response or response[0] is None:
+            return None
+
+        data = _parse_list_data(response[0])
+        now = time.time()
+        with _list_cache_lock:
+            entry = self._cache.get(list_name)
+            if entry is not None and entry['data'] == data:
+                # Unchanged, so the version we knew is still current
+                entry['fetched_at'] = now
+            else:
+                entry = {'version': None, 'data': data, 'fetched_at': now}
+                self._cache[list_name] = entry
+        return entry
+
+    def invalidate(self, list_name: str = None):
+        """Drop one cached list (or all of this environment's) so the next read refetches it."""
+        with _list_cache_lock:
+            if list_name is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(list_name, None)
+
     def get_list_data_by_name(self, list_name):
         """Get list data by name"""
-        all_lists = self.get_all_lists()
-        list_item = next((item for item in all_lists if item['id'] == list_name), None)
-        if list_item is None:
+        entry = self._cached_entry(list_name) or self._download_list(list_name)
+        if entry is None:
+            self.get_all_lists()
+            entry = self._cached_entry(list_name)
+        if entry is None:
             log.warning(f"List '{list_name}' not found")
             return None
-        try:
-            return json.loads(list_item['data'])
-        except (TypeError, json.JSONDecodeError):
-            return list_item['data']
+        # Callers modify what they get back (e.g. append and save), so never hand out the cached object
+        return copy.deepcopy(entry['data'])
 
     def get_list_version_by_name(self, list_name):
         """Get list version by name"""
-        all_lists = self.get_all_lists()
-        list_item = next((item for item in all_lists if item['id'] == list_name), None)
-        if list_item is None:
+        entry = self._cached_entry(list_name)
+        if entry is None or entry['version'] is None:
+            self.get_all_lists()
+            entry = self._cached_entry(list_name)
+        if entry is None:
             log.warning(f"List '{list_name}' not found")
             return None
-        return list_item['version']
+        return entry['version']
+
+    def read_for_update(self, list_name: str) -> Optional[Tuple[Any, Any]]:
+        """
+        Read a list to modify and save it back.
+
+        Bypasses the cache: data and version come from the same fresh /lists response,
+        so passing the version to save() / save_as_text() makes XSOAR reject the save
+        if someone else changed the list in the meantime.
 
-    def save(self, list_name: str, list_data: Any) -> Dict[str, Any]:
+        Returns:
+            (version, parsed data), or None if the list doesn't exist
+        """
+        for item in self.get_all_lists():
+            if item.get('id') == list_name:
+                return item.get('version'), _parse_list_data(item.get('data'))
+        return None
+
+    def _save_payload(self, list_name: str, payload: Dict[str, Any], version: Any) -> Dict[str, Any]:
+        """POST /lists/save with the given version (XSOAR rejects it if the list changed since)."""
+        payload['version'] = version
+        try:
+            response = self.client.generic_request(
+                path='/lists/save',
+                method='POST',
+                body=payload
+            )
+            return _parse_generic_response(response)
+        finally:
+            self.invalidate(list_name)
+
+    @staticmethod
+    def _json_payload(list_name: str, list_data: Any) -> Dict[str, Any]:
+        return {
+            "data": json.dumps(list_data, indent=4),
+            "name": list_name,
+            "type": "json",
+            "id": list_name,
+        }
+
+    def save(self, list_name: str, list_data: Any, version: Any) -> Dict[str, Any]:
         """
         Save list data to XSOAR.
 
         Args:
             list_name: Name of the list
             list_data: Data to save (will be JSON serialized)
+            version: Version the data was read at (from read_for_update)
 
         Returns:
             Response data from save operation
 
         Raises:
-            ApiException: If save operation fails
+            ApiException: If save operation fails, e.g. because the list changed since it was read
         """
-        list_version = self.get_list_version_by_name(list_name)
-
-        payload = {
-            "data": json.dumps(list_data, indent=4),
-            "name": list_name,
-            "type": "json",
-            "id": list_name,
-            "version": list_version
-        }
+        payload = self._json_payload(list_name, list_data)
 
         try:
-            response = self.client.generic_request(
-                path='/lists/save',
-                method='POST',
-                body=payload
-            )
-            return _parse_generic_response(response)
+            return self._save_payload(list_name, payload, version)
         except ApiException as e:
             log.error(f"Error saving list: {e}")
             raise
 
-    def save_as_text(self, list_name: str, list_data: List[str]) -> Dict[str, Any]:
+    def save_as_text(self, list_name: str, list_data: List[str], version: Any) -> Dict[str, Any]:
         """
         Save list data as plain text (comma-separated string).
 
         Args:
             list_name: Name of the list
             list_data: List of strings to save
+            version: Version the data was read at (from read_for_update)
 
         Returns:
             Response data from save operation
 
         Raises:
-            ApiException: If save operation fails
+            ApiException: If save operation fails, e.g. because the list changed since it was read
         """
-        list_version = self.get_list_version_by_name(list_name)
         payload = {
             "data": ','.join(list_data),
             "name": list_name,
             "type": "text",
             "id": list_name,
-            "version": list_version
         }
 
         try:
-            response = self.client.generic_request(
-                path='/lists/save',
-                method='POST',
-                body=payload
-            )
-            return _parse_generic_response(response)
+            return self._save_payload(list_name, payload, version)
         except ApiException as e:
             log.error(f"Error saving list as text: {e}")
             raise
 
     def add_item_to_list(self, list_name, new_entry):
-        """Add item to existing list"""
-        list_data = self.get_list_data_by_name(list_name)
-        list_data.append(new_entry)
-        self.save(list_name, list_data)
+        """
+        Add item to existing list.
+
+        The list is read fresh (data and version from the same response), never from the
+        cache. If the save is rejected because the list changed in the meantime, it is
+        re-read and the item appended again, once.
+
+        Raises:
+            ValueError: If the list doesn't exist
+            ApiException: If the save fails again after re-reading
+        """
+        for attempt in range(2):
+            fresh = self.read_for_update(list_name)
+            if fresh is None:
+                raise ValueError(f"List '{list_name}' not found")
+            version, list_data = fresh
+            list_data.append(new_entry)
+            try:
+                self._save_payload(list_name, self._json_payload(list_name, list_data), version)
+                return
+            except ApiException as e:
+                if attempt == 1:
+                    log.error(f"Error saving list: {e}")
+                    raise
+                log.info(f"Saving list '{list_name}' was rejected, re-reading it and adding the item again")
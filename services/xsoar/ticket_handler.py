@@ -31,6 +31,7 @@ from . import _entries
 from . import _files
 from . import _tasks
 from . import _participants
+from . import _snapshot
 
 log = logging.getLogger(__name__)
 CONFIG = get_config()
@@ -43,13 +44,18 @@ class TicketHandler:
     DEFAULT_PAGE_SIZE = int(os.getenv('XSOAR_PAGE_SIZE', '2000'))
     READ_TIMEOUT = int(os.getenv('XSOAR_READ_TIMEOUT', '30'))
 
-    def __init__(self, environment: XsoarEnvironment = XsoarEnvironment.PROD):
+    def __init__(self, environment: XsoarEnvironment = XsoarEnvironment.PROD,
+                 snapshot: Optional['_snapshot.TicketSnapshot'] = None):
         """
         Initialize TicketHandler with XSOAR environment.
 
         Args:
             environment: XsoarEnvironment enum (PROD or DEV), defaults to PROD
+            snapshot: Optional shared ticket snapshot (see load_snapshot) that
+                PROD get_tickets() queries are answered from where possible
         """
+        self.environment = environment
+        self.snapshot = snapshot if environment == XsoarEnvironment.PROD else None
         if environment == XsoarEnvironment.PROD:
             self.client = get_prod_client()
             self.base_url = CONFIG.xsoar_prod_api_base_url
@@ -66,7 +72,8 @@ class TicketHandler:
     # --- Search Operations (delegated to _search module) ---
 
     def get_tickets(self, query: str, period: Optional[Dict[str, Any]] = None,
-                    size: int = 20000, paginate: bool = True) -> List[Dict[str, Any]]:
+                    size: int = 20000, paginate: bool = True,
+                    parallel: bool = False) -> List[Dict[str, Any]]:
         """
         Fetch security incidents from XSOAR using demisto-py SDK.
 
@@ -75,15 +82,32 @@ class TicketHandler:
             period: Optional time period filter
             size: Maximum number of results (used when paginate=False)
             paginate: Whether to fetch all results with pagination
+            parallel: Fetch the query's created range as concurrent time slices
+                (for long ranges; see XSOAR_PARALLEL_FETCH_* env vars)
 
         Returns:
             List of incident dictionaries
+
+        Note:
+            If this handler was given a snapshot, queries it can answer are
+            served locally without an API call.
         """
+        if self.snapshot is not None and period is None:
+            tickets = self.snapshot.answer(query)
+            if tickets is not None:
+                return tickets if paginate else tickets[:size]
+
         return _search.get_tickets(
             self.client, self.base_url, query, CONFIG.team_name,
-            period=period, size=size, paginate=paginate
+            period=period, size=size, paginate=paginate, parallel=parallel
         )
 
+    # --- Shared Snapshot Operations (delegated to _snapshot module) ---
+
+    def load_snapshot(self, days_back: int = 366) -> '_snapshot.TicketSnapshot':
+        """Fetch team tickets created in the last days_back days once, for handlers created with snapshot=..."""
+        return _snapshot.load_snapshot(self, CONFIG.team_name, days_back)
+
     # --- Entry Operations (delegated to _entries module) ---
 
     def get_entries(self, incident_id: str) -> List[Dict[str, Any]]:
@@ -20,6 +20,8 @@ logging.getLogger("urllib3.connectionpool").setLevel(logging.WARNING)
 warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
+import functools
+import inspect
 import time
 import traceback
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
@@ -31,6 +33,7 @@ import schedule
 import secops
 from my_config import get_config
 from src.components.ticket_cache import TicketCache
+from services.xsoar import TicketHandler, XsoarEnvironment
 from src import helper_methods, verify_host_online_status
 from src.charts import (
     mttr_mttc, outflow, lifespan, heatmap, sla_breaches, aging_tickets,
@@ -39,8 +42,7 @@ from src.charts import (
     crowdstrike_efficacy
 )
 from src.components import (
-    oncall, approved_security_testing, thithi, response_sla_risk_tickets,
-    containment_sla_risk_tickets, incident_declaration_sla_risk, abandoned_tickets,
+    oncall, approved_security_testing, thithi, sla_monitor, abandoned_tickets,
     orphaned_tickets, birthdays_anniversaries, major_incident_monitor,
     stale_containment_cleanup
 )
@@ -56,7 +58,7 @@ from src import peer_ping_keepalive
 setup_logging(
     bot_name='all_jobs',
     log_level=logging.INFO,  # Default level for most modules
-    info_modules=['__main__', 'src.components.response_sla_risk_tickets', 'services.xsoar'],
+    info_modules=['__main__', 'src.components.sla_monitor', 'services.xsoar'],
     rotate_on_startup=False  # Keep logs continuous, rely on RotatingFileHandler for size-based rotation
 )
 
@@ -84,6 +86,9 @@ eastern = pytz.timezone('US/Eastern')
 DEFAULT_JOB_TIMEOUT = 1800  # 30 minutes
 TICKET_CACHE_TIMEOUT = 21600  # 360 minutes (6 hours) for ticket enrichment job on VM
 
+# Ticket snapshot shared by the nightly chart groups (see run_with_ticket_snapshot)
+_ticket_snapshot = None
+
 
 # Note: VM with slow network takes 2-4 hours for 12k tickets with note enrichment
 # Generous timeout prevents premature termination of this critical nightly job
@@ -164,11 +169,22 @@ def schedule_daily(time_str: str, *jobs: Callable[[], None], name: str = None) -
     schedule.every().day.at(time_str, eastern).do(lambda: safe_run(*jobs, name=name))
 
 
-def schedule_group(time_str: str, name: str, jobs: Iterable[Callable[[], None]]) -> None:
-    """Schedule a named group of jobs and log registration."""
+def schedule_group(time_str: str, name: str, jobs: Iterable[Callable[[], None]], shared_snapshot: bool = False,
+                   release_snapshot: bool = False) -> None:
+    """Schedule a named group of jobs and log registration.
+
+    Args:
+        shared_snapshot: Pass the shared ticket snapshot to jobs that take a snapshot argument
+        release_snapshot: Drop the shared snapshot once this group has run (last group using it)
+    """
     job_list = list(jobs)
     logger.info(f"Scheduling {name} ({len(job_list)} job(s)) at {time_str} ET")
-    schedule_daily(time_str, *job_list, name=name)
+    if shared_snapshot:
+        schedule.every().day.at(time_str, eastern).do(
+            lambda: run_with_ticket_snapshot(job_list, name=name, release=release_snapshot)
+        )
+    else:
+        schedule_daily(time_str, *job_list, name=name)
 
 
 def schedule_shift(time_str: str, shift_name: str, room_id: str) -> None:
@@ -199,13 +215,62 @@ def schedule_sla(interval: str, job: Callable[[], None], name: str, timeout: int
         logger.error(f"Unsupported SLA interval format: {interval}")
 
 
+def _with_snapshot(job: Callable[..., None], snapshot) -> Callable[[], None]:
+    """Bind the snapshot to a job that takes a snapshot argument; other jobs are returned as is."""
+    if 'snapshot' not in inspect.signature(job).parameters:
+        return job
+
+    @functools.wraps(job)
+    def run() -> None:
+        job(snapshot=snapshot)
+
+    return run
+
+
+def _get_ticket_snapshot(name: str):
+    """Return the shared ticket snapshot, fetching 12 months of team tickets if there is no live one.
+
+    Returns None if loading fails; the jobs then query XSOAR directly.
+    """
+    global _ticket_snapshot
+    if _ticket_snapshot is None or _ticket_snapshot.expired:
+        _ticket_snapshot = None
+        try:
+            _ticket_snapshot = TicketHandler(XsoarEnvironment.PROD).load_snapshot()
+        except Exception as e:
+            logger.error(f"Failed to load shared ticket snapshot for {name}, charts will query XSOAR directly: {e}")
+    return _ticket_snapshot
+
+
+def run_with_ticket_snapshot(jobs: List[Callable[..., None]], name: str, release: bool = False) -> None:
+    """Run the jobs, passing the shared ticket snapshot to those that accept it.
+
+    The first group of the night loads the snapshot and later groups reuse it while it is
+    younger than SNAPSHOT_TTL_MINUTES, so all the nightly chart queries cost one fetch.
+
+    Args:
+        release: Drop the snapshot afterwards so it isn't held in memory until the next night
+    """
+    global _ticket_snapshot
+    snapshot = _get_ticket_snapshot(name)
+    safe_run(*[_with_snapshot(job, snapshot) for job in jobs], name=name)
+    if snapshot is not None:
+        logger.info(f"Shared ticket snapshot after {name}: {snapshot.hits} hits, {snapshot.misses} misses")
+    if release:
+        _ticket_snapshot = None
+
+
 # ----------------------------------------------------------------------------------
 # Data-driven configuration for chart groups
 # ----------------------------------------------------------------------------------
+# Groups with 'shared_snapshot' share one 12-month snapshot of team tickets (loaded by the first
+# of them, released by the group with 'release_snapshot'); their charts that take a snapshot
+# argument answer the queries it covers locally instead of calling XSOAR.
 CHART_GROUPS: List[dict] = [
     {
         'time': '00:02',
         'name': 'Group 1: Basic metrics charts',
+        'shared_snapshot': True,
         'jobs': [
             aging_tickets.make_chart,
             inflow.make_chart,
@@ -219,6 +284,7 @@ CHART_GROUPS: List[dict] = [
     {
         'time': '00:07',
         'name': 'Group 2: Efficacy & volume charts',
+        'shared_snapshot': True,
         'jobs': [
             crowdstrike_efficacy.make_chart,
             crowdstrike_volume.make_chart,
@@ -230,6 +296,7 @@ CHART_GROUPS: List[dict] = [
     {
         'time': '00:12',
         'name': 'Group 3: Story & status charts',
+        'shared_snapshot': True,
         'jobs': [
             de_stories.make_chart,
             re_stories.make_chart,
@@ -240,6 +307,8 @@ CHART_GROUPS: List[dict] = [
     {
         'time': '00:17',
         'name': 'Group 4: Complex/slow charts',
+        'shared_snapshot': True,
+        'release_snapshot': True,
         'jobs': [
             heatmap.create_choropleth_map,
         ]
@@ -280,23 +349,31 @@ def main() -> None:
 
     # Chart groups (data-driven)
     for group in CHART_GROUPS:
-        schedule_group(group['time'], group['name'], group['jobs'])
+        schedule_group(group['time'], group['name'], group['jobs'], shared_snapshot=group.get('shared_snapshot', False),
+                       release_snapshot=group.get('release_snapshot', False))
+
+    # Ticket cache - incremental sync every 15 minutes (only incidents modified since the
+    # last run are fetched). Non-blocking: the first run / fallback full rebuild can take hours.
+    # Overlapping runs are skipped by TicketCache's own lock.
+    logger.info("Scheduling incremental ticket cache sync every 15 minutes...")
+    schedule.every(15).minutes.do(
+        lambda: safe_run(TicketCache.sync, timeout=TICKET_CACHE_TIMEOUT, name="ticket_cache_sync", blocking=False)
+    )
 
-    # Ticket cache - RUNS LAST to avoid interfering with chart generation
-    # Scheduled after all chart jobs complete (charts finish by ~00:30)
+    # Weekly full rebuild reconciles incidents deleted in XSOAR (delta queries can't see deletions)
     # Extended timeout (6 hours) accommodates slow VM network with full note enrichment
-    logger.info("Scheduling ticket cache generation at 01:00 ET (runs last, may take 2-4 hours on VM)...")
+    logger.info("Scheduling weekly full ticket cache rebuild (Sunday 01:00 ET, may take 2-4 hours on VM)...")
 
     def ticket_cache_with_logging():
         logger.info("=" * 60)
-        logger.info("TICKET CACHE JOB STARTING at 01:00 ET")
+        logger.info("TICKET CACHE FULL REBUILD STARTING at 01:00 ET")
         logger.info("=" * 60)
         safe_run(TicketCache.generate, timeout=TICKET_CACHE_TIMEOUT, name="ticket_cache")
         logger.info("=" * 60)
-        logger.info("TICKET CACHE JOB COMPLETED")
+        logger.info("TICKET CACHE FULL REBUILD COMPLETED")
         logger.info("=" * 60)
 
-    schedule.every().day.at('01:00', eastern).do(ticket_cache_with_logging)
+    schedule.every().sunday.at('01:00', eastern).do(ticket_cache_with_logging)
 
     # Host verification
     logger.info("Scheduling host verification every 5 minutes...")
@@ -390,11 +467,10 @@ def main() -> None:
         lambda: safe_run(lambda: phish_fort.fetch_and_report_incidents(room_id=config.webex_room_id_phish_fort), name="phishfort_report")
     )
 
-    # SLA risk monitoring
-    logger.info("Scheduling SLA risk monitoring jobs...")
-    schedule_sla('minutes:1', lambda: response_sla_risk_tickets.start(config.webex_room_id_response_sla_risk), name="response_sla_risk", timeout=50)
-    schedule_sla('minutes:3', lambda: containment_sla_risk_tickets.start(config.webex_room_id_containment_sla_risk), name="containment_sla_risk", timeout=170)
-    schedule_sla('hourly:00', lambda: incident_declaration_sla_risk.start(config.webex_room_id_response_sla_risk), name="incident_declaration_sla_risk", timeout=3540)
+    # SLA risk monitoring (response, containment and incident declaration): one background
+    # monitor tracks open tickets' SLA timers and alerts as each crosses a threshold
+    logger.info("Starting SLA risk monitor...")
+    sla_monitor.start()
 
     # Major Incident monitoring (polls ServiceNow for new incidents assigned to configured groups)
     # TODO: Uncomment once SNOW ITSM Incident API access is granted (EAD_ITSM_API_INC_GET_APP10140)
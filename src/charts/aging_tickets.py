@@ -416,12 +416,13 @@ def generate_daily_summary(tickets: List[Dict[Any, Any]]) -> Optional[str]:
         return "Error generating report. Please check the logs."
 
 
-def get_aging_tickets(days_ago: int, ticket_type: str) -> List[Dict[Any, Any]]:
+def get_aging_tickets(days_ago: int, ticket_type: str, snapshot=None) -> List[Dict[Any, Any]]:
     """Fetch aging tickets based on criteria.
 
     Args:
         days_ago: Number of days threshold for aging
         ticket_type: Ticket type filter
+        snapshot: Optional shared ticket snapshot to answer the query from
 
     Returns:
         List of ticket dictionaries
@@ -433,7 +434,7 @@ def get_aging_tickets(days_ago: int, ticket_type: str) -> List[Dict[Any, Any]]:
     threshold_utc = threshold_date.astimezone(pytz.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
 
     query = f'-status:closed type:{ticket_type} created:<{threshold_utc}'
-    prod_ticket_handler = TicketHandler(XsoarEnvironment.PROD)
+    prod_ticket_handler = TicketHandler(XsoarEnvironment.PROD, snapshot=snapshot)
     return prod_ticket_handler.get_tickets(query=query)
 
 
@@ -474,19 +475,25 @@ def send_report(room_id: str) -> None:
         logger.error(f"Error sending report: {e}")
 
 
-def make_chart() -> None:
-    """Generate aging tickets chart with all relevant data."""
+def make_chart(snapshot=None) -> None:
+    """Generate aging tickets chart with all relevant data.
+
+    Args:
+        snapshot: Optional shared ticket snapshot to answer the queries from
+    """
     try:
         # Get regular tickets (30+ days)
         tickets = get_aging_tickets(
             AGING_THRESHOLD_DAYS,
-            f'{config.team_name} -type:"{config.team_name} Third Party Compromise"'
+            f'{config.team_name} -type:"{config.team_name} Third Party Compromise"',
+            snapshot=snapshot
         )
 
         # Get Third Party Compromise tickets (90+ days)
         tp_tickets = get_aging_tickets(
             THIRD_PARTY_AGING_DAYS,
-            f'"{config.team_name} Third Party Compromise"'
+            f'"{config.team_name} Third Party Compromise"',
+            snapshot=snapshot
         )
 
         generate_plot(tickets + tp_tickets)
@@ -87,8 +87,8 @@ def _save_chart(fig, output_filename: str) -> None:
 class CrowdstrikeEfficacyChart:
     """Class to generate efficacy charts for different time periods."""
 
-    def __init__(self):
-        self.prod_incident_fetcher = TicketHandler(XsoarEnvironment.PROD)
+    def __init__(self, snapshot=None):
+        self.prod_incident_fetcher = TicketHandler(XsoarEnvironment.PROD, snapshot=snapshot)
 
     def get_tickets(self, days: int) -> List[Dict[str, Any]]:
         """Fetch tickets for the specified number of days using explicit timestamps."""
@@ -350,9 +350,13 @@ def send_charts() -> None:
         log.error(f"Error sending chart: {e}", exc_info=True)
 
 
-def make_chart() -> None:
-    """Main function to generate all charts."""
-    efficacy_chart = CrowdstrikeEfficacyChart()
+def make_chart(snapshot=None) -> None:
+    """Main function to generate all charts.
+
+    Args:
+        snapshot: Optional shared ticket snapshot to answer the period queries from
+    """
+    efficacy_chart = CrowdstrikeEfficacyChart(snapshot=snapshot)
     efficacy_chart.generate_all_charts()
 
 
@@ -147,7 +147,7 @@ class CounterImageModifier:
         return ImageFont.load_default()
 
 
-def get_last_incident_details():
+def get_last_incident_details(snapshot=None):
     """Get the current days since the last incident"""
     # Search for the most recent MTP incident in the past year using exact timestamps
     # Note: Using 365 days to ensure we catch incidents even if they're older
@@ -160,7 +160,7 @@ def get_last_incident_details():
     end_str = end_date.astimezone(pytz.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
 
     query = f'type:{config.team_name} impact:"Malicious True Positive" created:>={start_str} created:<={end_str}'
-    prod_ticket_handler = TicketHandler(XsoarEnvironment.PROD)
+    prod_ticket_handler = TicketHandler(XsoarEnvironment.PROD, snapshot=snapshot)
     ticket = prod_ticket_handler.get_tickets(query=query, size=1)
 
     if ticket:  # Check if any tickets were returned
@@ -179,12 +179,12 @@ def get_last_incident_details():
         return -1, None, None  # Always return a tuple
 
 
-def make_chart():
+def make_chart(snapshot=None):
     """Update the base image with the current days since last incident"""
     try:
         # Initialize the modifier
         modifier = CounterImageModifier()
-        days_since_last_incident, last_incident_date, last_incident_id = get_last_incident_details()
+        days_since_last_incident, last_incident_date, last_incident_id = get_last_incident_details(snapshot=snapshot)
 
         today_date = datetime.now().strftime('%m-%d-%Y')
         output_path = ROOT_DIRECTORY / "web" / "static" / "charts" / today_date / "Days Since Last Incident.png"
@@ -41,8 +41,12 @@ def fix_ssl_verification():
 fix_ssl_verification()
 
 
-def create_choropleth_map():
-    """Create a world choropleth map using Cartopy."""
+def create_choropleth_map(snapshot=None):
+    """Create a world choropleth map using Cartopy.
+
+    Args:
+        snapshot: Optional shared ticket snapshot to answer the 30-day query from
+    """
 
     with open(DATA_DIR / 'host_counts_by_country.json', 'r') as f:
         host_counts_by_country = json.load(f)
@@ -64,7 +68,7 @@ def create_choropleth_map():
     end_str = end_date.astimezone(pytz.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
 
     query = f'status:closed type:{config.team_name} -owner:"" created:>={start_str} created:<={end_str}'
-    prod_ticket_handler = TicketHandler(XsoarEnvironment.PROD)
+    prod_ticket_handler = TicketHandler(XsoarEnvironment.PROD, snapshot=snapshot)
     tickets = prod_ticket_handler.get_tickets(query=query)
     ticket_counts_by_country = {}
 
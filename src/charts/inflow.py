@@ -437,13 +437,13 @@ def _get_expected_months() -> List[Any]:
 class TicketChartGenerator:
     """Main class for generating ticket charts."""
 
-    def __init__(self):
+    def __init__(self, snapshot=None):
         self.config = get_config()
         self.chart_config = ChartConfig()
         self.styler = ChartStyler(self.chart_config)
         self.stacked_chart = StackedBarChart(self.styler)
         self.period_chart = PeriodChart(self.styler)
-        self.prod_ticket_handler = TicketHandler(XsoarEnvironment.PROD)
+        self.prod_ticket_handler = TicketHandler(XsoarEnvironment.PROD, snapshot=snapshot)
         self.eastern = pytz.timezone('US/Eastern')
 
         # Setup output directory
@@ -1292,9 +1292,13 @@ class TicketChartGenerator:
             raise
 
 
-def make_chart() -> None:
-    """Main entry point for chart generation."""
-    generator = TicketChartGenerator()
+def make_chart(snapshot=None) -> None:
+    """Main entry point for chart generation.
+
+    Args:
+        snapshot: Optional shared ticket snapshot to answer the 12-month query from
+    """
+    generator = TicketChartGenerator(snapshot=snapshot)
 
     # Calculate exact 12-month window
     end_date = datetime.now(generator.eastern).replace(hour=23, minute=59, second=59, microsecond=999999)
@@ -1308,7 +1312,7 @@ def make_chart() -> None:
     print(f"Query: {query}")
     print(f"Date range: {start_str} to now")
     print(f"This may take several minutes depending on the number of tickets...")
-    tickets = generator.prod_ticket_handler.get_tickets(query=query, paginate=True)
+    tickets = generator.prod_ticket_handler.get_tickets(query=query, paginate=True, parallel=True)
     print(f"✓ Fetched {len(tickets)} tickets")
 
     if not tickets:
@@ -173,7 +173,7 @@ def get_lifespan_chart(tickets):
     return None
 
 
-def make_chart():
+def make_chart(snapshot=None):
     # Calculate exact 30-day window using explicit timestamps
     end_date = datetime.now(eastern).replace(hour=23, minute=59, second=59, microsecond=999999)
     start_date = end_date - timedelta(days=30)
@@ -185,7 +185,7 @@ def make_chart():
 
     query = f'type:{config.team_name} -owner:"" status:closed created:>={start_str} created:<={end_str}'
 
-    prod_incident_fetcher = TicketHandler(XsoarEnvironment.PROD)
+    prod_incident_fetcher = TicketHandler(XsoarEnvironment.PROD, snapshot=snapshot)
     tickets = prod_incident_fetcher.get_tickets(query=query)
     get_lifespan_chart(tickets)
 
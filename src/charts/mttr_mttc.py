@@ -336,7 +336,7 @@ def save_mttr_mttc_chart(ticket_slas_by_periods, period_label="Yesterday"):
     plt.close(fig)
 
 
-def make_chart():
+def make_chart(snapshot=None):
     # Calculate exact 30-day window using explicit timestamps
     end_date = datetime.now(eastern).replace(hour=23, minute=59, second=59, microsecond=999999)
     start_date = end_date - timedelta(days=30)
@@ -352,7 +352,7 @@ def make_chart():
 
     query = f'type:{config.team_name} -owner:"" created:>={start_str} created:<={end_str}'
 
-    prod_incident_fetcher = TicketHandler(XsoarEnvironment.PROD)
+    prod_incident_fetcher = TicketHandler(XsoarEnvironment.PROD, snapshot=snapshot)
     tickets = prod_incident_fetcher.get_tickets(query=query)
     tickets_by_periods = get_tickets_by_periods(tickets)
     save_mttr_mttc_chart(tickets_by_periods, period_label)
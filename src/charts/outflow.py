@@ -399,7 +399,7 @@ def create_graph(tickets, period_label="Yesterday"):
     plt.close(fig)
 
 
-def make_chart() -> None:
+def make_chart(snapshot=None) -> None:
     # Calculate exact yesterday window in Eastern time, then convert to UTC for query
     # On Mondays, include both Saturday and Sunday
     now = datetime.now(eastern).replace(hour=0, minute=0, second=0, microsecond=0)
@@ -421,7 +421,7 @@ def make_chart() -> None:
     yesterday_end_utc = yesterday_end.astimezone(pytz.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
 
     query = QUERY_TEMPLATE.format(ticket_type_prefix=config.team_name, start=yesterday_start_utc, end=yesterday_end_utc)
-    prod_ticket_handler = TicketHandler(XsoarEnvironment.PROD)
+    prod_ticket_handler = TicketHandler(XsoarEnvironment.PROD, snapshot=snapshot)
     tickets = prod_ticket_handler.get_tickets(query=query)
     create_graph(tickets, period_label)
 
@@ -44,9 +44,9 @@ with open(QR_RULE_NAMES_ABBREVIATION_FILE, 'r') as f:
 class QRadarEfficacyChart:
     """Class to generate QRadar rule efficacy charts for different time periods."""
 
-    def __init__(self):
-        """Initialize with ticket type prefix."""
-        self.prod_incident_fetcher = TicketHandler(XsoarEnvironment.PROD)
+    def __init__(self, snapshot=None):
+        """Initialize with ticket type prefix and an optional shared ticket snapshot."""
+        self.prod_incident_fetcher = TicketHandler(XsoarEnvironment.PROD, snapshot=snapshot)
 
     def get_tickets(self, days: int) -> List[Dict[str, Any]]:
         """Fetch tickets for the specified number of days using explicit timestamps."""
@@ -368,9 +368,13 @@ def send_charts() -> None:
         log.error(f"Error sending chart: {e}", exc_info=True)
 
 
-def make_chart() -> None:
-    """Main function to generate all charts."""
-    efficacy_chart = QRadarEfficacyChart()
+def make_chart(snapshot=None) -> None:
+    """Main function to generate all charts.
+
+    Args:
+        snapshot: Optional shared ticket snapshot to answer the period queries from
+    """
+    efficacy_chart = QRadarEfficacyChart(snapshot=snapshot)
     efficacy_chart.generate_all_charts()
 
     # Optionally send chart
@@ -12,7 +12,7 @@ prod_list_handler = ListHandler(XsoarEnvironment.PROD)
 def removed_expired_entries():
     """Cleans expired entries from the approved testing list."""
     try:
-        approved_test_items = prod_list_handler.get_list_data_by_name(approved_testing_list_name)
+        version, approved_test_items = prod_list_handler.read_for_update(approved_testing_list_name)
         today = datetime.now()
 
         updated_approved_test_items = {}
@@ -28,7 +28,7 @@ def removed_expired_entries():
                     continue
             updated_approved_test_items[category] = valid_items
 
-        prod_list_handler.save(approved_testing_list_name, updated_approved_test_items)
+        prod_list_handler.save(approved_testing_list_name, updated_approved_test_items, version)
     except Exception as e:
         logging.error(f"Error during clean operation: {str(e)}")
 
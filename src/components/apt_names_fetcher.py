@@ -1,5 +1,9 @@
+import copy
+import json
 import logging
-from typing import List, Dict, Any
+import os
+import threading
+from typing import List, Dict, Any, Tuple
 
 import pandas as pd
 
@@ -21,6 +25,14 @@ NON_COMPANY_COLUMNS = [
     'Targets', 'Sectors', 'Geography', 'Malware', 'Tools', 'TTPs'
 ]
 
+# Parsed-workbook cache written next to the xlsx; bump when the cached structure changes
+KNOWLEDGE_CACHE_SUFFIX = '.knowledge.json'
+KNOWLEDGE_CACHE_VERSION = 2
+
+# abspath -> ((mtime_ns, size) of the xlsx, parsed knowledge)
+_knowledge_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_knowledge_lock = threading.Lock()
+
 
 def is_company_column(column_name: str) -> bool:
     """
@@ -112,6 +124,180 @@ def validate_sheet_structure(df: pd.DataFrame) -> bool:
     return False
 
 
+def parse_apt_knowledge(file_path: str) -> Dict[str, Any]:
+    """
+    Parse all region sheets once into the structures the lookups need.
+
+    Everything returned is plain JSON data so it can be written to the knowledge cache;
+    the alias index is derived from 'actors' by index_apt_knowledge.
+
+    Args:
+        file_path (str): Path to the Excel file.
+
+    Returns:
+        Dict with:
+            'common_names': sorted list of unique common names
+            'groups_by_region': region -> list of {'common_name', 'alternative_names', 'total_alternatives'}
+            'actors': list of actor info dicts (see build_apt_alias_index), in sheet order
+            'sheets': sheet name -> {'region', 'company_columns': [[column index, company], ...]}
+            'rows': every data row as {'region', 'sheet_name', 'row_index', 'common_name' (None when empty),
+                    'alternative_names', 'all_row_data'}
+    """
+    xl = pd.ExcelFile(file_path)
+    common_names = set()
+    groups_by_region = {}
+    actors = []
+    sheets = {}
+    rows = []
+
+    for sheet_name in [sheet for sheet in xl.sheet_names if is_region_sheet(sheet)]:
+        try:
+            df = xl.parse(sheet_name, header=None)
+
+            if not validate_sheet_structure(df):
+                logger.warning(f"Sheet '{sheet_name}' doesn't have expected structure, skipping...")
+                continue
+
+            region_name = str(df.iloc[0, 0]) if pd.notna(df.iloc[0, 0]) else sheet_name
+            company_columns = get_company_columns(df)
+            sheets[sheet_name] = {
+                'region': region_name,
+                'company_columns': [[col_idx, company] for col_idx, company in company_columns.items()],
+            }
+            apt_groups = []
+
+            for idx, row in df.iloc[2:].iterrows():
+                aliases = {}
+                for col_idx, company in company_columns.items():
+                    if col_idx < len(row):
+                        alt_name = row.iloc[col_idx]
+                        if pd.notna(alt_name) and str(alt_name).strip():
+                            aliases[company] = str(alt_name).strip()
+
+                common_name = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else None
+                rows.append({
+                    'region': region_name,
+                    'sheet_name': sheet_name,
+                    'row_index': int(idx),
+                    'common_name': common_name,
+                    'alternative_names': aliases,
+                    'all_row_data': ', '.join([str(cell) if pd.notna(cell) else 'N/A' for cell in list(row)]),
+                })
+                if not common_name:
+                    continue
+
+                common_names.add(common_name)
+                all_names = [common_name]
+                for alt_name_str in aliases.values():
+                    if alt_name_str not in all_names:
+                        all_names.append(alt_name_str)
+
+                apt_groups.append({
+                    'common_name': common_name,
+                    'alternative_names': aliases,
+                    'total_alternatives': len(aliases)
+                })
+                actors.append({
+                    'common_name': common_name,
+                    'region': region_name,
+                    'all_names': all_names,
+                    'aliases': aliases,
+                })
+
+            groups_by_region[region_name] = apt_groups
+
+        except Exception as e:
+            logger.error(f"Error processing sheet '{sheet_name}': {str(e)}")
+            continue
+
+    return {
+        'common_names': sorted(common_names),
+        'groups_by_region': groups_by_region,
+        'actors': actors,
+        'sheets': sheets,
+        'rows': rows,
+    }
+
+
+def index_apt_knowledge(knowledge: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add the derived lookup structures to parsed (or cache-loaded) APT knowledge.
+
+    Args:
+        knowledge (Dict[str, Any]): Output of parse_apt_knowledge.
+
+    Returns:
+        Dict[str, Any]: The same dict with 'alias_index' (lowercase name -> actor info)
+        and 'common_name_set' added.
+    """
+    alias_index = {}
+    for actor_info in knowledge['actors']:
+        for name in actor_info['all_names']:
+            alias_index[name.lower()] = actor_info
+    knowledge['alias_index'] = alias_index
+    knowledge['common_name_set'] = frozenset(knowledge['common_names'])
+    return knowledge
+
+
+def load_apt_knowledge(file_path: str = '../../data/transient/de/APTAKAcleaned.xlsx') -> Dict[str, Any]:
+    """
+    Get the parsed APT workbook, parsing the spreadsheet only when it has changed.
+
+    Lookups are served from an in-memory copy keyed by the xlsx mtime/size. On a
+    process's first load the JSON parse next to the xlsx is used if it matches
+    the current file; otherwise the workbook is parsed and the JSON rewritten.
+
+    The returned structures are shared between callers and must not be mutated;
+    the public getters below hand out copies.
+
+    Args:
+        file_path (str): Path to the Excel file.
+
+    Returns:
+        Dict[str, Any]: See parse_apt_knowledge.
+
+    Raises:
+        OSError: If the workbook doesn't exist.
+    """
+    path = os.path.abspath(file_path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _knowledge_lock:
+        cached = _knowledge_cache.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        cache_file = path + KNOWLEDGE_CACHE_SUFFIX
+        knowledge = None
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') == KNOWLEDGE_CACHE_VERSION and tuple(stored.get('signature', ())) == signature:
+                knowledge = stored['knowledge']
+                logger.debug(f"Loaded APT knowledge from {cache_file}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable APT knowledge cache {cache_file}: {e}")
+
+        if knowledge is None:
+            knowledge = parse_apt_knowledge(path)
+            logger.info(f"Parsed APT workbook: {len(knowledge['common_names'])} actors, "
+                        f"{len(knowledge['rows'])} rows")
+            temp_file = cache_file + '.tmp'
+            try:
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    json.dump({'version': KNOWLEDGE_CACHE_VERSION, 'signature': list(signature), 'knowledge': knowledge}, f)
+                os.replace(temp_file, cache_file)
+            except OSError as e:
+                logger.warning(f"Could not write APT knowledge cache {cache_file}: {e}")
+
+        index_apt_knowledge(knowledge)
+        _knowledge_cache[path] = (signature, knowledge)
+        return knowledge
+
+
 def get_workbook_info(file_path: str = '../../data/transient/de/APTAKAcleaned.xlsx') -> Dict[str, Any]:
     """
     Get information about the workbook structure, focusing only on region sheets.
@@ -188,62 +374,31 @@ def get_other_names_for_common_name(common_name: str,
         List[Dict[str, Any]]: List of dictionaries containing match information.
     """
     try:
-        xl = pd.ExcelFile(file_path)
+        knowledge = load_apt_knowledge(file_path)
         results = []
 
-        region_sheets = [sheet for sheet in xl.sheet_names if is_region_sheet(sheet)]
-        logger.info(f"Searching for '{common_name}' in {len(region_sheets)} region sheets")
-
-        for sheet_name in region_sheets:
-            try:
-                df = xl.parse(sheet_name, header=None)  # Don't use header row
-
-                # Validate sheet structure
-                if not validate_sheet_structure(df):
-                    logger.warning(f"Sheet '{sheet_name}' doesn't have expected structure, skipping...")
-                    continue
+        logger.info(f"Searching for '{common_name}' in {len(knowledge['sheets'])} region sheets")
 
-                # Get region name from A1
-                region_name = df.iloc[0, 0] if pd.notna(df.iloc[0, 0]) else sheet_name
+        for row in knowledge['rows']:
+            if row['common_name'] is None or row['common_name'].lower() != common_name.lower():
+                continue
 
-                # Get company columns (excluding metadata columns)
-                company_columns = get_company_columns(df)
-                company_names = list(company_columns.values())
+            result = {
+                'region': row['region'],
+                'sheet_name': row['sheet_name'],
+                'common_name': row['common_name'],
+                'alternative_names': dict(row['alternative_names']),
+                'total_alternatives': len(row['alternative_names'])
+            }
 
-                # Search in data rows (starting from row 3, index 2)
-                data_rows = df.iloc[2:]
-
-                for idx, row in data_rows.iterrows():
-                    # Check if column A (common name) matches
-                    if pd.notna(row.iloc[0]) and str(row.iloc[0]).strip().lower() == common_name.lower():
-
-                        # Collect alternative names from company columns only
-                        alternative_names = {}
-                        for col_idx, company in company_columns.items():
-                            if col_idx < len(row):
-                                alt_name = row.iloc[col_idx]
-                                if pd.notna(alt_name) and str(alt_name).strip():
-                                    alternative_names[company] = str(alt_name).strip()
-
-                        result = {
-                            'region': region_name,
-                            'sheet_name': sheet_name,
-                            'common_name': str(row.iloc[0]).strip(),
-                            'alternative_names': alternative_names,
-                            'total_alternatives': len(alternative_names)
-                        }
-
-                        if should_include_metadata:
-                            result['row_index'] = idx
-                            result['companies_in_sheet'] = ', '.join(company_names)
-                            result['all_company_columns'] = company_columns
-                            result['all_row_data'] = ', '.join([str(cell) if pd.notna(cell) else 'N/A' for cell in list(row)])
-
-                        results.append(result)
+            if should_include_metadata:
+                company_columns = {col_idx: company for col_idx, company in knowledge['sheets'][row['sheet_name']]['company_columns']}
+                result['row_index'] = row['row_index']
+                result['companies_in_sheet'] = ', '.join(company_columns.values())
+                result['all_company_columns'] = company_columns
+                result['all_row_data'] = row['all_row_data']
 
-            except Exception as e:
-                logger.error(f"Error processing sheet '{sheet_name}': {str(e)}")
-                continue
+            results.append(result)
 
         logger.info(f"Found {len(results)} matches for '{common_name}'")
         return results
@@ -268,55 +423,32 @@ def search_by_company_name(company_name: str,
         List[Dict[str, Any]]: List of matches.
     """
     try:
-        xl = pd.ExcelFile(file_path)
+        knowledge = load_apt_knowledge(file_path)
         results = []
 
-        region_sheets = [sheet for sheet in xl.sheet_names if is_region_sheet(sheet)]
-
-        for sheet_name in region_sheets:
-            try:
-                df = xl.parse(sheet_name, header=None)
-
-                # Validate sheet structure
-                if not validate_sheet_structure(df):
-                    continue
-
-                region_name = df.iloc[0, 0] if pd.notna(df.iloc[0, 0]) else sheet_name
-
-                # Get company columns (excluding metadata columns)
-                company_columns = get_company_columns(df)
-
-                # Find the company column
-                company_col_idx = None
-                for col_idx, company in company_columns.items():
-                    if company.lower() == company_name.lower():
-                        company_col_idx = col_idx
-                        break
-
-                if company_col_idx is None:
-                    continue
-
-                # Search in that company's column
-                data_rows = df.iloc[2:]
-                for idx, row in data_rows.iterrows():
-                    if (company_col_idx < len(row) and
-                            pd.notna(row.iloc[company_col_idx]) and
-                            str(row.iloc[company_col_idx]).strip().lower() == alt_name.lower()):
-                        common_name = str(row.iloc[0]).strip() if pd.notna(row.iloc[0]) else 'N/A'
-
-                        results.append({
-                            'region': region_name,
-                            'sheet_name': sheet_name,
-                            'common_name': common_name,
-                            'company': company_name,
-                            'alternative_name': str(row.iloc[company_col_idx]).strip(),
-                            'row_index': idx
-                        })
-
-            except Exception as e:
-                logger.error(f"Error processing sheet '{sheet_name}': {str(e)}")
+        # Sheet -> that sheet's header for the company (first matching column, case-insensitive)
+        company_headers = {}
+        for sheet_name, sheet in knowledge['sheets'].items():
+            for _, company in sheet['company_columns']:
+                if company.lower() == company_name.lower():
+                    company_headers[sheet_name] = company
+                    break
+
+        for row in knowledge['rows']:
+            company = company_headers.get(row['sheet_name'])
+            alternative_name = row['alternative_names'].get(company) if company else None
+            if alternative_name is None or alternative_name.lower() != alt_name.lower():
                 continue
 
+            results.append({
+                'region': row['region'],
+                'sheet_name': row['sheet_name'],
+                'common_name': row['common_name'] if row['common_name'] is not None else 'N/A',
+                'company': company_name,
+                'alternative_name': alternative_name,
+                'row_index': row['row_index']
+            })
+
         return results
 
     except Exception as e:
@@ -335,52 +467,7 @@ def get_all_apt_groups_by_region(file_path: str = '../../data/transient/de/APTAK
         Dict[str, List[Dict[str, Any]]]: Dictionary with regions as keys and APT groups as values.
     """
     try:
-        xl = pd.ExcelFile(file_path)
-        regional_groups = {}
-
-        region_sheets = [sheet for sheet in xl.sheet_names if is_region_sheet(sheet)]
-
-        for sheet_name in region_sheets:
-            try:
-                df = xl.parse(sheet_name, header=None)
-
-                # Validate sheet structure
-                if not validate_sheet_structure(df):
-                    continue
-
-                region_name = df.iloc[0, 0] if pd.notna(df.iloc[0, 0]) else sheet_name
-
-                # Get company columns (excluding metadata columns)
-                company_columns = get_company_columns(df)
-
-                # Get APT groups
-                apt_groups = []
-                data_rows = df.iloc[2:]
-
-                for idx, row in data_rows.iterrows():
-                    if pd.notna(row.iloc[0]) and str(row.iloc[0]).strip():
-
-                        # Collect alternative names from company columns only
-                        alternative_names = {}
-                        for col_idx, company in company_columns.items():
-                            if col_idx < len(row):
-                                alt_name = row.iloc[col_idx]
-                                if pd.notna(alt_name) and str(alt_name).strip():
-                                    alternative_names[company] = str(alt_name).strip()
-
-                        apt_groups.append({
-                            'common_name': str(row.iloc[0]).strip(),
-                            'alternative_names': alternative_names,
-                            'total_alternatives': len(alternative_names)
-                        })
-
-                regional_groups[region_name] = apt_groups
-
-            except Exception as e:
-                logger.error(f"Error processing sheet '{sheet_name}': {str(e)}")
-                continue
-
-        return regional_groups
+        return copy.deepcopy(load_apt_knowledge(file_path)['groups_by_region'])
 
     except Exception as e:
         logger.error(f"Error reading file: {str(e)}")
@@ -405,59 +492,7 @@ def build_apt_alias_index(file_path: str = '../../data/transient/de/APTAKAcleane
         }
     """
     try:
-        xl = pd.ExcelFile(file_path)
-        index = {}
-
-        region_sheets = [sheet for sheet in xl.sheet_names if is_region_sheet(sheet)]
-
-        for sheet_name in region_sheets:
-            try:
-                df = xl.parse(sheet_name, header=None)
-
-                if not validate_sheet_structure(df):
-                    continue
-
-                region_name = df.iloc[0, 0] if pd.notna(df.iloc[0, 0]) else sheet_name
-                company_columns = get_company_columns(df)
-                data_rows = df.iloc[2:]
-
-                for idx, row in data_rows.iterrows():
-                    if not pd.notna(row.iloc[0]) or not str(row.iloc[0]).strip():
-                        continue
-
-                    common_name = str(row.iloc[0]).strip()
-
-                    # Collect all alternative names
-                    aliases = {}
-                    all_names = [common_name]
-
-                    for col_idx, company in company_columns.items():
-                        if col_idx < len(row):
-                            alt_name = row.iloc[col_idx]
-                            if pd.notna(alt_name) and str(alt_name).strip():
-                                alt_name_str = str(alt_name).strip()
-                                aliases[company] = alt_name_str
-                                if alt_name_str not in all_names:
-                                    all_names.append(alt_name_str)
-
-                    # Build the actor info
-                    actor_info = {
-                        'common_name': common_name,
-                        'region': region_name,
-                        'all_names': all_names,
-                        'aliases': aliases,
-                    }
-
-                    # Index by all names (lowercase for case-insensitive lookup)
-                    for name in all_names:
-                        index[name.lower()] = actor_info
-
-            except Exception as e:
-                logger.error(f"Error processing sheet '{sheet_name}': {str(e)}")
-                continue
-
-        logger.info(f"Built APT alias index with {len(index)} name mappings")
-        return index
+        return copy.deepcopy(load_apt_knowledge(file_path)['alias_index'])
 
     except Exception as e:
         logger.error(f"Error building APT alias index: {str(e)}")
@@ -475,41 +510,7 @@ def get_all_apt_names(file_path: str = '../../data/transient/de/APTAKAcleaned.xl
         List[str]: Sorted list of unique APT common names.
     """
     try:
-        xl = pd.ExcelFile(file_path)
-        apt_names = set()
-
-        region_sheets = [sheet for sheet in xl.sheet_names if is_region_sheet(sheet)]
-        logger.info(f"Extracting APT names from {len(region_sheets)} region sheets")
-
-        for sheet_name in region_sheets:
-            try:
-                df = xl.parse(sheet_name, header=None)
-
-                # Validate sheet structure
-                if not validate_sheet_structure(df):
-                    logger.warning(f"Sheet '{sheet_name}' doesn't have expected structure, skipping...")
-                    continue
-
-                # Get APT names from data rows (starting from row 3, index 2)
-                data_rows = df.iloc[2:]
-
-                for idx, row in data_rows.iterrows():
-                    # Check if column A (common name) has a value
-                    if pd.notna(row.iloc[0]) and str(row.iloc[0]).strip():
-                        apt_name = str(row.iloc[0]).strip()
-                        # Only add non-empty names
-                        if apt_name:
-                            apt_names.add(apt_name)
-
-            except Exception as e:
-                logger.error(f"Error processing sheet '{sheet_name}': {str(e)}")
-                continue
-
-        # Convert to sorted list
-        apt_names_list = sorted(list(apt_names))
-        logger.info(f"Found {len(apt_names_list)} unique APT names")
-
-        return apt_names_list
+        return list(load_apt_knowledge(file_path)['common_names'])
 
     except Exception as e:
         logger.error(f"Error reading file: {str(e)}")
@@ -0,0 +1,353 @@
+"""
+SLA Risk Monitor
+
+One change-driven monitor for the response, containment and incident declaration
+SLAs, replacing the three polling jobs that each queried XSOAR on every tick:
+
+- Open team tickets with a running SLA timer are kept in memory. They're
+  loaded once, then refreshed with a single modified:>= query every
+  REFRESH_SECONDS, with a full resync every FULL_RESYNC_SECONDS that also drops
+  timers which stopped. Both queries only match tickets with a running timer.
+- Before alerting, the crossed tickets are re-read in one query by id, so a timer
+  stopped since the last refresh doesn't raise a false alert.
+- Each running timer's alert times (due date minus each threshold) go into a
+  priority queue. The monitor sleeps until the next one, so a ticket is
+  reported within a second of crossing a threshold, and once per threshold.
+  A timer that is paused, ended or given a new due date is re-armed from scratch.
+- Due dates are parsed once when a ticket is loaded, and the shift lead is looked
+  up once per shift.
+
+Alerts reuse the message formats of the original jobs
+(response_sla_risk_tickets, containment_sla_risk_tickets,
+incident_declaration_sla_risk), which can still be run by hand.
+
+XSOAR load: the three jobs ran 81 queries an hour (response every minute,
+containment every 3 minutes, declaration hourly). The monitor runs 30 an hour
+(28 deltas and 2 full resyncs, all limited to running timers), plus one
+by-id query per alert pass that actually crosses a threshold.
+"""
+import heapq
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytz
+from tenacity import retry, stop_after_attempt, wait_exponential, before_sleep_log
+
+from my_config import get_config
+from services.xsoar import TicketHandler, XsoarEnvironment
+from src.components import containment_sla_risk_tickets, incident_declaration_sla_risk, response_sla_risk_tickets
+from src.secops import get_current_shift, get_staffing_data
+
+CONFIG = get_config()
+logger = logging.getLogger(__name__)
+
+REFRESH_SECONDS = 2 * 60  # Delta query interval; thresholds fire from memory in between
+REFRESH_OVERLAP_SECONDS = 60  # Re-read this much before the last refresh (clock skew, slow indexing)
+FULL_RESYNC_SECONDS = 30 * 60
+CLOSED_STATUS = 2
+
+
+@dataclass(frozen=True)
+class SlaDefinition:
+    """One SLA timer field and how its risk alerts are reported."""
+    name: str
+    field: str  # CustomFields key holding the timer
+    thresholds: Tuple[int, ...]  # Seconds before the due date to alert at
+    room_id: Callable[[], Optional[str]]
+    header: str
+    text: str
+    eligible: Callable[[Dict[str, Any]], bool]
+    build_message: Callable[[int, Dict[str, Any], int, Optional[str], str], str]  # (seconds, ticket, index, due, lead)
+
+
+SLA_DEFINITIONS = (
+    SlaDefinition(
+        name='response',
+        field='timetorespond',
+        thresholds=(180, 60),  # XSOAR marks response SLAs at risk ~3 mins before breach
+        room_id=lambda: CONFIG.webex_room_id_response_sla_risk,
+        header="🚨 Tickets at risk of breaching Response SLA ⏰",
+        text="Tickets at risk of breaching response SLA",
+        eligible=lambda ticket: bool(ticket.get('owner')),
+        build_message=lambda seconds, ticket, index, due, lead: response_sla_risk_tickets.build_ticket_message(
+            seconds, ticket, index, lead, due),
+    ),
+    SlaDefinition(
+        name='containment',
+        field='timetocontain',
+        thresholds=(180, 60),
+        room_id=lambda: CONFIG.webex_room_id_containment_sla_risk,
+        header="🚨 Tickets at risk of breaching Containment SLA ⏰",
+        text="Tickets at risk of breaching containment SLA",
+        eligible=lambda ticket: bool(ticket.get('CustomFields', {}).get('hostname')),
+        build_message=lambda seconds, ticket, index, due, lead: containment_sla_risk_tickets.build_ticket_message(
+            seconds, ticket, due, index),
+    ),
+    SlaDefinition(
+        name='incident_declaration',
+        field='sirtincidentnotificationsla',
+        thresholds=(15 * 60, 5 * 60),
+        room_id=lambda: CONFIG.webex_room_id_response_sla_risk,
+        header="🚨 Tickets at risk of breaching Incident Declaration SLA ⏰",
+        text="Tickets at risk of breaching Incident Declaration SLA",
+        eligible=lambda ticket: True,
+        build_message=lambda seconds, ticket, index, due, lead: incident_declaration_sla_risk.build_ticket_message(
+            seconds, ticket, index, due),
+    ),
+)
+
+
+def parse_due_date(due_date_str: Optional[str]) -> Optional[datetime]:
+    """Parse an XSOAR SLA timestamp (nanosecond precision, 'Z' suffix) to aware UTC."""
+    if not due_date_str:
+        return None
+    value = due_date_str.replace('Z', '+00:00')
+    if '.' in value:
+        # fromisoformat takes at most microseconds
+        date_part, rest = value.split('.', 1)
+        digits = len(rest) - len(rest.lstrip('0123456789'))
+        value = f"{date_part}.{(rest[:digits] + '000000')[:6]}{rest[digits:]}"
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        logger.error(f"Unable to parse date format: {due_date_str}")
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class _Timer:
+    """A running SLA timer on one ticket."""
+    __slots__ = ('ticket', 'due', 'due_str', 'fired')
+
+    def __init__(self, ticket: Dict[str, Any], due: datetime, due_str: str):
+        self.ticket = ticket
+        self.due = due
+        self.due_str = due_str
+        self.fired: set = set()  # Thresholds already alerted for this due date
+
+
+class SlaMonitor:
+    """In-memory SLA timers with a priority queue of upcoming threshold crossings."""
+
+    def __init__(self, ticket_handler: Optional[TicketHandler] = None,
+                 send: Optional[Callable[[str, str, str], None]] = None):
+        """
+        Args:
+            ticket_handler: XSOAR handler (defaults to PROD)
+            send: Callable(room_id, text, markdown) to deliver alerts (defaults to Webex)
+        """
+        self.ticket_handler = ticket_handler or TicketHandler(XsoarEnvironment.PROD)
+        self.send = send or self._send_webex
+        self.timers: Dict[Tuple[str, str], _Timer] = {}  # (ticket id, SLA name) -> timer
+        self._queue: List[Tuple[float, str, str, int, float]] = []  # (fire at, ticket id, SLA, threshold, due)
+        self._last_refresh: Optional[datetime] = None
+        self._last_full_sync = 0.0
+        self._shift_lead: Tuple[Optional[Tuple[str, str]], str] = (None, 'Unknown')
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Ticket table ---
+
+    @staticmethod
+    def _running_timer_clause() -> str:
+        """Matches tickets with at least one running SLA timer that the monitor tracks."""
+        return '(' + ' or '.join(f'{sla.field}.runStatus:running' for sla in SLA_DEFINITIONS) + ')'
+
+    def refresh(self, full: bool = False):
+        """Load open tickets (full) or those modified since the last refresh, and re-arm their timers."""
+        started = datetime.now(timezone.utc)
+        running = self._running_timer_clause()
+        if full or self._last_refresh is None:
+            query = f'-category:job -status:closed type:{CONFIG.team_name} {running}'
+        else:
+            since = self._last_refresh - timedelta(seconds=REFRESH_OVERLAP_SECONDS)
+            # Only picks up new and re-armed timers; stopped ones are dropped by the full
+            # resync, or by the re-check before an alert
+            query = (f"-category:job -status:closed type:{CONFIG.team_name} {running} "
+                     f"modified:>={since.strftime('%Y-%m-%dT%H:%M:%SZ')}")
+
+        tickets = self.ticket_handler.get_tickets(query)
+        if full or self._last_refresh is None:
+            seen = {str(ticket.get('id')) for ticket in tickets}
+            for key in [key for key in self.timers if key[0] not in seen]:
+                del self.timers[key]
+            self._last_full_sync = time.time()
+
+        for ticket in tickets:
+            self._update_ticket(ticket)
+        self._last_refresh = started
+        logger.debug(f"SLA monitor refreshed {len(tickets)} tickets ({'full' if full else 'delta'}), "
+                     f"{len(self.timers)} running timers")
+
+    def _update_ticket(self, ticket: Dict[str, Any]):
+        ticket_id = str(ticket.get('id'))
+        closed = int(ticket.get('status') or 0) == CLOSED_STATUS
+        for sla in SLA_DEFINITIONS:
+            key = (ticket_id, sla.name)
+            timer_data = ticket.get('CustomFields', {}).get(sla.field) or {}
+            running = (not closed and sla.eligible(ticket)
+                       and timer_data.get('runStatus') == 'running' and not timer_data.get('breachTriggered', False))
+            due = parse_due_date(timer_data.get('dueDate')) if running else None
+            if due is None:
+                self.timers.pop(key, None)
+                continue
+
+            timer = self.timers.get(key)
+            if timer is not None and timer.due == due:
+                timer.ticket = ticket  # Keep owner/name current for the alert text
+                continue
+
+            self.timers[key] = _Timer(ticket, due, timer_data.get('dueDate'))
+            due_ts = due.timestamp()
+            for threshold in sla.thresholds:
+                heapq.heappush(self._queue, (due_ts - threshold, ticket_id, sla.name, threshold, due_ts))
+
+    # --- Alerts ---
+
+    def fire_due_alerts(self) -> int:
+        """Alert for every threshold crossed since the last call. Returns the number of tickets reported."""
+        now = time.time()
+        crossed: Dict[str, Dict[str, _Timer]] = {}  # SLA name -> ticket id -> timer
+        while self._queue and self._queue[0][0] <= now:
+            _, ticket_id, sla_name, threshold, due_ts = heapq.heappop(self._queue)
+            timer = self.timers.get((ticket_id, sla_name))
+            # Stale entry: timer stopped, or re-armed with a different due date
+            if timer is None or timer.due.timestamp() != due_ts or threshold in timer.fired:
+                continue
+            timer.fired.add(threshold)
+            if due_ts > now:  # Already past due is a breach, not a risk
+                crossed.setdefault(sla_name, {})[ticket_id] = timer
+
+        if crossed:
+            self._recheck(crossed)
+
+        reported = 0
+        for sla in SLA_DEFINITIONS:
+            timers = crossed.get(sla.name)
+            if timers:
+                self._send_alert(sla, list(timers.values()), now)
+                reported += len(timers)
+        return reported
+
+    def _recheck(self, crossed: Dict[str, Dict[str, _Timer]]):
+        """Re-read crossed tickets and drop the ones whose timer has stopped or moved since the last refresh."""
+        ticket_ids = sorted({ticket_id for timers in crossed.values() for ticket_id in timers})
+        try:
+            tickets = self.ticket_handler.get_tickets('(' + ' or '.join(f'id:{ticket_id}' for ticket_id in ticket_ids) + ')')
+        except Exception as e:
+            logger.warning(f"Could not re-check {len(ticket_ids)} tickets before alerting, using cached timers: {e}")
+            return
+
+        found = set()
+        for ticket in tickets:
+            found.add(str(ticket.get('id')))
+            try:
+                self._update_ticket(ticket)
+            except Exception as e:
+                logger.error(f"Could not re-check ticket {ticket.get('id')}, using its cached timers: {e}", exc_info=True)
+        for key in [key for key in self.timers if key[0] in ticket_ids and key[0] not in found]:
+            del self.timers[key]
+
+        for sla_name, timers in crossed.items():
+            for ticket_id, timer in list(timers.items()):
+                if self.timers.get((ticket_id, sla_name)) is not timer:
+                    del timers[ticket_id]
+
+    def _send_alert(self, sla: SlaDefinition, timers: List[_Timer], now: float):
+        room_id = sla.room_id()
+        if not room_id:
+            logger.warning(f"No Webex room configured for {sla.name} SLA alerts")
+            return
+        lead = self._current_shift_lead() if sla.name == 'response' else ''
+        timers.sort(key=lambda timer: timer.due)
+        try:
+            messages = [
+                sla.build_message(max(int(timer.due.timestamp() - now), 0), timer.ticket, index, timer.due_str, lead)
+                for index, timer in enumerate(timers, start=1)
+            ]
+            self.send(room_id, f"{sla.text} - {len(timers)} tickets", f"{sla.header}\n\n" + "\n\n".join(messages))
+            logger.info(f"Sent {sla.name} SLA risk alert for {len(timers)} tickets")
+        except Exception as e:
+            logger.error(f"Failed to send {sla.name} SLA risk alert: {e}", exc_info=True)
+
+    @staticmethod
+    @retry(
+        stop=stop_after_attempt(3),  # Retry up to 3 times
+        wait=wait_exponential(multiplier=2, min=2, max=10),  # Exponential backoff: 2s, 4s, 8s
+        before_sleep=before_sleep_log(logger, logging.WARNING),
+    )
+    def _send_webex(room_id: str, text: str, markdown: str):
+        response_sla_risk_tickets.webex_api.messages.create(roomId=room_id, text=text, markdown=markdown)
+
+    def _current_shift_lead(self) -> str:
+        """Senior analyst on the current shift, looked up once per shift."""
+        day_name = datetime.now(pytz.timezone('US/Eastern')).strftime('%A')
+        shift = (day_name, get_current_shift())
+        if self._shift_lead[0] != shift:
+            try:
+                staffing_data = get_staffing_data(*shift)
+                senior_analysts = staffing_data.get('senior_analysts') or ['Unknown']
+                self._shift_lead = (shift, senior_analysts[0])
+            except Exception as e:
+                logger.error(f"Could not look up shift lead: {e}")
+                return 'Unknown'
+        return self._shift_lead[1]
+
+    # --- Background loop ---
+
+    def run(self):
+        """Refresh and alert until stop() is called."""
+        next_refresh = 0.0
+        while not self._stop.is_set():
+            now = time.time()
+            if now >= next_refresh:
+                try:
+                    self.refresh(full=now - self._last_full_sync >= FULL_RESYNC_SECONDS)
+                except Exception as e:
+                    logger.error(f"SLA monitor refresh failed: {e}", exc_info=True)
+                next_refresh = now + REFRESH_SECONDS
+
+            try:
+                self.fire_due_alerts()
+            except Exception as e:
+                # Keep the thread alive: response, containment and declaration alerting all run here
+                logger.error(f"SLA monitor alert pass failed: {e}", exc_info=True)
+
+            # Sleep until the next threshold crossing or refresh, whichever comes first
+            wake_at = min(next_refresh, self._queue[0][0]) if self._queue else next_refresh
+            self._stop.wait(max(wake_at - time.time(), 0.05))
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="sla-monitor", daemon=True)
+        self._thread.start()
+        logger.info("SLA risk monitor started")
+
+    def stop(self):
+        self._stop.set()
+
+
+# Global instance
+_sla_monitor = None
+
+
+def start() -> SlaMonitor:
+    """Start the process-wide SLA monitor in the background (no-op if it's running)."""
+    global _sla_monitor
+    if _sla_monitor is None:
+        _sla_monitor = SlaMonitor()
+    _sla_monitor.start()
+    return _sla_monitor
+
+
+if __name__ == "__main__":
+    # One refresh and one alert pass, printing instead of posting to Webex
+    monitor = SlaMonitor(send=lambda room_id, text, markdown: print(markdown))
+    monitor.refresh(full=True)
+    print(f"{len(monitor.timers)} running SLA timers, {monitor.fire_due_alerts()} tickets at risk")
@@ -74,6 +74,14 @@ def cleanup_stale_containments():
 
         logger.info(f"Found {len(hosts_to_remove)} stale containment entry(ies) to clean up")
 
+        # The checks above took a while and the first read may be cached: remove the entries from
+        # fresh copies and save them at those copies' versions, so concurrent changes aren't overwritten
+        fresh = prod_list_handler.read_for_update(contained_hosts_list_name)
+        if fresh is None:
+            logger.warning(f"List '{contained_hosts_list_name}' not found - skipping cleanup")
+            return
+        contained_version, contained_hosts = fresh
+
         # Update the contained hosts list - remove stale entries
         updated_contained_hosts = [
             h for h in contained_hosts
@@ -85,7 +93,7 @@ def cleanup_stale_containments():
         ]
 
         # Update history list for each removed host
-        history_data = prod_list_handler.get_list_data_by_name(history_list_name)
+        history_version, history_data = prod_list_handler.read_for_update(history_list_name) or (None, None)
         if history_data:
             for host in hosts_to_remove:
                 hostname = host.get('hostname')
@@ -102,10 +110,10 @@ def cleanup_stale_containments():
                             logger.info(f"Updated history for host {hostname} (ticket {ticket_id})")
 
             # Save updated history
-            prod_list_handler.save(history_list_name, history_data)
+            prod_list_handler.save(history_list_name, history_data, history_version)
 
         # Save updated contained hosts list
-        prod_list_handler.save(contained_hosts_list_name, updated_contained_hosts)
+        prod_list_handler.save(contained_hosts_list_name, updated_contained_hosts, contained_version)
         logger.info(f"Successfully cleaned up {len(hosts_to_remove)} stale containment entry(ies)")
 
     except Exception as e:
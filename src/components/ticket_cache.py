@@ -8,6 +8,7 @@ import logging
 import os
 import re
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
@@ -19,6 +20,7 @@ from tqdm import tqdm
 
 from my_config import get_config
 from services.xsoar import TicketHandler, XsoarEnvironment
+from src.components.ticket_columns import write_ticket_columns
 
 CONFIG = get_config()
 log = logging.getLogger(__name__)
@@ -43,6 +45,18 @@ TICKET_TIMEOUT = int(os.getenv('TICKET_ENRICHMENT_TIMEOUT', '300'))
 # Note: Enrichment is slow on VMs. Notes are now enriched on-demand at export time instead.
 SKIP_NOTE_ENRICHMENT = os.getenv('SKIP_NOTE_ENRICHMENT', 'true').lower() in ('true', '1', 'yes')
 
+# Incremental sync store: raw tickets keyed by incident id plus a high-water mark on
+# XSOAR's `modified` field. Lives outside secOps/<date>/ so the daily cleanup leaves it alone.
+STORE_PATH = Path(__file__).parent.parent.parent / 'data' / 'transient' / 'ticket_cache' / 'ticket_store.json'
+STORE_VERSION = 1
+
+# Re-fetch a small window before the high-water mark to cover clock skew and
+# incidents that were being written while the previous sync ran
+SYNC_OVERLAP_MINUTES = int(os.getenv('TICKET_SYNC_OVERLAP_MINUTES', '5'))
+
+# Guards generate()/sync() so a slow full rebuild and a delta run never overlap
+_cache_lock = threading.Lock()
+
 # Field mappings for ticket extraction
 SYSTEM_FIELDS = {
     'id': 'id',
@@ -161,6 +175,15 @@ def format_date_display(date_obj: Optional[Union[str, datetime]]) -> str:
     return str(date_obj)
 
 
+def latest_modified(tickets: List[Dict[str, Any]]) -> Optional[datetime]:
+    """Return the newest `modified` timestamp among tickets, or None.
+
+    Uses XSOAR's own clock (not ours) as the incremental sync high-water mark.
+    """
+    modified_times = [parse_date(ticket.get('modified')) for ticket in tickets]
+    return max((m for m in modified_times if m), default=None)
+
+
 def json_serializer(obj: Any) -> str:
     """Serialize datetime objects to ISO format for JSON."""
     if isinstance(obj, datetime):
@@ -194,10 +217,17 @@ class TicketCache:
 
     @classmethod
     def generate(cls, lookback_days: int = 90) -> None:
-        """Run complete ticket caching pipeline."""
+        """Run complete ticket caching pipeline.
+
+        Full refetch of the lookback window. Also re-seeds the incremental sync store,
+        which reconciles incidents deleted in XSOAR (delta queries can't see deletions).
+        """
         log.debug("=" * 80)
         log.debug(f"TicketCache.generate() ENTRY - lookback_days={lookback_days}")
         log.debug("=" * 80)
+        if not _cache_lock.acquire(blocking=False):
+            log.warning("Ticket cache run already in progress - skipping full generation")
+            return
         try:
             log.info(f"Starting ticket cache generation (lookback={lookback_days}d)")
             log.info(f"Configuration: Workers={MAX_WORKERS}, Timeout={TICKET_TIMEOUT}s, "
@@ -232,6 +262,7 @@ class TicketCache:
             log.debug("=" * 60)
             step3_start = time.time()
             instance._save_tickets(raw_tickets, ui_tickets)
+            instance._save_store(instance._new_store(raw_tickets, lookback_days))
             step3_duration = time.time() - step3_start
             log.debug(f"STEP 3/3 Complete: Tickets saved successfully in {step3_duration:.2f}s")
 
@@ -245,10 +276,53 @@ class TicketCache:
             log.debug(f"Exception __dict__: {e.__dict__ if hasattr(e, '__dict__') else 'N/A'}")
             raise
         finally:
+            _cache_lock.release()
             log.debug("=" * 80)
             log.debug("TicketCache.generate() EXIT")
             log.debug("=" * 80)
 
+    @classmethod
+    def sync(cls, lookback_days: int = LOOKBACK_DAYS) -> None:
+        """Incrementally refresh the cache from the persistent store.
+
+        Fetches only incidents modified since the last sync, merges them into the
+        store, ages out anything created before the lookback window, then rewrites
+        the UI/raw cache files. Falls back to a full generate() when there is no
+        usable store yet (first run, or lookback window changed).
+        """
+        if not _cache_lock.acquire(blocking=False):
+            log.warning("Ticket cache run already in progress - skipping incremental sync")
+            return
+
+        try:
+            store = cls._load_store()
+            if store is None or store.get('lookback_days') != lookback_days:
+                log.info("No usable ticket store found - falling back to full generation")
+                needs_full_generation = True
+            else:
+                needs_full_generation = False
+                instance = cls()
+                start = time.time()
+                since = parse_date(store['high_water_mark']) - timedelta(minutes=SYNC_OVERLAP_MINUTES)
+                changed = instance._fetch_changed_tickets(since, lookback_days)
+                stats = instance._merge_into_store(store, changed, lookback_days)
+
+                raw_tickets = list(store['tickets'].values())
+                ui_tickets = instance._process_for_ui(raw_tickets)
+                instance._save_tickets(raw_tickets, ui_tickets)
+                instance._save_store(store)
+                log.info(f"Incremental ticket sync complete in {time.time() - start:.2f}s - "
+                         f"fetched={len(changed)}, added={stats['added']}, updated={stats['updated']}, "
+                         f"removed={stats['removed']}, aged_out={stats['aged_out']}, total={len(raw_tickets)}")
+        except Exception as e:
+            log.error(f"Incremental ticket sync failed: {e}", exc_info=True)
+            raise
+        finally:
+            _cache_lock.release()
+
+        if needs_full_generation:
+            cls.generate(lookback_days)
+
     def _fetch_raw_tickets(self, lookback_days: int) -> List[Ticket]:
         """Fetch tickets from XSOAR and enrich with notes in parallel."""
         log.debug("_fetch_raw_tickets() ENTRY")
@@ -626,10 +700,11 @@ class TicketCache:
         })
 
     def _save_tickets(self, raw_tickets: List[Ticket], ui_tickets: List[Ticket]) -> None:
-        """Save both raw and UI-processed tickets to JSON files.
+        """Save both raw and UI-processed tickets to JSON files, plus a columnar UI snapshot.
 
         Uses atomic writes: saves to temp files first, then renames to final location.
         This prevents corrupting the cache if the process fails mid-write.
+        The columnar .arrow snapshot lets the web dashboard memory-map only the columns it needs.
         """
         log.debug("Starting ticket save operation")
         today = datetime.now(ZoneInfo("America/New_York")).strftime('%m-%d-%Y')
@@ -687,6 +762,19 @@ class TicketCache:
             ui_temp_path.replace(ui_path)
             log.debug(f"UI file renamed successfully. Exists at final path: {ui_path.exists()}")
 
+            # Columnar snapshot of the UI data. Optional: readers fall back to the JSON,
+            # so a failure here only drops the stale snapshot instead of failing the cache run
+            columnar_path = output_dir / 'past_90_days_tickets.arrow'
+            try:
+                write_ticket_columns(ui_tickets, columnar_path, {
+                    'data_generated_at': ui_data['data_generated_at'],
+                    'total_count': str(ui_data['total_count']),
+                })
+                log.info(f"Saved columnar UI snapshot ({columnar_path.stat().st_size:,} bytes)")
+            except Exception as e:
+                log.warning(f"Failed to write columnar UI snapshot: {type(e).__name__}: {e}")
+                columnar_path.unlink(missing_ok=True)
+
             log.info(f"Atomically replaced cache files in {output_dir}")
             log.debug(f"Final files - Raw: {raw_path.stat().st_size:,} bytes, UI: {ui_path.stat().st_size:,} bytes")
 
@@ -706,6 +794,107 @@ class TicketCache:
                 log.debug("Cleaned up temp UI file")
             raise
 
+    # ---------------------------- Incremental Sync Store ----------------------------
+
+    @staticmethod
+    def _load_store() -> Optional[Dict[str, Any]]:
+        """Load the persistent sync store, or None if missing/incompatible."""
+        if not STORE_PATH.exists():
+            return None
+        with open(STORE_PATH, 'r') as f:
+            store = json.load(f)
+        if store.get('version') != STORE_VERSION:
+            log.info(f"Ignoring ticket store with version {store.get('version')} (expected {STORE_VERSION})")
+            return None
+        log.debug(f"Loaded ticket store: {len(store['tickets'])} tickets, high-water mark {store['high_water_mark']}")
+        return store
+
+    @staticmethod
+    def _save_store(store: Dict[str, Any]) -> None:
+        """Atomically write the sync store (temp file + rename, same as _save_tickets)."""
+        STORE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = STORE_PATH.with_suffix('.json.tmp')
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(store, f, default=json_serializer)
+            temp_path.replace(STORE_PATH)
+            log.debug(f"Saved ticket store with {len(store['tickets'])} tickets to {STORE_PATH}")
+        except Exception:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise
+
+    @staticmethod
+    def _new_store(raw_tickets: List[Ticket], lookback_days: int) -> Dict[str, Any]:
+        """Build a fresh sync store from a full fetch."""
+        now = datetime.now(timezone.utc)
+        return {
+            'version': STORE_VERSION,
+            'lookback_days': lookback_days,
+            'high_water_mark': (latest_modified(raw_tickets) or now).isoformat(),
+            'last_full_sync': now.isoformat(),
+            'last_sync': now.isoformat(),
+            'tickets': {str(t['id']): t for t in raw_tickets if t.get('id')},
+        }
+
+    def _fetch_changed_tickets(self, since: datetime, lookback_days: int) -> List[Ticket]:
+        """Fetch incidents modified since the high-water mark, within the lookback window.
+
+        Duplicates are deliberately not excluded in the query, so tickets closed as
+        Duplicate after they were cached come back and get evicted by _merge_into_store().
+        """
+        start_date = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+        query = (
+            f"modified:>={since.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')} "
+            f"created:>={start_date.strftime('%Y-%m-%dT%H:%M:%SZ')} "
+            f"type:{CONFIG.team_name}"
+        )
+        log.debug(f"Delta XSOAR query: {query}")
+
+        raw_tickets = self.ticket_handler.get_tickets(query, paginate=True)
+        tickets = [t for t in raw_tickets or [] if isinstance(t, dict)]
+        log.info(f"Fetched {len(tickets)} changed tickets from XSOAR since {since.isoformat()}")
+
+        if SKIP_NOTE_ENRICHMENT or not tickets:
+            for ticket in tickets:
+                ticket['notes'] = []
+            return tickets
+        return self._enrich_with_notes(tickets)
+
+    @staticmethod
+    def _merge_into_store(store: Dict[str, Any], changed: List[Ticket], lookback_days: int) -> Dict[str, int]:
+        """Upsert changed tickets, drop duplicates, age out tickets older than the lookback window.
+
+        Mutates the store in place (tickets, high-water mark, last_sync) and returns counts.
+        """
+        now = datetime.now(timezone.utc)
+        tickets = store['tickets']
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'aged_out': 0}
+
+        for ticket in changed:
+            ticket_id = str(ticket.get('id', ''))
+            if not ticket_id:
+                continue
+            if ticket.get('closeReason') == 'Duplicate':
+                if tickets.pop(ticket_id, None) is not None:
+                    stats['removed'] += 1
+                continue
+            stats['updated' if ticket_id in tickets else 'added'] += 1
+            tickets[ticket_id] = ticket
+
+        cutoff = now - timedelta(days=lookback_days)
+        expired = [ticket_id for ticket_id, ticket in tickets.items()
+                   if (parse_date(ticket.get('created')) or now) < cutoff]
+        for ticket_id in expired:
+            del tickets[ticket_id]
+        stats['aged_out'] = len(expired)
+
+        previous_mark = parse_date(store['high_water_mark'])
+        store['high_water_mark'] = max(previous_mark, latest_modified(changed) or previous_mark).isoformat()
+        store['last_sync'] = now.isoformat()
+        log.debug(f"Store merge stats: {stats}, new high-water mark {store['high_water_mark']}")
+        return stats
+
 
 # ---------------------------- CLI Entry Point ----------------------------
 
@@ -721,13 +910,17 @@ def main():
     print(f"Page Size: {TicketHandler.DEFAULT_PAGE_SIZE}")
     print(f"Read Timeout: {TicketHandler.READ_TIMEOUT}s")
     print(f"Skip Notes: {SKIP_NOTE_ENRICHMENT}")
+    print(f"Incremental: {os.getenv('TICKET_CACHE_INCREMENTAL', 'false')}")
     if not SKIP_NOTE_ENRICHMENT:
         print(f"Workers: {MAX_WORKERS}")
         print(f"Note Timeout: {TICKET_TIMEOUT}s")
     print(f"{'=' * 60}\n")
 
     log.info("Starting ticket caching process")
-    TicketCache.generate(lookback_days=lookback)
+    if os.getenv('TICKET_CACHE_INCREMENTAL', 'false').lower() in ('true', '1', 'yes'):
+        TicketCache.sync(lookback_days=lookback)
+    else:
+        TicketCache.generate(lookback_days=lookback)
 
     # Display sample tickets
     today = datetime.now(ZoneInfo("America/New_York")).strftime('%m-%d-%Y')
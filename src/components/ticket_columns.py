@@ -0,0 +1,98 @@
+"""Columnar on-disk snapshot of UI-processed tickets.
+
+Written by TicketCache next to past_90_days_tickets.json as an uncompressed Arrow
+IPC (Feather v2) file so readers can memory-map it and rebuild the rows from typed
+columns instead of json.load()-ing the whole pretty-printed file.
+
+Column encoding is chosen per column from the values present:
+- all bool / all int  -> native Arrow bool / int64 (nullable)
+- all str             -> string; dictionary-encoded when values repeat (country, impact, type, ...)
+- anything else       -> JSON text (mixed types such as created='...' vs 0, lists like notes)
+
+JSON-encoded columns are tagged in field metadata and decoded transparently, so
+rows read back compare equal to the dicts that were written.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+from pyarrow import feather
+
+log = logging.getLogger(__name__)
+
+ENCODING_KEY = b'encoding'
+JSON_ENCODING = b'json'
+
+
+def _encode_column(name: str, values: List[Any]) -> Tuple[pa.Field, pa.Array]:
+    """Pick the narrowest faithful Arrow representation for one column."""
+    kinds = {type(v) for v in values if v is not None}
+
+    if kinds <= {bool}:
+        return pa.field(name, pa.bool_()), pa.array(values, type=pa.bool_())
+    if kinds <= {int}:
+        return pa.field(name, pa.int64()), pa.array(values, type=pa.int64())
+    if kinds <= {str}:
+        array = pa.array(values, type=pa.string())
+        if len(set(values)) * 2 <= len(values):
+            array = array.dictionary_encode()
+        return pa.field(name, array.type), array
+
+    encoded = [None if v is None else json.dumps(v, default=str) for v in values]
+    field = pa.field(name, pa.string(), metadata={ENCODING_KEY: JSON_ENCODING})
+    return field, pa.array(encoded, type=pa.string())
+
+
+def write_ticket_columns(tickets: List[Dict[str, Any]], path: Path, metadata: Optional[Dict[str, str]] = None) -> None:
+    """Write tickets as a columnar Arrow file (atomic: temp file + rename).
+
+    Args:
+        tickets: UI-processed ticket dicts (flat, same keys per ticket)
+        path: Destination .arrow file
+        metadata: Optional file-level string metadata (e.g. data_generated_at)
+    """
+    columns: Dict[str, None] = {}
+    for ticket in tickets:
+        for key in ticket:
+            columns.setdefault(key, None)
+
+    fields, arrays = [], []
+    for name in columns:
+        field, array = _encode_column(name, [ticket.get(name) for ticket in tickets])
+        fields.append(field)
+        arrays.append(array)
+
+    schema = pa.schema(fields, metadata={k: str(v) for k, v in (metadata or {}).items()})
+    table = pa.Table.from_arrays(arrays, schema=schema)
+
+    temp_path = path.with_name(path.name + '.tmp')
+    try:
+        # Uncompressed so readers can memory-map the buffers directly
+        feather.write_feather(table, str(temp_path), compression='uncompressed')
+        temp_path.replace(path)
+    except Exception:
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+    log.debug(f"Wrote {len(tickets)} tickets x {len(fields)} columns to {path}")
+
+
+def read_ticket_columns(path: Path) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """Load tickets from the Arrow file.
+
+    Returns:
+        (list of ticket dicts, file-level metadata)
+    """
+    table = feather.read_table(str(path), memory_map=True)
+    rows = table.to_pylist()
+
+    json_columns = [f.name for f in table.schema if (f.metadata or {}).get(ENCODING_KEY) == JSON_ENCODING]
+    for row in rows:
+        for name in json_columns:
+            if row[name] is not None:
+                row[name] = json.loads(row[name])
+
+    metadata = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()}
+    return rows, metadata
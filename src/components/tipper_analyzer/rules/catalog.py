@@ -5,11 +5,13 @@ Follows the same pattern as tipper_indexer.py.
 """
 
 import logging
+from collections import defaultdict
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 
 import chromadb
 
+from src.utils.keyword_index import KeywordIndex, load_keyword_index
 from .models import DetectionRule, RuleSearchResult, RuleCatalogSearchResult
 
 logger = logging.getLogger(__name__)
@@ -18,6 +20,16 @@ logger = logging.getLogger(__name__)
 ROOT_DIRECTORY = Path(__file__).parent.parent.parent.parent
 CHROMA_PATH = ROOT_DIRECTORY / "data" / "transient" / "chroma_rules_catalog"
 COLLECTION_NAME = "detection_rules"
+KEYWORD_INDEX_PATH = CHROMA_PATH / "keyword_index.json"
+
+# Keyword search fields and the score a query term earns for matching each
+KEYWORD_FIELD_WEIGHTS = {
+    "name": 0.4,  # Name match is strongest
+    "malware_families": 0.3,
+    "threat_actors": 0.3,
+    "tags": 0.2,
+    "document": 0.1,
+}
 
 
 class RulesCatalog:
@@ -93,8 +105,34 @@ class RulesCatalog:
                 continue
 
         logger.info(f"Upserted {total_upserted}/{len(rules)} rules into catalog")
+        self.rebuild_keyword_index()
         return total_upserted
 
+    def rebuild_keyword_index(self) -> Optional[KeywordIndex]:
+        """Rebuild the keyword index from the collection and persist it next to the collection."""
+        try:
+            all_docs = self.collection.get(include=["metadatas", "documents"])
+            entries = []
+            for rule_id, metadata, document in zip(all_docs["ids"] or [], all_docs["metadatas"] or [],
+                                                   all_docs["documents"] or []):
+                fields = {field: metadata.get(field, "") for field in KEYWORD_FIELD_WEIGHTS}
+                fields["document"] = document or ""
+                entries.append((rule_id, fields, metadata))
+            index = KeywordIndex.build(tuple(KEYWORD_FIELD_WEIGHTS), entries)
+            index.save(KEYWORD_INDEX_PATH)
+            return index
+        except Exception as e:
+            logger.warning(f"Failed to rebuild rules keyword index: {e}")
+            return None
+
+    def _get_keyword_index(self) -> Optional[KeywordIndex]:
+        """Process-wide keyword index; built from the collection once if it was never saved."""
+        index = load_keyword_index(KEYWORD_INDEX_PATH)
+        if index is None:
+            logger.info("Rules keyword index not found, building it from the collection")
+            index = self.rebuild_keyword_index()
+        return index
+
     def search(self, query: str, k: int = 10, platform: str = None) -> RuleCatalogSearchResult:
         """Search the catalog using hybrid keyword + vector search.
 
@@ -163,57 +201,33 @@ class RulesCatalog:
         )
 
     def _keyword_search(self, query: str, k: int = 20, platform: str = None) -> List[tuple]:
-        """Keyword-based search on rule names and metadata.
+        """Keyword-based search on rule names and metadata, served from the keyword index.
 
-        Returns list of (DetectionRule, score) tuples.
+        Returns list of (DetectionRule, score) tuples. Ties are broken by BM25 over the rule text.
         """
-        matches = []
-        query_lower = query.lower()
-        query_terms = query_lower.split()
-
-        # Get all documents with metadata
-        try:
-            where_filter = {"platform": platform} if platform else None
-            all_docs = self.collection.get(
-                where=where_filter,
-                include=["metadatas", "documents"],
-                limit=self.collection.count(),
-            )
-        except Exception:
+        index = self._get_keyword_index()
+        if not index:
             return []
 
-        if not all_docs or not all_docs.get("ids"):
+        query_terms = query.lower().split()
+
+        # Score based on term matches
+        scores = defaultdict(float)
+        for term in query_terms:
+            for field, weight in KEYWORD_FIELD_WEIGHTS.items():
+                for pos in index.matching(term, field):
+                    scores[pos] += weight
+
+        if platform:
+            scores = {pos: score for pos, score in scores.items() if index.payloads[pos].get("platform") == platform}
+        if not scores:
             return []
 
-        for idx, rule_id in enumerate(all_docs["ids"]):
-            metadata = all_docs["metadatas"][idx]
-            document = (all_docs["documents"][idx] or "").lower()
-            name = metadata.get("name", "").lower()
-            tags = metadata.get("tags", "").lower()
-            malware = metadata.get("malware_families", "").lower()
-            actors = metadata.get("threat_actors", "").lower()
-
-            # Score based on term matches
-            score = 0.0
-            for term in query_terms:
-                if term in name:
-                    score += 0.4  # Name match is strongest
-                if term in malware:
-                    score += 0.3
-                if term in actors:
-                    score += 0.3
-                if term in tags:
-                    score += 0.2
-                if term in document:
-                    score += 0.1
-
-            if score > 0:
-                rule = self._metadata_to_rule(metadata)
-                matches.append((rule, min(score, 1.0)))
+        bm25 = index.bm25(query_terms, "document")
+        ranked = sorted(scores, key=lambda pos: (min(scores[pos], 1.0), bm25.get(pos, 0.0)), reverse=True)
 
         # Sort by score and return top k
-        matches.sort(key=lambda x: x[1], reverse=True)
-        return matches[:k]
+        return [(self._metadata_to_rule(index.payloads[pos]), min(scores[pos], 1.0)) for pos in ranked[:k]]
 
     def _metadata_to_rule(self, metadata: Dict[str, Any]) -> DetectionRule:
         """Convert ChromaDB metadata dict back to a DetectionRule."""
@@ -11,38 +11,73 @@ Usage:
     # Sync new tippers (adds only missing ones)
     python -m src.components.tipper_indexer
 
-    # Full rebuild (deletes and recreates collection)
+    # Full rebuild (replaces the collection once every tipper is indexed)
     python -m src.components.tipper_indexer rebuild
 
     # Search for similar tippers
     python -m src.components.tipper_indexer search "APT group using Cobalt Strike"
 """
 
+import copy
+import hashlib
 import logging
 import re
+import threading
 import time
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
 
 import chromadb
-import requests
 
 import services.azdo as azdo
 from data.data_maps import azdo_area_paths
+from src.utils.embedding_service import get_embedding_service
+from src.utils.keyword_index import KeywordIndex, load_keyword_index
 
 logger = logging.getLogger(__name__)
 
 # Paths
 ROOT_DIRECTORY = Path(__file__).parent.parent.parent
 CHROMA_PATH = ROOT_DIRECTORY / "data" / "transient" / "chroma_tipper_index"
-
-# Collection name
-COLLECTION_NAME = "threat_tippers"
+KEYWORD_INDEX_PATH = CHROMA_PATH / "keyword_index.json"
+
+# Collection name. Versioned by how its vectors are produced: /api/embed returns unit-normalized
+# vectors compared by cosine distance, which can't share a collection (or an L2 space) with the
+# vectors the old /api/embeddings endpoint wrote. Bump the suffix when EMBEDDING_ENDPOINT changes.
+COLLECTION_NAME = "threat_tippers_v2"
+LEGACY_COLLECTION_NAMES = ("threat_tippers",)
+# Full rebuilds are written here and only renamed to COLLECTION_NAME once every chunk succeeded
+STAGING_COLLECTION_NAME = f"{COLLECTION_NAME}_rebuild"
+EMBEDDING_ENDPOINT = "/api/embed"
+COLLECTION_METADATA = {
+    "description": "Threat tipper embeddings for similarity search",
+    "embedding_endpoint": EMBEDDING_ENDPOINT,
+    "hnsw:space": "cosine",
+}
+
+# Indexing pipeline: tippers are fetched, embedded and written in chunks of this size
+INDEX_CHUNK_SIZE = 50
+# Chunks embedded concurrently; at most twice this many chunks are held in memory
+EMBED_WORKERS = 4
+
+# Metadata fields covered by keyword search
+KEYWORD_FIELDS = ('title', 'tags')
+
+# Hybrid search: reciprocal rank fusion constant and the similar-tipper result cache
+RRF_K = 60
+SEARCH_CACHE_TTL_SECONDS = 30 * 60
+SEARCH_CACHE_SIZE = 256
+
+# (query hash, k, index version) -> (expires_at, results); shared by every TipperIndexer in the process
+_search_cache: OrderedDict = OrderedDict()
+_search_cache_lock = threading.Lock()
 
 
 class OllamaEmbeddingFunction:
-    """Custom embedding function using Ollama API."""
+    """Embedding function backed by the shared, cached Ollama embedding service."""
 
     def __init__(self, model: str = None):
         # Use config if no model specified
@@ -51,34 +86,10 @@ class OllamaEmbeddingFunction:
             config = get_config()
             model = config.ollama_embedding_model or "all-minilm:l6-v2"
         self.model = model
-        self.api_url = "http://localhost:11434/api/embeddings"
 
     def __call__(self, input: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts."""
-        embeddings = []
-        for text in input:
-            embedding = self._embed_single(text)
-            embeddings.append(embedding)
-        return embeddings
-
-    def _embed_single(self, text: str, max_retries: int = 3) -> List[float]:
-        """Generate embedding for a single text."""
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(
-                    self.api_url,
-                    json={"model": self.model, "prompt": text},
-                    timeout=60
-                )
-                response.raise_for_status()
-                result = response.json()
-                return result["embedding"]
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logger.warning(f"Embedding failed (attempt {attempt + 1}): {e}")
-                    time.sleep(2)
-                else:
-                    raise RuntimeError(f"Failed to embed text: {e}")
+        """Generate embeddings for a list of texts, reusing cached ones."""
+        return get_embedding_service().embed(self.model, input)
 
 
 class TipperIndexer:
@@ -89,6 +100,7 @@ class TipperIndexer:
         self._client: Optional[chromadb.PersistentClient] = None
         self._collection = None
         self._embedding_fn = OllamaEmbeddingFunction()
+        self.last_index_run: Optional[dict] = None
 
     @property
     def client(self) -> chromadb.PersistentClient:
@@ -103,26 +115,31 @@ class TipperIndexer:
         if self._collection is None:
             self._collection = self.client.get_or_create_collection(
                 name=COLLECTION_NAME,
-                metadata={"description": "Threat tipper embeddings for similarity search"}
+                metadata=COLLECTION_METADATA
             )
         return self._collection
 
+    def _needs_rebuild(self) -> bool:
+        """True if the collection is empty or was built from a different embedding endpoint."""
+        metadata = self.collection.metadata or {}
+        if metadata.get("embedding_endpoint") != EMBEDDING_ENDPOINT:
+            logger.info(f"Collection {COLLECTION_NAME} was built with {metadata.get('embedding_endpoint')}, "
+                        f"not {EMBEDDING_ENDPOINT}")
+            return True
+        return self.collection.count() == 0
+
+    def _delete_legacy_collections(self):
+        """Drop collections left behind by earlier embedding versions."""
+        for name in LEGACY_COLLECTION_NAMES:
+            self._delete_collection(name)
+
     # -------------------------------------------------------------------------
     # Fetch tippers from AZDO
     # -------------------------------------------------------------------------
-    def fetch_historical_tippers(self, days_back: int = 365) -> List[dict]:
-        """
-        Fetch ALL tippers from AZDO for the specified time period.
-
-        Args:
-            days_back: How far back to fetch (default 1 year)
-
-        Returns:
-            List of tipper work items from AZDO
-        """
+    def _tipper_query(self, days_back: int) -> str:
         area_path = azdo_area_paths.get('threat_hunting', 'Detection-Engineering\\DE Rules\\Threat Hunting')
 
-        query = f"""
+        return f"""
             SELECT [System.Id], [System.Title], [System.Description],
                    [System.CreatedDate], [System.Tags], [System.State],
                    [Microsoft.VSTS.Common.ClosedDate]
@@ -132,8 +149,30 @@ class TipperIndexer:
             ORDER BY [System.CreatedDate] DESC
         """
 
+    def iter_historical_tipper_pages(self, days_back: int = 365) -> Iterator[List[dict]]:
+        """
+        Yield tippers from AZDO for the specified time period, one page at a time.
+
+        Args:
+            days_back: How far back to fetch (default 1 year)
+
+        Yields:
+            Lists of up to INDEX_CHUNK_SIZE tipper work items
+        """
         logger.info(f"Fetching tippers from last {days_back} days...")
-        work_items = azdo.fetch_work_items(query)
+        yield from azdo.iter_work_item_pages(self._tipper_query(days_back), page_size=INDEX_CHUNK_SIZE)
+
+    def fetch_historical_tippers(self, days_back: int = 365) -> List[dict]:
+        """
+        Fetch ALL tippers from AZDO for the specified time period.
+
+        Args:
+            days_back: How far back to fetch (default 1 year)
+
+        Returns:
+            List of tipper work items from AZDO
+        """
+        work_items = [tipper for page in self.iter_historical_tipper_pages(days_back) for tipper in page]
 
         if not work_items:
             logger.warning("No tippers found matching query")
@@ -181,6 +220,101 @@ class TipperIndexer:
             'url': tipper.get('url', '') or '',
         }
 
+    # -------------------------------------------------------------------------
+    # Indexing pipeline (fetch -> extract -> embed -> write, in chunks)
+    # -------------------------------------------------------------------------
+    def _prepare_tippers(self, tippers: List[dict]) -> tuple:
+        """Extract ids, documents and metadata for a chunk of tippers, skipping ones that fail."""
+        ids = []
+        documents = []
+        metadatas = []
+
+        for tipper in tippers:
+            tipper_id = str(tipper.get('id', ''))
+            if not tipper_id:
+                continue
+
+            try:
+                text = self.extract_tipper_text(tipper)
+                metadata = self.prepare_tipper_metadata(tipper)
+
+                ids.append(tipper_id)
+                documents.append(text)
+                metadatas.append(metadata)
+
+            except Exception as e:
+                logger.error(f"Failed to process tipper {tipper_id}: {e}")
+                continue
+
+        return ids, documents, metadatas
+
+    def _index_tipper_pages(self, pages: Iterable[List[dict]], write: Callable,
+                            skip_ids: Optional[Set[str]] = None) -> dict:
+        """
+        Embed and write tippers page by page.
+
+        Chunks are embedded by a pool of EMBED_WORKERS threads while the next pages
+        are fetched. Once 2 * EMBED_WORKERS chunks are in flight, fetching waits for
+        the oldest chunk to be written, so memory stays bounded regardless of how
+        many tippers the query returns. Chunks are written in fetch order.
+
+        Args:
+            pages: Iterable of tipper pages (e.g. iter_historical_tipper_pages())
+            write: Collection method to write with (collection.add or collection.upsert)
+            skip_ids: Tipper IDs to leave out (already indexed)
+
+        Returns:
+            Run stats: fetched, indexed, failed, seconds, docs_per_sec
+        """
+        start_time = time.time()
+        fetched = indexed = failed = 0
+        in_flight = deque()
+
+        def write_oldest():
+            nonlocal indexed, failed
+            ids, documents, metadatas, future = in_flight.popleft()
+            try:
+                write(ids=ids, documents=documents, metadatas=metadatas, embeddings=future.result())
+                indexed += len(ids)
+                elapsed = time.time() - start_time
+                logger.info(f"Indexed {indexed} tippers ({indexed / elapsed:.1f} docs/sec)")
+            except Exception as e:
+                failed += len(ids)
+                logger.error(f"Failed to embed/write {len(ids)} tippers ({ids[0]}..{ids[-1]}): {e}", exc_info=True)
+
+        with ThreadPoolExecutor(max_workers=EMBED_WORKERS) as executor:
+            for page in pages:
+                fetched += len(page)
+                if skip_ids:
+                    page = [tipper for tipper in page if str(tipper.get('id', '')) not in skip_ids]
+
+                for i in range(0, len(page), INDEX_CHUNK_SIZE):
+                    ids, documents, metadatas = self._prepare_tippers(page[i:i + INDEX_CHUNK_SIZE])
+                    if not ids:
+                        continue
+                    # Backpressure: don't fetch further ahead than the embedders can keep up with
+                    while len(in_flight) >= EMBED_WORKERS * 2:
+                        write_oldest()
+                    in_flight.append((ids, documents, metadatas, executor.submit(self._embedding_fn, documents)))
+
+            while in_flight:
+                write_oldest()
+
+        elapsed = time.time() - start_time
+        stats = {
+            'fetched': fetched,
+            'indexed': indexed,
+            'failed': failed,
+            'seconds': round(elapsed, 1),
+            'docs_per_sec': round(indexed / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+        self.last_index_run = stats
+        logger.info(
+            f"Fetched {fetched} tippers, indexed {indexed}, failed {failed} "
+            f"in {stats['seconds']}s ({stats['docs_per_sec']} docs/sec)"
+        )
+        return stats
+
     # -------------------------------------------------------------------------
     # Sync tippers (upsert new ones only)
     # -------------------------------------------------------------------------
@@ -189,7 +323,10 @@ class TipperIndexer:
         Sync tippers from AZDO to ChromaDB.
 
         Only upserts tippers that are new or updated. Much faster than
-        a full rebuild since we skip existing tippers.
+        a full rebuild since we skip existing tippers. Falls back to a full
+        rebuild (rebuild_index defaults) when the collection is empty or its
+        vectors came from a different embedding endpoint, so a short
+        days_back never leaves the index half-populated.
 
         Args:
             days_back: How far back to fetch from AZDO
@@ -201,91 +338,59 @@ class TipperIndexer:
         logger.info("TIPPER SYNC STARTING")
         logger.info("=" * 60)
 
-        # Fetch tippers from AZDO
-        tippers = self.fetch_historical_tippers(days_back)
-        if not tippers:
-            logger.warning("No tippers to sync")
-            return 0
+        try:
+            needs_rebuild = self._needs_rebuild()
+        except Exception as e:
+            logger.warning(f"Could not check collection state: {e}")
+            needs_rebuild = False
+        if needs_rebuild:
+            logger.info("Tipper collection needs a full rebuild")
+            return self.last_index_run['indexed'] if self.rebuild_index() else 0
 
         # Get existing IDs in ChromaDB
         existing_ids = set()
         try:
-            # Get all existing IDs (ChromaDB returns all if no filter)
-            result = self.collection.get()
+            # IDs only - no need to pull documents or embeddings back
+            result = self.collection.get(include=[])
             existing_ids = set(result['ids']) if result['ids'] else set()
             logger.info(f"ChromaDB has {len(existing_ids)} existing tippers")
         except Exception as e:
             logger.warning(f"Could not get existing IDs: {e}")
 
-        # Find new tippers
-        new_tippers = []
-        for tipper in tippers:
-            tipper_id = str(tipper.get('id', ''))
-            if tipper_id and tipper_id not in existing_ids:
-                new_tippers.append(tipper)
-
-        if not new_tippers:
-            logger.info("No new tippers to add")
-            logger.info("=" * 60)
-            return 0
-
-        logger.info(f"Found {len(new_tippers)} new tippers to add")
-
-        # Process and upsert new tippers
-        ids = []
-        documents = []
-        metadatas = []
-
-        for i, tipper in enumerate(new_tippers):
-            tipper_id = str(tipper.get('id', ''))
-
-            if (i + 1) % 20 == 0 or i == 0:
-                logger.info(f"Processing tipper {i + 1}/{len(new_tippers)}...")
-
-            try:
-                text = self.extract_tipper_text(tipper)
-                metadata = self.prepare_tipper_metadata(tipper)
-
-                ids.append(tipper_id)
-                documents.append(text)
-                metadatas.append(metadata)
+        stats = self._index_tipper_pages(
+            self.iter_historical_tipper_pages(days_back),
+            write=self.collection.upsert,
+            skip_ids=existing_ids
+        )
 
-            except Exception as e:
-                logger.error(f"Failed to process tipper {tipper_id}: {e}")
-                continue
+        if stats['indexed'] or load_keyword_index(KEYWORD_INDEX_PATH) is None:
+            self.rebuild_keyword_index()
 
-        if not ids:
-            logger.warning("No tippers processed successfully")
+        if not stats['fetched']:
+            logger.warning("No tippers to sync")
             return 0
 
-        # Upsert to ChromaDB (generates embeddings automatically)
-        logger.info(f"Upserting {len(ids)} tippers to ChromaDB...")
-        try:
-            # Generate embeddings
-            embeddings = self._embedding_fn(documents)
-
-            self.collection.upsert(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas,
-                embeddings=embeddings
-            )
-            logger.info(f"Successfully added {len(ids)} tippers")
-            logger.info("=" * 60)
-            logger.info("TIPPER SYNC COMPLETED")
+        if not stats['indexed'] and not stats['failed']:
+            logger.info("No new tippers to add")
             logger.info("=" * 60)
-            return len(ids)
-
-        except Exception as e:
-            logger.error(f"Failed to upsert tippers: {e}", exc_info=True)
             return 0
 
+        logger.info(f"Successfully added {stats['indexed']} tippers")
+        logger.info("=" * 60)
+        logger.info("TIPPER SYNC COMPLETED")
+        logger.info("=" * 60)
+        return stats['indexed']
+
     # -------------------------------------------------------------------------
-    # Full rebuild (delete and recreate)
+    # Full rebuild (build into a staging collection, then swap it in)
     # -------------------------------------------------------------------------
     def rebuild_index(self, days_back: int = 365) -> bool:
         """
-        Full rebuild: Delete collection and recreate from scratch.
+        Full rebuild: Recreate the collection from scratch.
+
+        Tippers are indexed into a staging collection that replaces the live one
+        only if every chunk was written; otherwise the staging collection is
+        dropped and the live index is left untouched.
 
         Use this only when needed (schema change, corruption, etc.).
         Normal operation should use sync_tippers().
@@ -300,71 +405,70 @@ class TipperIndexer:
         logger.info("FULL INDEX REBUILD STARTING")
         logger.info("=" * 60)
 
-        # Delete existing collection
-        try:
-            self.client.delete_collection(COLLECTION_NAME)
-            self._collection = None  # Reset cached collection
-            logger.info(f"Deleted existing collection: {COLLECTION_NAME}")
-        except Exception as e:
-            logger.warning(f"Could not delete collection (may not exist): {e}")
+        # Clear out a staging collection left by an interrupted rebuild
+        self._delete_collection(STAGING_COLLECTION_NAME)
+        staging = self.client.create_collection(name=STAGING_COLLECTION_NAME, metadata=COLLECTION_METADATA)
+
+        stats = self._index_tipper_pages(
+            self.iter_historical_tipper_pages(days_back),
+            write=staging.add
+        )
 
-        # Fetch all tippers
-        tippers = self.fetch_historical_tippers(days_back)
-        if not tippers:
+        if not stats['fetched']:
             logger.error("No tippers to index")
+            self._delete_collection(STAGING_COLLECTION_NAME)
             return False
 
-        logger.info(f"Processing {len(tippers)} tippers for indexing...")
-
-        # Prepare data
-        ids = []
-        documents = []
-        metadatas = []
-
-        for i, tipper in enumerate(tippers):
-            tipper_id = str(tipper.get('id', ''))
-
-            if (i + 1) % 50 == 0 or i == 0:
-                logger.info(f"Processing tipper {i + 1}/{len(tippers)}...")
-
-            try:
-                text = self.extract_tipper_text(tipper)
-                metadata = self.prepare_tipper_metadata(tipper)
-
-                ids.append(tipper_id)
-                documents.append(text)
-                metadatas.append(metadata)
+        if stats['failed'] or not stats['indexed']:
+            logger.error(f"Failed to create index: {stats['failed']} of {stats['fetched']} tippers not indexed, "
+                         f"keeping the existing collection")
+            self._delete_collection(STAGING_COLLECTION_NAME)
+            return False
 
-            except Exception as e:
-                logger.error(f"Failed to process tipper {tipper_id}: {e}")
-                continue
+        # Swap the complete staging collection in
+        self._delete_collection(COLLECTION_NAME)
+        staging.modify(name=COLLECTION_NAME)
+        self._collection = None  # Reset cached collection
+        self._delete_legacy_collections()
+        self.rebuild_keyword_index()
 
-        if not ids:
-            logger.error("No tippers processed successfully")
-            return False
+        logger.info(f"Indexed {stats['indexed']} tippers successfully")
+        logger.info("=" * 60)
+        logger.info("FULL INDEX REBUILD COMPLETED")
+        logger.info("=" * 60)
+        return True
 
-        # Add to ChromaDB
-        logger.info(f"Adding {len(ids)} tippers to ChromaDB...")
+    def _delete_collection(self, name: str):
+        """Delete a collection if it exists."""
         try:
-            # Generate embeddings
-            embeddings = self._embedding_fn(documents)
-
-            self.collection.add(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas,
-                embeddings=embeddings
-            )
-
-            logger.info(f"Indexed {len(ids)} tippers successfully")
-            logger.info("=" * 60)
-            logger.info("FULL INDEX REBUILD COMPLETED")
-            logger.info("=" * 60)
-            return True
+            self.client.delete_collection(name)
+            logger.info(f"Deleted collection: {name}")
+        except Exception:
+            pass  # Doesn't exist
 
+    # -------------------------------------------------------------------------
+    # Keyword index (built at sync time, persisted next to the collection)
+    # -------------------------------------------------------------------------
+    def rebuild_keyword_index(self) -> Optional[KeywordIndex]:
+        """Rebuild the keyword index from the collection's metadata and persist it."""
+        try:
+            result = self.collection.get(include=['metadatas'])
+            index = KeywordIndex.build(KEYWORD_FIELDS, (
+                (doc_id, meta, meta) for doc_id, meta in zip(result['ids'] or [], result['metadatas'] or [])
+            ))
+            index.save(KEYWORD_INDEX_PATH)
+            return index
         except Exception as e:
-            logger.error(f"Failed to create index: {e}", exc_info=True)
-            return False
+            logger.warning(f"Could not rebuild keyword index: {e}")
+            return None
+
+    def _get_keyword_index(self) -> Optional[KeywordIndex]:
+        """Process-wide keyword index; built from the collection once if it was never saved."""
+        index = load_keyword_index(KEYWORD_INDEX_PATH)
+        if index is None:
+            logger.info("Keyword index not found, building it from the collection")
+            index = self.rebuild_keyword_index()
+        return index
 
     # -------------------------------------------------------------------------
     # Keyword search through metadata
@@ -373,7 +477,8 @@ class TipperIndexer:
         """
         Search for tippers containing keywords from query text.
 
-        Extracts important terms and searches title, tags in metadata.
+        Extracts important terms and looks them up in the title/tags keyword
+        index. Ranked by number of matched keywords, then BM25.
         """
         # Common words to ignore
         STOP_WORDS = {
@@ -407,42 +512,106 @@ class TipperIndexer:
 
         logger.debug(f"Keyword search for: {keywords}")
 
-        # Get all documents from ChromaDB for keyword search
+        index = self._get_keyword_index()
+        if not index:
+            return []
+
+        matched_keywords = defaultdict(list)
+        for kw in keywords:
+            docs = set()
+            for field in KEYWORD_FIELDS:
+                docs.update(index.matching(kw, field))
+            for pos in docs:
+                matched_keywords[pos].append(kw)
+
+        if not matched_keywords:
+            return []
+
+        bm25 = defaultdict(float)
+        for field in KEYWORD_FIELDS:
+            for pos, score in index.bm25(keywords, field).items():
+                bm25[pos] += score
+
+        ranked = sorted(matched_keywords, key=lambda pos: (len(matched_keywords[pos]), bm25[pos]), reverse=True)
+
+        matches = []
+        for pos in ranked[:k]:
+            match_count = len(matched_keywords[pos])
+            matches.append({
+                'metadata': index.payloads[pos],
+                'keyword_matches': match_count,
+                'matched_keywords': matched_keywords[pos],
+                'similarity_score': 0.9 + (0.01 * match_count),
+                'distance': 0.0,
+                'matched_content': f"Keyword match: {', '.join(matched_keywords[pos])}"
+            })
+        return matches
+
+    # -------------------------------------------------------------------------
+    # Vector similarity search
+    # -------------------------------------------------------------------------
+    def _vector_search(self, query_text: str, k: int = 10) -> List[dict]:
+        """Nearest tippers by embedding distance."""
         try:
-            result = self.collection.get(include=['metadatas'])
-            if not result['ids']:
-                return []
-
-            matches = []
-            for i, meta in enumerate(result['metadatas']):
-                title = meta.get('title', '').lower()
-                tags = meta.get('tags', '').lower()
-
-                match_count = 0
-                matched_keywords = []
-                for kw in keywords:
-                    kw_lower = kw.lower()
-                    if kw_lower in title or kw_lower in tags:
-                        match_count += 1
-                        matched_keywords.append(kw)
-
-                if match_count > 0:
-                    matches.append({
-                        'metadata': meta,
-                        'keyword_matches': match_count,
-                        'matched_keywords': matched_keywords,
-                        'similarity_score': 0.9 + (0.01 * match_count),
-                        'distance': 0.0,
-                        'matched_content': f"Keyword match: {', '.join(matched_keywords)}"
-                    })
+            # Generate query embedding
+            query_embedding = self._embedding_fn([query_text])[0]
 
-            matches.sort(key=lambda x: x['keyword_matches'], reverse=True)
-            return matches[:k]
+            results = self.collection.query(
+                query_embeddings=[query_embedding],
+                n_results=k,
+                include=['metadatas', 'documents', 'distances']
+            )
+
+            vector_results = []
+            if results['ids'] and results['ids'][0]:
+                for i, doc_id in enumerate(results['ids'][0]):
+                    distance = results['distances'][0][i] if results['distances'] else 0
+                    # Cosine distance (0 = same direction) to cosine similarity
+                    similarity = max(0.0, 1 - distance)
+
+                    vector_results.append({
+                        'metadata': results['metadatas'][0][i],
+                        'similarity_score': round(similarity, 3),
+                        'distance': round(distance, 3),
+                        'matched_content': results['documents'][0][i][:500] if results['documents'] else ""
+                    })
+            return vector_results
 
         except Exception as e:
-            logger.warning(f"Keyword search failed: {e}")
+            logger.warning(f"Vector search failed: {e}")
             return []
 
+    @staticmethod
+    def _fuse_results(ranked_lists: List[List[dict]], k: int) -> List[dict]:
+        """
+        Reciprocal rank fusion: each list contributes 1 / (RRF_K + rank) per tipper.
+
+        A tipper found by both legs keeps its keyword result (matched keywords and
+        keyword similarity), with the fused score added as 'rrf_score'.
+        """
+        scores = defaultdict(float)
+        best = {}
+        for results in ranked_lists:
+            for rank, result in enumerate(results, start=1):
+                tid = result['metadata'].get('id')
+                scores[tid] += 1 / (RRF_K + rank)
+                best.setdefault(tid, result)
+
+        fused = sorted(scores, key=scores.get, reverse=True)[:k]
+        return [{**best[tid], 'rrf_score': round(scores[tid], 5)} for tid in fused]
+
+    def _index_version(self) -> Optional[str]:
+        """Changes whenever a sync or rebuild writes the index; None if it can't be determined.
+
+        Every sync that writes tippers and every rebuild rewrites the keyword index,
+        so its mtime versions the whole index without touching the collection.
+        """
+        self._get_keyword_index()  # Make sure a missing keyword index is built before it's versioned
+        try:
+            return str(KEYWORD_INDEX_PATH.stat().st_mtime_ns)
+        except OSError:
+            return None
+
     # -------------------------------------------------------------------------
     # Search for similar tippers (HYBRID: keyword + vector)
     # -------------------------------------------------------------------------
@@ -450,10 +619,14 @@ class TipperIndexer:
         """
         Find tippers similar to the given text using hybrid search.
 
-        Combines:
+        Runs concurrently and fuses with reciprocal rank fusion:
         1. Keyword matching (exact term matches in title/tags)
         2. Vector similarity (semantic similarity via embeddings)
 
+        Results are cached per (query, k, index version) for SEARCH_CACHE_TTL_SECONDS,
+        so re-analysing a tipper doesn't embed or query anything (not even the
+        collection count). Callers get their own copies of cached results.
+
         Args:
             query_text: Text to search for (new tipper title/description)
             k: Number of similar tippers to return
@@ -461,6 +634,17 @@ class TipperIndexer:
         Returns:
             List of similar tipper metadata with similarity scores
         """
+        version = self._index_version()
+        cache_key = (hashlib.sha256(query_text.encode('utf-8')).hexdigest(), k, version) if version else None
+        now = time.time()
+        if cache_key:
+            with _search_cache_lock:
+                cached = _search_cache.get(cache_key)
+                if cached is not None and cached[0] > now:
+                    _search_cache.move_to_end(cache_key)
+                    logger.debug("Similar tipper results served from cache")
+                    return copy.deepcopy(cached[1])
+
         # Check if collection has data
         try:
             count = self.collection.count()
@@ -470,56 +654,26 @@ class TipperIndexer:
         except Exception as e:
             raise RuntimeError(f"Could not access tipper index: {e}")
 
-        # 1. Keyword search
-        keyword_results = self._keyword_search(query_text, k=k * 2)
-        logger.debug(f"Keyword search found {len(keyword_results)} matches")
-
-        # 2. Vector similarity search
-        try:
-            # Generate query embedding
-            query_embedding = self._embedding_fn([query_text])[0]
-
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=k * 2,
-                include=['metadatas', 'documents', 'distances']
-            )
-
-            vector_results = []
-            if results['ids'] and results['ids'][0]:
-                for i, doc_id in enumerate(results['ids'][0]):
-                    distance = results['distances'][0][i] if results['distances'] else 0
-                    # Convert L2 distance to similarity (lower distance = more similar)
-                    similarity = 1 / (1 + distance)
-
-                    vector_results.append({
-                        'metadata': results['metadatas'][0][i],
-                        'similarity_score': round(similarity, 3),
-                        'distance': round(distance, 3),
-                        'matched_content': results['documents'][0][i][:500] if results['documents'] else ""
-                    })
-
-        except Exception as e:
-            logger.warning(f"Vector search failed: {e}")
-            vector_results = []
-
-        # 3. Merge results: keyword matches first, then vector matches
-        seen_ids = set()
-        merged_results = []
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            keyword_future = executor.submit(self._keyword_search, query_text, k * 2)
+            vector_future = executor.submit(self._vector_search, query_text, k * 2)
+            keyword_results = keyword_future.result()
+            vector_results = vector_future.result()
+        logger.debug(f"Keyword search found {len(keyword_results)} matches, vector search {len(vector_results)}")
 
-        for result in keyword_results:
-            tid = result['metadata'].get('id')
-            if tid not in seen_ids:
-                seen_ids.add(tid)
-                merged_results.append(result)
+        merged_results = self._fuse_results([keyword_results, vector_results], k)
 
-        for result in vector_results:
-            tid = result['metadata'].get('id')
-            if tid not in seen_ids:
-                seen_ids.add(tid)
-                merged_results.append(result)
+        # Don't pin a degraded result (e.g. Ollama down) for the whole TTL
+        if vector_results and cache_key:
+            with _search_cache_lock:
+                _search_cache[cache_key] = (now + SEARCH_CACHE_TTL_SECONDS, copy.deepcopy(merged_results))
+                _search_cache.move_to_end(cache_key)
+                for key in [key for key, (expires_at, _) in _search_cache.items() if expires_at <= now]:
+                    del _search_cache[key]
+                while len(_search_cache) > SEARCH_CACHE_SIZE:
+                    _search_cache.popitem(last=False)
 
-        return merged_results[:k]
+        return merged_results
 
     # -------------------------------------------------------------------------
     # Index stats
@@ -532,7 +686,8 @@ class TipperIndexer:
                 'status': 'available',
                 'tipper_count': count,
                 'storage_path': self.chroma_path,
-                'collection_name': COLLECTION_NAME
+                'collection_name': COLLECTION_NAME,
+                **({'last_index_run': self.last_index_run} if self.last_index_run else {})
             }
         except Exception as e:
             return {'status': 'error', 'error': str(e)}
@@ -546,17 +701,20 @@ def sync_tipper_index(days_back: int = 365) -> int:
     indexer = TipperIndexer()
     added = indexer.sync_tippers(days_back=days_back)
     print(f"Sync complete: {added} new tippers added")
+    if indexer.last_index_run and added:
+        print(f"Throughput: {indexer.last_index_run['docs_per_sec']} docs/sec")
     return added
 
 
 def rebuild_tipper_index(days_back: int = 365) -> bool:
-    """Entry point for full rebuild (deletes and recreates)."""
+    """Entry point for full rebuild (replaces the collection on success)."""
     indexer = TipperIndexer()
     success = indexer.rebuild_index(days_back=days_back)
 
     if success:
         stats = indexer.get_index_stats()
         print(f"Index rebuilt: {stats.get('tipper_count', 0)} tippers")
+        print(f"Throughput: {indexer.last_index_run['docs_per_sec']} docs/sec")
     else:
         print("Failed to rebuild tipper index")
 
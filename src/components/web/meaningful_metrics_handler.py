@@ -1,12 +1,10 @@
 """Meaningful Metrics Handler for Web Dashboard."""
 
-import json
 import logging
 import tempfile
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, Any, List
 
 import pandas as pd
@@ -15,11 +13,19 @@ from openpyxl import load_workbook
 from openpyxl.styles import Font
 
 from services.xsoar import TicketHandler, XsoarEnvironment
+from src.components.web.metrics_filter_engine import passes_sla_and_age_filters
+from src.components.web.metrics_ticket_store import get_ticket_store
 from src.config import XsoarConfig
 from src.utils.excel_formatting import apply_professional_formatting
 
 logger = logging.getLogger(__name__)
 
+# Map column IDs to actual data field paths (matches JavaScript availableColumns)
+EXPORT_COLUMN_PATHS = {
+    'timetorespond': 'time_to_respond_secs',
+    'timetocontain': 'time_to_contain_secs',
+}
+
 
 def get_meaningful_metrics_data(base_dir: str, eastern: pytz.tzinfo.BaseTzInfo) -> Dict[str, Any]:
     """Get cached security incident data for dashboard.
@@ -35,36 +41,77 @@ def get_meaningful_metrics_data(base_dir: str, eastern: pytz.tzinfo.BaseTzInfo)
         FileNotFoundError: If cache file not found
     """
     logger.info("Loading meaningful metrics data from cache")
+    tickets = get_ticket_store().get(base_dir, eastern)
+    return {
+        'success': True,
+        'data': tickets.incidents,
+        'total_count': tickets.total_count,
+        'data_generated_at': tickets.data_generated_at
+    }
+
+
+def get_filtered_meaningful_metrics_data(base_dir: str, eastern: pytz.tzinfo.BaseTzInfo,
+                                         filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Get cached incidents with dashboard filters applied server-side.
+
+    Args:
+        base_dir: Base directory of the web application
+        eastern: Pytz timezone object for US/Eastern
+        filters: Dictionary of filter criteria (same payload as the export endpoints)
 
-    today_date = datetime.now(eastern).strftime('%m-%d-%Y')
-    root_directory = Path(base_dir).parent
-    cache_file = root_directory / 'data' / 'transient' / 'secOps' / today_date / 'past_90_days_tickets.json'
+    Returns:
+        Dictionary with success status, filtered data, filtered_count, total_count, and data_generated_at
 
-    if not cache_file.exists():
-        raise FileNotFoundError('Cache file not found')
+    Raises:
+        FileNotFoundError: If cache file not found
+    """
+    tickets = get_ticket_store().get(base_dir, eastern)
+    start = time.perf_counter()
+    incidents = tickets.filter(filters)
+    logger.debug(f"Filtered {len(tickets.incidents)} incidents to {len(incidents)} in {(time.perf_counter() - start) * 1000:.1f}ms")
+    return {
+        'success': True,
+        'data': incidents,
+        'filtered_count': len(incidents),
+        'total_count': tickets.total_count,
+        'data_generated_at': tickets.data_generated_at
+    }
 
-    with open(cache_file, 'r') as f:
-        cached_data = json.load(f)
 
-    if isinstance(cached_data, dict) and 'data' in cached_data:
-        return {
-            'success': True,
-            'data': cached_data['data'],
-            'total_count': cached_data.get('total_count', len(cached_data['data'])),
-            'data_generated_at': cached_data.get('data_generated_at')
-        }
-    else:
-        return {
-            'success': True,
-            'data': cached_data,
-            'total_count': len(cached_data),
-            'data_generated_at': None
-        }
+def get_meaningful_metrics_aggregates(base_dir: str, eastern: pytz.tzinfo.BaseTzInfo,
+                                      filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Get server-side chart and KPI aggregates for the filtered incidents.
+
+    Results are memoized per (ticket cache version, filter payload).
+
+    Args:
+        base_dir: Base directory of the web application
+        eastern: Pytz timezone object for US/Eastern
+        filters: Dictionary of filter criteria (same payload as the export endpoints)
+
+    Returns:
+        Dictionary with success status, aggregates, version, total_count, and data_generated_at
+
+    Raises:
+        FileNotFoundError: If cache file not found
+    """
+    tickets = get_ticket_store().get(base_dir, eastern)
+    return {
+        'success': True,
+        'aggregates': tickets.aggregate(filters),
+        'version': tickets.version,
+        'total_count': tickets.total_count,
+        'data_generated_at': tickets.data_generated_at
+    }
 
 
 def apply_filters_to_incidents(incidents: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Apply filters to incidents data - mirrors JavaScript filtering logic.
 
+    Row-at-a-time reference implementation for ad-hoc incident lists. The dashboard
+    endpoints filter through the store's vectorized TicketFilterEngine, which must
+    keep the same semantics.
+
     Args:
         incidents: List of incident dictionaries
         filters: Dictionary of filter criteria
@@ -142,45 +189,9 @@ def apply_filters_to_incidents(incidents: List[Dict[str, Any]], filters: Dict[st
             if not should_show_no_level and not should_show_with_level:
                 continue
 
-        # MTTR filter
-        if mttr_filter > 0:
-            mttr_seconds = item.get('time_to_respond_secs')
-            if mttr_seconds is None or mttr_seconds == 0:
-                continue
-
-            if mttr_filter == 1 and mttr_seconds > 180:
-                continue
-            if mttr_filter == 2 and mttr_seconds <= 180:
-                continue
-            if mttr_filter == 3 and mttr_seconds <= 300:
-                continue
-
-        # MTTC filter
-        if mttc_filter > 0:
-            if not item.get('has_hostname'):
-                continue
-
-            mttc_seconds = item.get('time_to_contain_secs')
-            if mttc_seconds is None or mttc_seconds == 0:
-                continue
-
-            if mttc_filter == 1 and mttc_seconds > 300:
-                continue
-            if mttc_filter == 2 and mttc_seconds > 900:
-                continue
-            if mttc_filter == 3 and mttc_seconds <= 900:
-                continue
-
-        # Age filter
-        if age_filter > 0:
-            aging_days = item.get('currently_aging_days')
-            if aging_days is None or aging_days == '':
-                continue
-            try:
-                if float(aging_days) <= age_filter:
-                    continue
-            except (ValueError, TypeError):
-                continue
+        # MTTR / MTTC / age filters
+        if not passes_sla_and_age_filters(item, mttr_filter, mttc_filter, age_filter):
+            continue
 
         filtered_incidents.append(item)
 
@@ -215,25 +226,8 @@ def export_meaningful_metrics(
     """
     logger.info(f"Exporting meaningful metrics with filters: {filters}")
 
-    # Load data from cache
-    today_date = datetime.now(eastern).strftime('%m-%d-%Y')
-    root_directory = Path(base_dir).parent
-    cache_file = root_directory / 'data' / 'transient' / 'secOps' / today_date / 'past_90_days_tickets.json'
-
-    if not cache_file.exists():
-        raise FileNotFoundError('Cache file not found')
-
-    with open(cache_file, 'r') as f:
-        cached_data = json.load(f)
-
-    # Extract incidents data
-    if isinstance(cached_data, dict) and 'data' in cached_data:
-        all_incidents = cached_data['data']
-    else:
-        all_incidents = cached_data
-
-    # Apply filters
-    incidents = apply_filters_to_incidents(all_incidents, filters)
+    # Filter against the indexed in-process store; copy rows since note enrichment mutates them
+    incidents = [dict(item) for item in get_ticket_store().get(base_dir, eastern).filter(filters)]
 
     if not incidents:
         raise ValueError('No incidents to export')
@@ -421,19 +415,13 @@ def _prepare_export_rows(
     severity_map = {0: 'Unknown', 1: 'Low', 2: 'Medium', 3: 'High', 4: 'Critical'}
     status_map = {0: 'Pending', 1: 'Active', 2: 'Closed'}
 
-    # Map column IDs to actual data field paths (matches JavaScript availableColumns)
-    column_path_map = {
-        'timetorespond': 'time_to_respond_secs',
-        'timetocontain': 'time_to_contain_secs',
-    }
-
     rows = []
 
     for incident in incidents:
         row = {}
         for col_id in visible_columns:
             # Use path mapping if available, otherwise use col_id directly
-            data_field = column_path_map.get(col_id, col_id)
+            data_field = EXPORT_COLUMN_PATHS.get(col_id, col_id)
             value = incident.get(data_field)
             col_label = column_labels.get(col_id, col_id)
 
@@ -614,25 +602,8 @@ def export_meaningful_metrics_async(
     """
     logger.info(f"Async export started with filters: {filters}")
 
-    # Load data from cache
-    today_date = datetime.now(eastern).strftime('%m-%d-%Y')
-    root_directory = Path(base_dir).parent
-    cache_file = root_directory / 'data' / 'transient' / 'secOps' / today_date / 'past_90_days_tickets.json'
-
-    if not cache_file.exists():
-        raise FileNotFoundError('Cache file not found')
-
-    with open(cache_file, 'r') as f:
-        cached_data = json.load(f)
-
-    # Extract incidents data
-    if isinstance(cached_data, dict) and 'data' in cached_data:
-        all_incidents = cached_data['data']
-    else:
-        all_incidents = cached_data
-
-    # Apply filters
-    incidents = apply_filters_to_incidents(all_incidents, filters)
+    # Filter against the indexed in-process store; copy rows since note enrichment mutates them
+    incidents = [dict(item) for item in get_ticket_store().get(base_dir, eastern).filter(filters)]
 
     if not incidents:
         raise ValueError('No incidents to export')
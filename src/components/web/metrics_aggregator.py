@@ -0,0 +1,160 @@
+"""Server-side aggregates for the Meaningful Metrics dashboard.
+
+Computes the numbers the dashboard charts and KPI cards are built from (grouped
+counts, MTTR/MTTC statistics, daily/weekly inflow and outflow) so the browser can
+render from a few KB of aggregates instead of the full ticket list.
+
+Inclusion rules mirror web/static/js/metrics/charts.js and metrics.js; display-only
+transforms (team prefix / email domain stripping, colors) stay client-side.
+"""
+
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 75, 90, 95)
+TOP_N = 10
+
+
+def _has_text(value: Any) -> bool:
+    return isinstance(value, str) and value.strip() != ''
+
+
+def _utc_date(value: Any) -> Optional[str]:
+    """YYYY-MM-DD (UTC) of an ISO timestamp, skipping junk and pre-2020 placeholder dates like the charts do."""
+    if not _has_text(value):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.strftime('%Y-%m-%d') if dt.year >= 2020 else None
+
+
+def _duration_stats(values: List[float]) -> Dict[str, Any]:
+    """Count, mean and percentiles of a list of durations (seconds)."""
+    if not values:
+        return {'count': 0, 'mean': 0, **{f'p{p}': None for p in PERCENTILES}}
+    array = np.asarray(values, dtype=float)
+    percentiles = np.percentile(array, PERCENTILES)
+    return {
+        'count': len(values),
+        'mean': float(array.mean()),
+        **{f'p{p}': float(v) for p, v in zip(PERCENTILES, percentiles)}
+    }
+
+
+def _top(counter: Counter, limit: Optional[int] = TOP_N) -> List[Dict[str, Any]]:
+    return [{'key': key, 'count': count} for key, count in counter.most_common(limit)]
+
+
+def _series(by_date: Dict[str, Counter]) -> List[Dict[str, Any]]:
+    return [{'date': date, 'inflow': by_date[date]['inflow'], 'outflow': by_date[date]['outflow']}
+            for date in sorted(by_date)]
+
+
+def aggregate_incidents(incidents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate (already filtered) incidents into dashboard chart and KPI data.
+
+    Args:
+        incidents: Filtered incident dictionaries
+
+    Returns:
+        Dictionary with summary, counts, and timeseries sections
+    """
+    countries: Counter = Counter()
+    impacts: Counter = Counter()
+    ticket_types: Counter = Counter()
+    owners: Counter = Counter()
+    hosts: Counter = Counter()
+    users: Counter = Counter()
+    resolution_days: Dict[str, List[float]] = defaultdict(list)
+    daily: Dict[str, Counter] = defaultdict(Counter)
+    mttr_values: List[float] = []
+    mttc_values: List[float] = []
+
+    assigned = open_count = malicious = response_breaches = containment_breaches = 0
+
+    for item in incidents:
+        countries[item.get('affected_country') or 'Unknown'] += 1
+        impacts[item.get('impact') or 'Unknown'] += 1
+        ticket_types[item.get('type') or 'Unknown'] += 1
+
+        hostname = item.get('hostname')
+        if hostname and hostname != 'Unknown':
+            hosts[hostname] += 1
+        username = item.get('username')
+        if username and username != 'Unknown':
+            users[username] += 1
+
+        if item.get('is_open'):
+            open_count += 1
+        if item.get('impact') == 'Malicious True Positive':
+            malicious += 1
+        if item.get('has_breached_response_sla') is True:
+            response_breaches += 1
+        if _has_text(hostname) and hostname != 'Unknown' and item.get('has_breached_containment_sla') is True:
+            containment_breaches += 1
+
+        if item.get('type') and item.get('resolution_time_days') is not None and item['resolution_time_days'] > 0:
+            resolution_days[item['type']].append(item['resolution_time_days'])
+
+        if item.get('has_hostname') and item.get('time_to_contain_secs') and item['time_to_contain_secs'] > 0:
+            mttc_values.append(item['time_to_contain_secs'])
+
+        if not _has_text(item.get('owner')):
+            continue
+        assigned += 1
+        owners[item['owner']] += 1
+        if item.get('time_to_respond_secs') and item['time_to_respond_secs'] > 0:
+            mttr_values.append(item['time_to_respond_secs'])
+
+        created_date = _utc_date(item.get('created'))
+        if created_date:
+            daily[created_date]['inflow'] += 1
+        closed_date = _utc_date(item.get('closed'))
+        if closed_date:
+            daily[closed_date]['outflow'] += 1
+
+    # Weeks start on Monday
+    weekly: Dict[str, Counter] = defaultdict(Counter)
+    for date, flows in daily.items():
+        day = datetime.strptime(date, '%Y-%m-%d')
+        weekly[(day - timedelta(days=day.weekday())).strftime('%Y-%m-%d')].update(flows)
+
+    return {
+        'summary': {
+            'total_incidents': len(incidents),
+            'assigned_incidents': assigned,
+            'open_incidents': open_count,
+            'malicious_true_positives': malicious,
+            'response_sla_breaches': response_breaches,
+            'containment_sla_breaches': containment_breaches,
+            'unique_countries': len({item.get('affected_country') for item in incidents if item.get('affected_country')}),
+            'mttr': _duration_stats(mttr_values),
+            'mttc': _duration_stats(mttc_values),
+        },
+        'counts': {
+            'countries': _top(countries),
+            'impacts': _top(impacts, None),
+            'ticket_types': _top(ticket_types, None),
+            'owners': _top(owners),
+            'hosts': _top(hosts),
+            'users': _top(users),
+            'avg_resolution_days_by_type': sorted(
+                ({'key': t, 'avg_days': sum(days) / len(days), 'count': len(days)} for t, days in resolution_days.items()),
+                key=lambda entry: entry['avg_days'], reverse=True
+            ),
+        },
+        'timeseries': {
+            'daily': _series(daily),
+            'weekly': _series(weekly),
+        },
+    }
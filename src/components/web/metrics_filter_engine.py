@@ -0,0 +1,201 @@
+"""Vectorized filter engine for Meaningful Metrics tickets.
+
+Columns needed by the dashboard filters are converted once into NumPy arrays, so
+applying a filter set is a handful of boolean mask operations instead of a
+per-ticket Python loop:
+- categorical fields become factorized integer codes plus a precomputed "no value" mask
+- rows are ordered by created_days_ago once, so the date range is a searchsorted cutoff
+- MTTR, MTTC and age become float arrays with presence masks
+
+Semantics match apply_filters_to_incidents exactly, including its quirks:
+- rows without created_days_ago always pass the date filter
+- when regions are selected they decide the location match, even if countries are also selected
+- severity and status are compared as strings
+- MTTR/MTTC treat None and 0 as "no value"; MTTC also requires has_hostname
+- the age filter excludes values that can't be converted with float()
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# filter key -> (ticket field, "no value" option label or None, compare as str)
+CATEGORICAL_FILTERS = {
+    'countries': ('affected_country', 'No Country', False),
+    'regions': ('affected_region', 'No Region', False),
+    'impacts': ('impact', 'No Impact', False),
+    'severities': ('severity', None, True),
+    'ticketTypes': ('type', None, False),
+    'statuses': ('status', None, True),
+    'automationLevels': ('automation_level', 'No Level', False),
+}
+
+
+def is_missing_value(value: Any) -> bool:
+    """Same emptiness rule the dashboard uses for 'No Country' / 'No Region' / etc."""
+    return not value or value == 'Unknown' or str(value).strip() == ''
+
+
+def passes_sla_and_age_filters(item: Dict[str, Any], mttr_filter: int, mttc_filter: int, age_filter: int) -> bool:
+    """MTTR/MTTC bucket rules and the age filter for a single incident."""
+    if mttr_filter > 0:
+        mttr_seconds = item.get('time_to_respond_secs')
+        if mttr_seconds is None or mttr_seconds == 0:
+            return False
+        if mttr_filter == 1 and mttr_seconds > 180:
+            return False
+        if mttr_filter == 2 and mttr_seconds <= 180:
+            return False
+        if mttr_filter == 3 and mttr_seconds <= 300:
+            return False
+
+    if mttc_filter > 0:
+        if not item.get('has_hostname'):
+            return False
+        mttc_seconds = item.get('time_to_contain_secs')
+        if mttc_seconds is None or mttc_seconds == 0:
+            return False
+        if mttc_filter == 1 and mttc_seconds > 300:
+            return False
+        if mttc_filter == 2 and mttc_seconds > 900:
+            return False
+        if mttc_filter == 3 and mttc_seconds <= 900:
+            return False
+
+    if age_filter > 0:
+        aging_days = item.get('currently_aging_days')
+        if aging_days is None or aging_days == '':
+            return False
+        try:
+            if float(aging_days) <= age_filter:
+                return False
+        except (ValueError, TypeError):
+            return False
+
+    return True
+
+
+def _numeric_column(values: List[Any]) -> np.ndarray:
+    """Float array with NaN for None; a real NaN value stays NaN and compares False like it does in Python."""
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def _age_column(values: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """currently_aging_days as float, with a parallel mask of rows the age filter can consider."""
+    ages = np.full(len(values), np.nan)
+    valid = np.zeros(len(values), dtype=bool)
+    for pos, value in enumerate(values):
+        if value is None or value == '':
+            continue
+        try:
+            ages[pos] = float(value)
+            valid[pos] = True
+        except (ValueError, TypeError):
+            pass
+    return ages, valid
+
+
+class _CategoricalColumn:
+    """Factorized codes for one categorical field plus its "no value" mask."""
+
+    def __init__(self, values: List[Any], no_value_label: Any, as_str: bool):
+        self.no_value_label = no_value_label
+        keys = [str(v) for v in values] if as_str else values
+        codes, uniques = pd.factorize(pd.Series(keys, dtype=object), use_na_sentinel=True)
+        self.codes = codes
+        self.code_of = {value: code for code, value in enumerate(uniques)}
+        self.missing = np.array([is_missing_value(v) for v in values], dtype=bool) if no_value_label else None
+
+    def mask(self, selected: List[Any]) -> np.ndarray:
+        """Rows matching any of the selected options."""
+        wanted = [self.code_of[option] for option in selected
+                  if option != self.no_value_label and option in self.code_of]
+        result = np.isin(self.codes, wanted)
+        if self.no_value_label and self.no_value_label in selected:
+            result |= self.missing
+        return result
+
+
+class TicketFilterEngine:
+    """Column arrays for the dashboard filters over a fixed list of incidents."""
+
+    def __init__(self, incidents: List[Dict[str, Any]]):
+        self.size = len(incidents)
+
+        # Date range: dated rows ordered by created_days_ago, so "<= N days" is a prefix.
+        # Rows without a usable value (None, NaN) always pass, as in the row loop.
+        days = _numeric_column([item.get('created_days_ago') for item in incidents])
+        self.undated = np.isnan(days)
+        dated_positions = np.flatnonzero(~self.undated)
+        order = np.argsort(days[dated_positions], kind='stable')
+        self._days_sorted = days[dated_positions][order]
+        self._positions_by_days = dated_positions[order]
+
+        self.categorical = {
+            filter_key: _CategoricalColumn([item.get(field) for item in incidents], no_value_label, as_str)
+            for filter_key, (field, no_value_label, as_str) in CATEGORICAL_FILTERS.items()
+        }
+
+        mttr = [item.get('time_to_respond_secs') for item in incidents]
+        mttc = [item.get('time_to_contain_secs') for item in incidents]
+        self.mttr = _numeric_column(mttr)
+        self.mttr_present = np.array([v is not None and v != 0 for v in mttr], dtype=bool)
+        self.mttc = _numeric_column(mttc)
+        self.mttc_present = np.array([v is not None and v != 0 for v in mttc], dtype=bool)
+        self.has_hostname = np.array([bool(item.get('has_hostname')) for item in incidents], dtype=bool)
+        self.age, self.age_valid = _age_column([item.get('currently_aging_days') for item in incidents])
+
+    def _date_mask(self, date_range: float) -> np.ndarray:
+        """Rows created within date_range days (plus undated rows)."""
+        result = self.undated.copy()
+        cutoff = np.searchsorted(self._days_sorted, date_range, side='right')
+        result[self._positions_by_days[:cutoff]] = True
+        return result
+
+    def mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Boolean mask of incidents passing the filters."""
+        result = self._date_mask(filters.get('dateRange', 30))
+
+        if filters.get('regions'):
+            result &= self.categorical['regions'].mask(filters['regions'])
+        elif filters.get('countries'):
+            result &= self.categorical['countries'].mask(filters['countries'])
+
+        for filter_key in ('impacts', 'severities', 'ticketTypes', 'statuses', 'automationLevels'):
+            if filters.get(filter_key):
+                result &= self.categorical[filter_key].mask(filters[filter_key])
+
+        with np.errstate(invalid='ignore'):
+            mttr_filter = filters.get('mttrFilter', 0)
+            if mttr_filter > 0:
+                result &= self.mttr_present
+                if mttr_filter == 1:
+                    result &= ~(self.mttr > 180)
+                elif mttr_filter == 2:
+                    result &= ~(self.mttr <= 180)
+                elif mttr_filter == 3:
+                    result &= ~(self.mttr <= 300)
+
+            mttc_filter = filters.get('mttcFilter', 0)
+            if mttc_filter > 0:
+                result &= self.has_hostname & self.mttc_present
+                if mttc_filter == 1:
+                    result &= ~(self.mttc > 300)
+                elif mttc_filter == 2:
+                    result &= ~(self.mttc > 900)
+                elif mttc_filter == 3:
+                    result &= ~(self.mttc <= 900)
+
+            age_filter = filters.get('ageFilter', 0)
+            if age_filter > 0:
+                result &= self.age_valid & ~(self.age <= age_filter)
+
+        return result
+
+    def positions(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Row positions (in original order) of incidents passing the filters."""
+        return np.flatnonzero(self.mask(filters))
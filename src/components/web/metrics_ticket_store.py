@@ -0,0 +1,167 @@
+"""In-process ticket store for the Meaningful Metrics endpoints.
+
+Loads today's ticket cache once per process, reloads only when the cache file's
+mtime changes (or the date rolls over), and builds the filter indexes
+(TicketFilterEngine) once per load so dashboard filters are index lookups
+instead of a Python loop over every incident.
+
+Each load produces an immutable IndexedTickets snapshot; a reload swaps the
+reference, so requests already holding the old snapshot are unaffected.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz
+
+from src.components.ticket_columns import read_ticket_columns
+from src.components.web.metrics_aggregator import aggregate_incidents
+from src.components.web.metrics_filter_engine import TicketFilterEngine
+
+logger = logging.getLogger(__name__)
+
+# Distinct filter combinations whose aggregates are kept per ticket cache version
+AGGREGATE_CACHE_SIZE = 256
+
+
+def get_cache_paths(base_dir: str, eastern: pytz.tzinfo.BaseTzInfo) -> Tuple[Path, Path]:
+    """Return today's (JSON cache file, columnar snapshot file) paths."""
+    today_date = datetime.now(eastern).strftime('%m-%d-%Y')
+    cache_dir = Path(base_dir).parent / 'data' / 'transient' / 'secOps' / today_date
+    return cache_dir / 'past_90_days_tickets.json', cache_dir / 'past_90_days_tickets.arrow'
+
+
+def load_cached_incidents(base_dir: str, eastern: pytz.tzinfo.BaseTzInfo) -> Dict[str, Any]:
+    """Load today's cached incidents, preferring the columnar snapshot over the JSON file.
+
+    The store serves full ticket rows to the dashboard, so every column is loaded.
+    Falls back to the JSON file when the snapshot is missing or older than the JSON.
+
+    Args:
+        base_dir: Base directory of the web application
+        eastern: Pytz timezone object for US/Eastern
+
+    Returns:
+        Dictionary with data, total_count, and data_generated_at
+
+    Raises:
+        FileNotFoundError: If cache file not found
+    """
+    cache_file, columnar_file = get_cache_paths(base_dir, eastern)
+
+    if not cache_file.exists():
+        raise FileNotFoundError('Cache file not found')
+
+    if columnar_file.exists() and columnar_file.stat().st_mtime >= cache_file.stat().st_mtime:
+        incidents, metadata = read_ticket_columns(columnar_file)
+        return {
+            'data': incidents,
+            'total_count': int(metadata.get('total_count', len(incidents))),
+            'data_generated_at': metadata.get('data_generated_at')
+        }
+
+    logger.debug(f"Columnar snapshot unavailable, parsing {cache_file}")
+    with open(cache_file, 'r') as f:
+        cached_data = json.load(f)
+
+    if isinstance(cached_data, dict) and 'data' in cached_data:
+        return {
+            'data': cached_data['data'],
+            'total_count': cached_data.get('total_count', len(cached_data['data'])),
+            'data_generated_at': cached_data.get('data_generated_at')
+        }
+    return {
+        'data': cached_data,
+        'total_count': len(cached_data),
+        'data_generated_at': None
+    }
+
+
+class IndexedTickets:
+    """Immutable, indexed view of one version of the ticket cache."""
+
+    def __init__(self, incidents: List[Dict[str, Any]], total_count: int,
+                 data_generated_at: Optional[str], version: str):
+        self.incidents = incidents
+        self.total_count = total_count
+        self.data_generated_at = data_generated_at
+        self.version = version
+
+        self.engine = TicketFilterEngine(incidents)
+
+        # filter hash -> aggregates; scoped to this version, so a reload starts empty
+        self._aggregates: OrderedDict = OrderedDict()
+        self._aggregates_lock = threading.Lock()
+
+    def filter(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Apply dashboard filters; same semantics (and order) as apply_filters_to_incidents."""
+        return [self.incidents[pos] for pos in self.engine.positions(filters)]
+
+    def aggregate(self, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Dashboard aggregates for the filtered incidents, memoized per filter payload."""
+        key = hashlib.sha256(json.dumps(filters, sort_keys=True, default=str).encode()).hexdigest()
+        with self._aggregates_lock:
+            if key in self._aggregates:
+                self._aggregates.move_to_end(key)
+                return self._aggregates[key]
+
+        result = aggregate_incidents(self.filter(filters))
+
+        with self._aggregates_lock:
+            self._aggregates[key] = result
+            while len(self._aggregates) > AGGREGATE_CACHE_SIZE:
+                self._aggregates.popitem(last=False)
+        return result
+
+
+class MetricsTicketStore:
+    """Process-wide holder of the current IndexedTickets, reloaded on cache file change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current: Optional[IndexedTickets] = None
+
+    def get(self, base_dir: str, eastern: pytz.tzinfo.BaseTzInfo) -> IndexedTickets:
+        """Return the indexed tickets for today's cache, reloading if the file changed.
+
+        Raises:
+            FileNotFoundError: If cache file not found
+        """
+        cache_file, columnar_file = get_cache_paths(base_dir, eastern)
+        if not cache_file.exists():
+            raise FileNotFoundError('Cache file not found')
+
+        mtimes = [p.stat().st_mtime_ns for p in (cache_file, columnar_file) if p.exists()]
+        version = f"{cache_file.parent.name}:{max(mtimes)}"
+
+        current = self._current
+        if current is not None and current.version == version:
+            return current
+
+        with self._lock:
+            if self._current is None or self._current.version != version:
+                logger.info(f"Loading meaningful metrics ticket store (version {version})")
+                cached = load_cached_incidents(base_dir, eastern)
+                self._current = IndexedTickets(
+                    cached['data'], cached['total_count'], cached['data_generated_at'], version
+                )
+                logger.info(f"Ticket store ready: {len(cached['data'])} incidents indexed")
+            return self._current
+
+
+# Global instance
+_ticket_store = None
+
+
+def get_ticket_store() -> MetricsTicketStore:
+    """Get or create global ticket store instance."""
+    global _ticket_store
+    if _ticket_store is None:
+        _ticket_store = MetricsTicketStore()
+    return _ticket_store
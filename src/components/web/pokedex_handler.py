@@ -107,8 +107,7 @@ def handle_pokedex_chat_stream(
     user_message: str,
     session_id: str,
     user_ip: str,
-    ask_stream_func,
-    get_state_manager_func
+    ask_stream_func
 ) -> Generator[str, None, None]:
     """Streaming handler for Pokédex chat messages.
 
@@ -117,7 +116,6 @@ def handle_pokedex_chat_stream(
         session_id: Session identifier
         user_ip: User's IP address
         ask_stream_func: Function to call for streaming LLM response
-        get_state_manager_func: Function to get state manager
 
     Yields:
         Tokens from LLM response stream
@@ -127,11 +125,6 @@ def handle_pokedex_chat_stream(
     """
     logger.info(f"Processing streaming Pokedex chat message from {user_ip}")
 
-    # Clean up old sessions before processing
-    state_manager = get_state_manager_func()
-    if state_manager and hasattr(state_manager, 'session_manager'):
-        state_manager.session_manager.cleanup_old_sessions()
-
     # Use IP address + session ID as identifier
     user_identifier = f"web_{user_ip}_{session_id}"
 
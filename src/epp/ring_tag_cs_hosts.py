@@ -26,7 +26,6 @@ import sys
 import time
 import logging
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -41,7 +40,7 @@ from webexpythonsdk import WebexAPI
 
 from my_config import get_config
 from services.crowdstrike import CrowdStrikeClient, CSCredentialProfile
-from services.service_now import ServiceNowClient
+from services.service_now import HOSTS_DETAILS_MAX_WORKERS, ServiceNowClient
 from services.epp_tagging_db import insert_tagging_run, bulk_insert_results
 
 
@@ -95,6 +94,10 @@ RING_2_ENVS = {"qa", "test"}
 RING_3_ENVS = {"dr"}
 # Ring 4 is for production or unknown environments
 
+# ServiceNow CMDB lookups (one host per request); 429s are retried with backoff
+SNOW_REQUESTS_PER_SECOND = 30
+SNOW_MAX_WORKERS = HOSTS_DETAILS_MAX_WORKERS
+
 # Timezone constant for consistent usage
 EASTERN_TZ = ZoneInfo("America/New_York")
 
@@ -176,60 +179,88 @@ class Host:
     _os_domain: str = ""  # Internal: osDomain from ServiceNow, used for fallback country detection
 
     @staticmethod
-    def initialize_hosts_parallel(hostnames, max_workers=10):
-        """Initialize hosts in parallel and yield them one by one."""
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Create hosts first
-            host_objects = [Host(hostname) for hostname in hostnames]
-            # Initialize in parallel with progress tracking
-            total_hosts = len(host_objects)
-            logger.info(f"Initializing {total_hosts} hosts...")
-
-            # Use tqdm for interactive sessions (shows progress bar), logger for VM
-            initialized_count = 0
-            for host in tqdm(
-                executor.map(lambda host_element: host_element.initialize() or host_element, host_objects),
-                total=total_hosts,
-                desc="Initializing hosts",
-                disable=not sys.stdout.isatty()
-            ):
-                initialized_count += 1
-                # Log progress for non-interactive (VM) sessions every 100 hosts
-                if initialized_count % 100 == 0 or initialized_count == total_hosts:
-                    logger.info(f"Initialized {initialized_count}/{total_hosts} hosts ({initialized_count*100/total_hosts:.1f}%)")
-                yield host
+    def initialize_hosts_parallel(hostnames, max_workers=SNOW_MAX_WORKERS):
+        """Initialize hosts in bulk and yield them one by one."""
+        # Create hosts first
+        host_objects = [Host(hostname) for hostname in hostnames]
+        logger.info(f"Initializing {len(host_objects)} hosts...")
+        Host.initialize_all(host_objects, max_workers=max_workers)
+        yield from host_objects
 
-    def initialize(self) -> None:
-        """Initialize all host data."""
-        try:
-            self._set_host_details_from_cs()
+    @staticmethod
+    def initialize_all(hosts: List['Host'], max_workers: int = SNOW_MAX_WORKERS) -> None:
+        """
+        Initialize many hosts in stages, each stage covering all hosts at once:
 
-            if not self.device_id:
-                self.status_message += " No CrowdStrike device ID found."
-                return
+        1. CrowdStrike device ids, resolved with batched hostname queries
+        2. CrowdStrike device details, reused from stage 1 (only ids served from
+           the id cache are fetched, up to 1000 devices per request)
+        3. ServiceNow CMDB details through one shared, pooled client
+        4. Country/region normalization (in memory, no API calls)
+        """
+        total_hosts = len(hosts)
 
-            self._set_host_details_from_snow()
-            self._normalize_country_data()
-            self._determine_region()
+        # Stages 1-2: CrowdStrike
+        stage_start = time.time()
+        try:
+            device_details = {}
+            device_ids = crowdstrike.resolve_device_ids([host.name for host in hosts], details=device_details)
         except Exception as e:
-            # Catch any unexpected errors during initialization
-            error_msg = f" Error during host initialization: {str(e)}"
-            self.status_message += error_msg
-            logger.error(f"[Host Initialization] Exception for {self.name}: {e}")
-            # Continue processing - don't re-raise the exception
-
-    def _set_host_details_from_cs(self) -> None:
-        """Retrieve device ID and tags from CrowdStrike."""
+            logger.error(f"[CrowdStrike] Exception retrieving data for {total_hosts} hosts: {e}")
+            for host in hosts:
+                host.status_message += f" Error retrieving CrowdStrike data: {str(e)}."
+            device_ids = None
+        if device_ids is not None:
+            for host in hosts:
+                host._set_host_details_from_cs(device_ids.get(host.name), device_details)
+        cs_hosts = [host for host in hosts if host.device_id]
+        for host in hosts:
+            if not host.device_id:
+                host.status_message += " No CrowdStrike device ID found."
+        logger.info(f"[CrowdStrike] Resolved {len(cs_hosts)}/{total_hosts} hosts in {time.time() - stage_start:.1f}s")
+
+        if not cs_hosts:
+            return
+
+        # Stage 3: ServiceNow
+        stage_start = time.time()
         try:
-            self.device_id = crowdstrike.get_device_id(self.name)
+            service_now = ServiceNowClient(requests_per_second=SNOW_REQUESTS_PER_SECOND)
+            snow_details = service_now.get_hosts_details([host.name for host in cs_hosts], max_workers=max_workers)
+        except Exception as e:
+            logger.error(f"[ServiceNow] Exception retrieving data for {len(cs_hosts)} hosts: {e}")
+            for host in cs_hosts:
+                host.status_message += f" Error retrieving ServiceNow data: {str(e)}."
+            snow_details = None
+        if snow_details is not None:
+            for host in cs_hosts:
+                host._set_host_details_from_snow(snow_details.get(host.name))
+        logger.info(f"[ServiceNow] Looked up {len(cs_hosts)} hosts in {time.time() - stage_start:.1f}s")
+
+        # Stage 4: country and region
+        for host in cs_hosts:
+            try:
+                host._normalize_country_data()
+                host._determine_region()
+            except Exception as e:
+                # Continue processing - don't re-raise the exception
+                host.status_message += f" Error during host initialization: {str(e)}"
+                logger.error(f"[Host Initialization] Exception for {host.name}: {e}")
 
-            if self.device_id is None:
+    def initialize(self) -> None:
+        """Initialize all host data."""
+        Host.initialize_all([self])
+
+    def _set_host_details_from_cs(self, device_id: Optional[str], devices_details: Dict[str, Dict[str, Any]]) -> None:
+        """Set device ID, tags and category from bulk-fetched CrowdStrike data."""
+        try:
+            if not device_id:
                 self.status_message += f" Error retrieving CrowdStrike Device ID for {self.name}."
                 logger.warning(f"[CrowdStrike] Device ID not found for host: {self.name}")
                 return
+            self.device_id = device_id
 
-            # Fetch device details including tags
-            device_details = crowdstrike.get_device_details(self.device_id)
+            device_details = devices_details.get(device_id)
 
             if not device_details or not isinstance(device_details, dict):
                 self.status_message += f" Error fetching device details from CrowdStrike: No details returned."
@@ -237,7 +268,7 @@ class Host:
                 return
 
             self.current_crowd_strike_tags = device_details.get('tags', [])
-            category = device_details.get('product_type_desc', '').lower()
+            category = (device_details.get('product_type_desc') or '').lower()
             if category == 'workstation':
                 self.category = HostCategory.WORKSTATION
             elif category in ('server', 'domain controller'):
@@ -246,19 +277,15 @@ class Host:
                 self.status_message += f" Unknown host category: {category}."
                 logger.warning(f"[CrowdStrike] Unknown host category '{category}' for device_id: {self.device_id}")
 
-            # Log success for clarity
-            logger.info(f"[CrowdStrike] Retrieved details for {self.name} (device_id: {self.device_id}), tags: {self.current_crowd_strike_tags}, category: {category}")
+            logger.debug(f"[CrowdStrike] Retrieved details for {self.name} (device_id: {self.device_id}), tags: {self.current_crowd_strike_tags}, category: {category}")
 
         except Exception as e:
             self.status_message += f" Error retrieving CrowdStrike data: {str(e)}."
             logger.error(f"[CrowdStrike] Exception retrieving data for {self.name}: {e}")
 
-    def _set_host_details_from_snow(self) -> None:
-        """Retrieve host details from ServiceNow."""
+    def _set_host_details_from_snow(self, snow_host_details: Optional[Dict[str, Any]]) -> None:
+        """Set environment, country and lifecycle status from bulk-fetched ServiceNow data."""
         try:
-            service_now = ServiceNowClient()
-            snow_host_details = service_now.get_host_details(self.name)
-
             if not snow_host_details:
                 self.status_message += " Host not found in ServiceNow."
                 return
@@ -41,7 +41,6 @@ logger = logging.getLogger(__name__)
 UNHEALTHY_THRESHOLD_DAYS_SERVER = 1  # Servers not seen for more than 1 day are unhealthy
 UNHEALTHY_THRESHOLD_DAYS_WORKSTATION = 3  # Workstations not seen for more than 3 days are unhealthy
 MAX_WORKERS_SNOW = 30  # Parallel workers for ServiceNow enrichment
-MAX_WORKERS_CS = 10  # Parallel workers for CrowdStrike checks
 
 # Lifecycle statuses eligible for RTR remediation
 RTR_ELIGIBLE_LIFECYCLE_STATUSES = {"operational", "pipeline"}
@@ -309,34 +308,25 @@ class TaniumUnhealthyHostsProcessor:
 
         cs_client = CrowdStrikeClient()
 
-        def check_single_host(host: UnhealthyHost) -> UnhealthyHost:
-            """Check CrowdStrike status for a single host"""
-            try:
-                online_state = cs_client.get_device_online_state(host.hostname)
-
-                if online_state is None:
-                    host.cs_status = "Not Found"
-                    host.cs_online_status = ""
-                else:
-                    host.cs_status = "Found"
-                    host.cs_online_status = online_state
-
-            except Exception as e:
-                host.cs_status = f"Error: {str(e)}"
-                host.cs_online_status = ""
-                logger.warning(f"Error checking CS status for {host.hostname}: {e}")
-
-            return host
+        # One batched lookup (a few Falcon calls per hundred hosts) instead of two calls per host
+        try:
+            online_states = cs_client.get_online_states([host.hostname for host in hosts_to_check])
+        except Exception as e:
+            logger.warning(f"Error checking CS status: {e}")
+            online_states = None
 
-        # Process in parallel with progress bar
         checked_hosts = []
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS_CS) as executor:
-            futures = {executor.submit(check_single_host, host): host for host in hosts_to_check}
-
-            for future in tqdm(as_completed(futures), total=len(futures),
-                              desc="Checking CrowdStrike",
-                              disable=not logger.isEnabledFor(logging.INFO)):
-                checked_hosts.append(future.result())
+        for host in hosts_to_check:
+            if online_states is None:
+                host.cs_status = "Error: CrowdStrike lookup failed"
+                host.cs_online_status = ""
+            elif online_states.get(host.hostname) is None:
+                host.cs_status = "Not Found"
+                host.cs_online_status = ""
+            else:
+                host.cs_status = "Found"
+                host.cs_online_status = online_states[host.hostname]
+            checked_hosts.append(host)
 
         # Combine with skipped hosts
         all_hosts = checked_hosts + hosts_skip
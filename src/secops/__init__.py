@@ -37,6 +37,7 @@ from .constants import (
 # Shift utilities
 from .shift_utils import (
     get_current_shift,
+    seconds_until_next_shift,
     safe_parse_datetime,
     get_shift_start_hour,
     get_previous_shift_info,
@@ -47,6 +48,7 @@ from .shift_utils import (
 from .staffing import (
     ExcelStaffingReader,
     get_excel_sheet,
+    get_staffing_schedule,
     get_staffing_data,
     get_shift_lead,
     get_basic_shift_staffing,
@@ -86,6 +88,7 @@ __all__ = [
 
     # Shift utilities
     'get_current_shift',
+    'seconds_until_next_shift',
     'safe_parse_datetime',
     'get_shift_start_hour',
     'get_previous_shift_info',
@@ -94,6 +97,7 @@ __all__ = [
     # Staffing
     'ExcelStaffingReader',
     'get_excel_sheet',
+    'get_staffing_schedule',
     'get_staffing_data',
     'get_shift_lead',
     'get_basic_shift_staffing',
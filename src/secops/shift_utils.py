@@ -37,6 +37,22 @@ def get_current_shift() -> str:
         return 'morning'
 
 
+def seconds_until_next_shift() -> int:
+    """
+    Seconds from now until the next shift change (04:30, 12:30 or 20:30 Eastern).
+
+    Returns:
+        Seconds until the next shift starts (at least 1)
+    """
+    eastern = pytz.timezone(ShiftConstants.EASTERN_TZ)
+    now = datetime.now(eastern)
+    seconds_today = now.hour * 3600 + now.minute * 60 + now.second
+    shift_starts = [ShiftConstants.MORNING_START * 60, ShiftConstants.AFTERNOON_START * 60, ShiftConstants.NIGHT_START * 60]
+
+    next_start = next((start for start in shift_starts if start > seconds_today), shift_starts[0] + 86400)
+    return max(next_start - seconds_today, 1)
+
+
 def safe_parse_datetime(dt_string: str) -> datetime | None:
     """
     Parse datetime string safely, ensuring it's timezone naive.
@@ -2,9 +2,15 @@
 SecOps Staffing Data
 
 Handles reading staffing data from Excel sheets and on-call information.
+
+The staffing workbook is parsed once into a (day -> shift -> team -> names)
+schedule held in memory and re-parsed only when the file changes on disk, so
+staffing lookups are dictionary reads. The on-call person is looked up once
+per rotation week.
 """
 import logging
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
 import pytz
@@ -21,6 +27,13 @@ from .shift_utils import get_current_shift
 
 logger = logging.getLogger(__name__)
 
+# Parsed staffing schedule and the (mtime_ns, size) of the workbook it came from
+_schedule_cache: Dict[str, Any] = {'signature': None, 'schedule': None}
+_schedule_lock = threading.Lock()
+
+# On-call person for the rotation week starting on this Monday (YYYY-MM-DD)
+_oncall_cache: Dict[str, Any] = {'week': None, 'info': None}
+
 
 def get_excel_sheet() -> Tuple[Any, bool]:
     """
@@ -42,14 +55,77 @@ def get_excel_sheet() -> Tuple[Any, bool]:
         return None, False
 
 
+def _parse_schedule(sheet: Any) -> Dict[str, Any]:
+    """Read every mapped cell of the staffing sheet into day -> shift -> team -> names, plus shift timings."""
+    schedule: Dict[str, Any] = {'shift_timings': {}}
+    for day_name, shifts in cell_names_by_shift.items():
+        if day_name == 'shift_timings':
+            for shift_name, cell_name in shifts.items():
+                cell = sheet[cell_name]
+                schedule['shift_timings'][shift_name] = getattr(cell, 'value', None) if cell else None
+            continue
+        schedule[day_name] = {
+            shift_name: {
+                team: ExcelStaffingReader.read_team_staffing(sheet, cell_names)
+                for team, cell_names in teams.items()
+            }
+            for shift_name, teams in shifts.items()
+        }
+    return schedule
+
+
+def get_staffing_schedule() -> Optional[Dict[str, Any]]:
+    """
+    Get the parsed staffing schedule, re-reading the workbook only if it changed.
+
+    Returns:
+        Dictionary of day -> shift -> team -> staff names (and 'shift_timings' ->
+        shift -> timings), or None if the workbook is unavailable.
+    """
+    try:
+        stat = EXCEL_PATH.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        logger.warning(f"Excel file not found: {EXCEL_PATH}. Staffing data will be unavailable.")
+        return None
+
+    if _schedule_cache['signature'] == signature:
+        return _schedule_cache['schedule']
+
+    with _schedule_lock:
+        if _schedule_cache['signature'] == signature:
+            return _schedule_cache['schedule']
+        sheet, is_available = get_excel_sheet()
+        if not is_available or sheet is None:
+            return None
+        try:
+            schedule = _parse_schedule(sheet)
+        except Exception as e:
+            logger.error(f"Error parsing staffing sheet: {e}. Staffing data will be unavailable.")
+            return None
+        _schedule_cache['schedule'] = schedule
+        _schedule_cache['signature'] = signature
+        logger.info(f"Loaded staffing schedule from {EXCEL_PATH}")
+        return schedule
+
+
 class ExcelStaffingReader:
     """Handles reading staffing data from Excel sheet."""
 
     @staticmethod
     def get_oncall_info() -> str:
-        """Get formatted on-call person info."""
+        """Get formatted on-call person info (looked up once per rotation week)."""
+        today = datetime.now(pytz.timezone(ShiftConstants.EASTERN_TZ)).date()
+        # The rotation changes on Mondays, same as oncall.get_on_call_person()
+        week = (today - timedelta(days=today.weekday())).strftime('%Y-%m-%d')
+        if _oncall_cache['week'] == week:
+            return _oncall_cache['info']
+
         person = oncall.get_on_call_person()
-        return f"{person['name']} ({person['phone_number']})"
+        info = f"{person['name']} ({person['phone_number']})"
+        _oncall_cache['info'] = info
+        _oncall_cache['week'] = week
+        return info
 
     @staticmethod
     def get_fallback_data() -> Dict[str, List[str]]:
@@ -105,16 +181,13 @@ def get_staffing_data(day_name: Optional[str] = None,
         shift_name = get_current_shift()
 
     try:
-        sheet, is_available = get_excel_sheet()
-        if not is_available or sheet is None:
+        schedule = get_staffing_schedule()
+        if schedule is None:
             logger.warning("Excel file not available, returning minimal staffing data")
             return ExcelStaffingReader.get_fallback_data()
 
-        shift_cell_names = cell_names_by_shift[day_name][shift_name]
-        staffing_data = {}
-
-        for team, cell_names in shift_cell_names.items():
-            staffing_data[team] = ExcelStaffingReader.read_team_staffing(sheet, cell_names)
+        # Copies, so callers can't modify the cached schedule
+        staffing_data = {team: list(staff) for team, staff in schedule[day_name][shift_name].items()}
 
         staffing_data['On-Call'] = [ExcelStaffingReader.get_oncall_info()]
         return staffing_data
@@ -135,23 +208,13 @@ def get_shift_lead(day_name: str, shift_name: str) -> str:
     Returns:
         Name of the shift lead or error message.
     """
-    sheet, is_available = get_excel_sheet()
-    if not is_available or sheet is None:
+    schedule = get_staffing_schedule()
+    if schedule is None:
         return "N/A (Excel file missing)"
 
     try:
-        shift_cell_names = cell_names_by_shift[day_name][shift_name]
-        if 'Lead' not in shift_cell_names:
-            return "No Lead Assigned"
-
-        for cell_name in shift_cell_names['Lead']:
-            cell = sheet[cell_name]
-            if cell is not None:
-                value = getattr(cell, 'value', None)
-                if ExcelStaffingReader.is_valid_cell_value(value):
-                    return str(value)
-
-        return "No Lead Assigned"
+        leads = schedule[day_name][shift_name].get('Lead')
+        return str(leads[0]) if leads else "No Lead Assigned"
     except (KeyError, IndexError, AttributeError) as e:
         logger.error(f"Error getting shift lead: {e}")
         return "N/A"
@@ -168,21 +231,12 @@ def get_basic_shift_staffing(day_name: str, shift_name: str) -> Dict[str, Any]:
     Returns:
         Dictionary with 'total_staff' count and 'teams' breakdown.
     """
-    sheet, is_available = get_excel_sheet()
-    if not is_available or sheet is None:
+    schedule = get_staffing_schedule()
+    if schedule is None:
         return {'total_staff': 0, 'teams': {}}
 
     try:
-        shift_cell_names = cell_names_by_shift[day_name][shift_name]
-        teams = {}
-
-        for team, cell_names in shift_cell_names.items():
-            team_count = sum(
-                1 for cell_name in cell_names
-                if sheet[cell_name] is not None and
-                ExcelStaffingReader.is_valid_cell_value(getattr(sheet[cell_name], 'value', None))
-            )
-            teams[team] = team_count
+        teams = {team: len(staff) for team, staff in schedule[day_name][shift_name].items()}
 
         total_staff = sum(teams.values())
         return {'total_staff': total_staff, 'teams': teams}
@@ -202,12 +256,11 @@ def get_shift_timings(shift_name: str) -> str:
     Returns:
         Shift timings string or error message.
     """
-    sheet, is_available = get_excel_sheet()
-    if not is_available or sheet is None:
+    schedule = get_staffing_schedule()
+    if schedule is None:
         return "N/A (Excel file missing)"
 
     try:
-        cell = sheet[cell_names_by_shift['shift_timings'][shift_name]]
-        return getattr(cell, 'value', "N/A (Excel cell missing)") if cell else "N/A (Excel cell missing)"
+        return schedule['shift_timings'][shift_name]
     except (KeyError, TypeError):
         return "N/A (Excel file issue)"
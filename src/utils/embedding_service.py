@@ -0,0 +1,272 @@
+"""
+Shared Ollama embedding service.
+
+One embedding path for the RAG document store, the tipper index and the rules
+catalog. Embeddings are cached by (model, sha256(text)):
+
+- in memory, in a bounded LRU, for repeated queries in the same process
+- on disk, in SQLite with float32 blobs, so index rebuilds and restarts reuse earlier work
+
+Only cache misses are sent to Ollama, as batched /api/embed calls with a bounded
+number of requests in flight.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import requests
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIRECTORY = Path(__file__).parent.parent.parent
+EMBEDDING_CACHE_PATH = ROOT_DIRECTORY / "data" / "transient" / "embedding_cache.db"
+
+OLLAMA_EMBED_URL = os.environ.get("OLLAMA_EMBED_URL", "http://localhost:11434/api/embed")
+
+EMBED_BATCH_SIZE = 50  # Max texts per /api/embed call
+EMBED_MAX_CONCURRENCY = 4  # Max /api/embed calls in flight (don't overwhelm Ollama)
+MEMORY_CACHE_SIZE = 10000  # Embeddings kept in the in-process LRU
+
+
+def text_hash(text: str) -> str:
+    """Cache key for a text (hex sha256 of its UTF-8 bytes)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite store of embeddings keyed by (model, text hash), stored as float32 blobs."""
+
+    def __init__(self, db_path: Path = EMBEDDING_CACHE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._init_database()
+
+    def _init_database(self):
+        with self._get_db_connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                ) WITHOUT ROWID
+            """)
+            conn.commit()
+
+    @contextmanager
+    def _get_db_connection(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, model: str, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors for the given text hashes (missing hashes are left out)."""
+        found: Dict[str, np.ndarray] = {}
+        if not hashes:
+            return found
+        with self._lock, self._get_db_connection() as conn:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(hashes), 500):
+                chunk = list(hashes[i:i + 500])
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT text_hash, dim, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk]
+                )
+                for key, dim, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    if vector.size == dim:
+                        found[key] = vector
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, np.ndarray]):
+        """Store vectors by text hash, replacing existing entries."""
+        if not vectors:
+            return
+        rows = [(model, key, int(vector.size), vector.astype(np.float32).tobytes())
+                for key, vector in vectors.items()]
+        with self._lock, self._get_db_connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, dim, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            conn.commit()
+
+    def count(self) -> int:
+        with self._get_db_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class EmbeddingService:
+    """Cached, batched embeddings from Ollama's /api/embed endpoint."""
+
+    def __init__(self, cache_path: Optional[Path] = EMBEDDING_CACHE_PATH, api_url: str = OLLAMA_EMBED_URL,
+                 batch_size: int = EMBED_BATCH_SIZE, max_concurrency: int = EMBED_MAX_CONCURRENCY,
+                 memory_cache_size: int = MEMORY_CACHE_SIZE):
+        self.api_url = api_url
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.memory_cache_size = memory_cache_size
+
+        self._memory: OrderedDict = OrderedDict()  # (model, hash) -> float32 vector
+        self._memory_lock = threading.Lock()
+        # Bounds concurrent Ollama calls across all callers, not just within one embed() call
+        self._request_slots = threading.BoundedSemaphore(max_concurrency)
+
+        self._disk: Optional[EmbeddingCache] = None
+        if cache_path is not None:
+            try:
+                self._disk = EmbeddingCache(cache_path)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache unavailable at {cache_path}, continuing without it: {e}")
+
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "embedded": 0}
+
+    def embed(self, model: str, texts: List[str]) -> List[List[float]]:
+        """Embeddings for texts, in input order, embedding only what isn't cached.
+
+        Args:
+            model: Ollama embedding model name
+            texts: Texts to embed
+
+        Returns:
+            One embedding (list of floats) per input text
+
+        Raises:
+            RuntimeError: If Ollama fails to embed the uncached texts
+        """
+        if not texts:
+            return []
+
+        keys = [text_hash(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+
+        with self._memory_lock:
+            for key in keys:
+                vector = self._memory.get((model, key))
+                if vector is not None:
+                    self._memory.move_to_end((model, key))
+                    vectors[key] = vector
+        self.stats["memory_hits"] += len(vectors)
+
+        # Unique misses, in first-seen order
+        missing = list(dict.fromkeys(key for key in keys if key not in vectors))
+
+        if missing and self._disk is not None:
+            try:
+                from_disk = self._disk.get_many(model, missing)
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+                from_disk = {}
+            vectors.update(from_disk)
+            self.stats["disk_hits"] += len(from_disk)
+            self._remember(model, from_disk)
+            missing = [key for key in missing if key not in from_disk]
+
+        if missing:
+            text_of = dict(zip(keys, texts))
+            fresh = self._embed_uncached(model, [text_of[key] for key in missing])
+            fresh_vectors = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(missing, fresh)}
+            vectors.update(fresh_vectors)
+            self.stats["embedded"] += len(fresh_vectors)
+            self._remember(model, fresh_vectors)
+            if self._disk is not None:
+                try:
+                    self._disk.put_many(model, fresh_vectors)
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding cache write failed: {e}")
+
+        return [vectors[key].tolist() for key in keys]
+
+    def _remember(self, model: str, vectors: Dict[str, np.ndarray]):
+        if not vectors or self.memory_cache_size <= 0:
+            return
+        with self._memory_lock:
+            for key, vector in vectors.items():
+                self._memory[(model, key)] = vector
+                self._memory.move_to_end((model, key))
+            while len(self._memory) > self.memory_cache_size:
+                self._memory.popitem(last=False)
+
+    def _embed_uncached(self, model: str, texts: List[str]) -> List[List[float]]:
+        """Embed texts via /api/embed in batches, at most max_concurrency requests at a time."""
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if len(batches) == 1:
+            return self._embed_batch_with_fallback(model, batches[0])
+
+        logger.info(f"Embedding {len(texts)} uncached texts in {len(batches)} batches...")
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+            results = list(executor.map(lambda batch: self._embed_batch_with_fallback(model, batch), batches))
+        return [embedding for batch_embeddings in results for embedding in batch_embeddings]
+
+    def _embed_batch_with_fallback(self, model: str, texts: List[str]) -> List[List[float]]:
+        try:
+            return self._embed_batch(model, texts)
+        except RuntimeError as e:
+            if len(texts) == 1:
+                raise
+            logger.error(f"Batch embedding failed, falling back to one text per call: {e}")
+            return [self._embed_batch(model, [text])[0] for text in texts]
+
+    def _embed_batch(self, model: str, texts: List[str], max_retries: int = 3) -> List[List[float]]:
+        """Generate embeddings for a batch of texts in a single API call."""
+        for attempt in range(max_retries):
+            try:
+                with self._request_slots:
+                    response = requests.post(
+                        self.api_url,
+                        json={"model": model, "input": texts},
+                        timeout=120
+                    )
+                response.raise_for_status()
+                embeddings = response.json()["embeddings"]
+                if len(embeddings) != len(texts):
+                    raise ValueError(f"expected {len(texts)} embeddings, got {len(embeddings)}")
+                return embeddings
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    logger.warning(f"Batch embedding failed (attempt {attempt + 1}): {e}")
+                    time.sleep(2)
+                else:
+                    raise RuntimeError(f"Failed to embed batch of {len(texts)} texts: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = dict(self.stats)
+        with self._memory_lock:
+            stats["memory_entries"] = len(self._memory)
+        if self._disk is not None:
+            try:
+                stats["disk_entries"] = self._disk.count()
+            except sqlite3.Error:
+                pass
+        return stats
+
+
+# Global instance
+_embedding_service = None
+_embedding_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get or create global embedding service instance."""
+    global _embedding_service
+    if _embedding_service is None:
+        with _embedding_service_lock:
+            if _embedding_service is None:
+                _embedding_service = EmbeddingService()
+    return _embedding_service
@@ -6,9 +6,15 @@ from unstructured text for enrichment with threat intelligence APIs.
 """
 
 import logging
+import multiprocessing
+import os
 import re
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Set
+from itertools import islice
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +48,185 @@ BENIGN_IPS = {
 }
 
 
+# Well-known threat actor names (matched with word boundaries, case-insensitive)
+WELL_KNOWN_ACTORS = [
+    # APT groups
+    'Lazarus', 'Lazarus Group',
+    'Fancy Bear', 'Cozy Bear',
+    'Sandworm', 'Turla',
+    'Kimsuky', 'Charming Kitten',
+    'OceanLotus', 'Ocean Lotus',
+    'Equation Group',
+    'Scattered Spider',
+    'Nobelium', 'Midnight Blizzard',
+    'Volt Typhoon', 'Salt Typhoon',
+    # Ransomware families
+    'ALPHV', 'BlackCat',
+    'LockBit', 'Conti', 'REvil',
+    'CrazyHunter', 'Akira', 'Play',
+    'Royal', 'Black Basta', 'BlackBasta',
+    'Cl0p', 'Clop', 'Cuba', 'Hive',
+    'Medusa', 'Rhysida', 'BianLian',
+    'NoEscape', 'Cactus', 'Hunters International',
+    'Qilin', 'INC Ransom', 'RansomHub',
+    'DragonForce', 'Fog', 'Lynx',
+]
+
+# Known malware families, RATs, infostealers, backdoors, loaders
+KNOWN_MALWARE = [
+    # RATs and backdoors
+    'Cobalt Strike', 'CobaltStrike', 'Beacon',
+    'Mimikatz', 'Meterpreter', 'Metasploit',
+    'AsyncRAT', 'QuasarRAT', 'Quasar', 'NjRAT', 'njRAT',
+    'DarkComet', 'Remcos', 'RemcosRAT', 'NanoCore',
+    'Poison Ivy', 'PoisonIvy', 'Gh0st', 'Gh0stRAT',
+    'PlugX', 'ShadowPad', 'Winnti',
+    'InvisibleFerret', 'BeaverTail',  # North Korea tools
+    'AppleJeus', 'TraderTraitor',
+    'KEYMARBLE', 'HARDRAIN', 'BADCALL',
+    # Infostealers
+    'RedLine', 'Redline Stealer', 'Raccoon', 'Raccoon Stealer',
+    'Vidar', 'Lumma', 'LummaC2', 'Lumma Stealer',
+    'StealC', 'Rhadamanthys', 'Stealc',
+    'FormBook', 'Formbook', 'XLoader',
+    'AgentTesla', 'Agent Tesla', 'SnakeKeylogger', 'Snake Keylogger',
+    'Pony', 'Lokibot', 'LokiBot', 'AZORult', 'Azorult',
+    # Loaders and droppers
+    'Emotet', 'TrickBot', 'Trickbot', 'BazarLoader', 'Bazar',
+    'IcedID', 'QakBot', 'Qakbot', 'QBot', 'Qbot',
+    'BumbleBee', 'Bumblebee', 'PikaBot', 'Pikabot',
+    'SmokeLoader', 'Smokeloader', 'GuLoader', 'Guloader',
+    'SocGholish', 'FakeUpdates',
+    # Other malware families
+    'SystemBC', 'Sliver', 'Brute Ratel', 'BruteRatel',
+    'Havoc', 'Nighthawk', 'Mythic',
+    'PyLangGhost', 'GolangGhost',  # North Korea tools
+    'KANDYKORN', 'SugarLoader', 'SUGARLOADER',
+    'RustBucket', 'KandyKorn',
+    # Additional tools and frameworks
+    'Empire', 'PowerShell Empire',
+    'BloodHound', 'SharpHound',
+    'Rubeus', 'Certify', 'Seatbelt',
+    'LaZagne', 'SharpDPAPI',
+    'Impacket', 'PsExec', 'WMIExec',
+    # Windows-based backdoors and frameworks
+    'Winos4.0', 'Winos', 'WinosStager',
+]
+
+APT_ID_PATTERN = re.compile(
+    r'\b(?:'
+    r'APT-?\d+'      # APT28, APT-28
+    r'|UNC\d+'       # UNC2452
+    r'|FIN\d+'       # FIN7
+    r'|TA\d+'        # TA505
+    r'|DEV-\d+'      # DEV-0537
+    r'|STORM-\d+'    # STORM-0558
+    r')\b',
+    re.IGNORECASE
+)
+
+# Only proper noun names - CamelCase (CrazyHunter) or capitalized (Akira)
+# Case-sensitive to avoid matching "the ransomware", "go-based ransomware", etc.
+RANSOMWARE_NAME_PATTERN = re.compile(r'\b([A-Z][a-z]+(?:[A-Z][a-z0-9]*)*)\s+ransomware\b')
+
+# Skip common words, verbs (from MITRE descriptions), and generic terms
+RANSOMWARE_NAME_FALSE_POSITIVES = {
+    'The', 'This', 'That', 'New', 'Old', 'Some', 'Any', 'Each', 'Our', 'Their',
+    'Executed', 'Propagated', 'Deployed', 'Distributed', 'Disguised', 'Downloaded',
+    'Encrypted', 'Delivered', 'Launched', 'Installed', 'Targeted', 'Modified',
+    'Prince',  # Often appears as "fork of Prince ransomware" - context, not actor
+}
+
+
+def _is_word_char(char: str) -> bool:
+    """Same definition of a word character as re's \\b for str patterns."""
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive whole-word matcher for a fixed set of names.
+
+    Equivalent to running re.search(r'\\b' + re.escape(name) + r'\\b', text, re.IGNORECASE)
+    for every name, but built once and evaluated in a single scan of the text: a
+    character trie is walked from each position that can start a name, so names
+    sharing a prefix ("Lazarus" / "Lazarus Group") are all found in the same walk.
+    """
+
+    _END = object()
+
+    def __init__(self, names: Iterable[str]):
+        self.root: dict = {}
+        self.size = 0
+        for name in names:
+            key = name.lower()
+            if not key:
+                continue
+            node = self.root
+            for char in key:
+                node = node.setdefault(char, {})
+            if self._END not in node:
+                node[self._END] = key
+                self.size += 1
+
+    def find(self, text: str) -> Dict[str, str]:
+        """
+        Find every name that occurs in the text as a whole word.
+
+        Returns:
+            Dict of lowercase name -> first occurrence as it appears in the text
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters expand when lowercased; keep offsets aligned with the original
+            lowered = ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+        found: Dict[str, str] = {}
+        root = self.root
+        length = len(text)
+        for start in range(length):
+            node = root.get(lowered[start])
+            if node is None:
+                continue
+            # \b before the name: word-ness of the previous char differs from the name's first char
+            if (start > 0 and _is_word_char(text[start - 1])) == _is_word_char(text[start]):
+                continue
+            end = start + 1
+            while node is not None:
+                key = node.get(self._END)
+                if key is not None and key not in found:
+                    # \b after the name
+                    if (end < length and _is_word_char(text[end])) != _is_word_char(text[end - 1]):
+                        found[key] = text[start:end]
+                if end >= length:
+                    break
+                node = node.get(lowered[end])
+                end += 1
+        return found
+
+
+_well_known_actor_matcher = KeywordMatcher(WELL_KNOWN_ACTORS)
+_known_malware_matcher = KeywordMatcher(KNOWN_MALWARE)
+
+# Matcher over the APT database names, rebuilt only when the name set changes
+_apt_name_matcher_source: FrozenSet[str] = frozenset()
+_apt_name_matcher: KeywordMatcher = KeywordMatcher(())
+_apt_name_matcher_lock = threading.Lock()
+
+
+def _get_apt_name_matcher(known_apt_names: Set[str]) -> KeywordMatcher:
+    """Return the matcher for the APT database names, rebuilding it if the names changed."""
+    global _apt_name_matcher_source, _apt_name_matcher
+
+    with _apt_name_matcher_lock:
+        if known_apt_names is not _apt_name_matcher_source and frozenset(known_apt_names) != _apt_name_matcher_source:
+            # Skip very short names (3 chars or less) to avoid false positives
+            _apt_name_matcher = KeywordMatcher(name for name in known_apt_names if len(name) > 3)
+            _apt_name_matcher_source = frozenset(known_apt_names)
+            logger.debug(f"Built APT name matcher for {_apt_name_matcher.size} names")
+        return _apt_name_matcher
+
+
 @dataclass
 class ThreatActorInfo:
     """Threat actor with alias information."""
@@ -305,74 +490,20 @@ def extract_threat_actors(text: str, known_apt_names: Set[str] = None) -> List[s
 
     # Strategy 1: Match known APT names (with word boundaries to avoid partial matches)
     if known_apt_names:
-        for apt_name in known_apt_names:
-            # Skip very short names (3 chars or less) to avoid false positives
-            if len(apt_name) <= 3:
-                continue
-            # Use word boundaries to match whole words only
-            pattern = re.compile(r'\b' + re.escape(apt_name) + r'\b', re.IGNORECASE)
-            match = pattern.search(text)
-            if match:
-                actors.add(match.group())
-
-    # Strategy 2: Match APT/UNC/FIN/TA patterns
-    apt_patterns = [
-        r'\bAPT[-]?\d+\b',           # APT28, APT-28
-        r'\bUNC\d+\b',                # UNC2452
-        r'\bFIN\d+\b',                # FIN7
-        r'\bTA\d+\b',                 # TA505
-        r'\bDEV-\d+\b',               # DEV-0537
-        r'\bSTORM-\d+\b',             # STORM-0558
-    ]
-    for pattern in apt_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        actors.update(m.upper() for m in matches)
-
-    # Strategy 3: Match well-known threat actor names (with word boundaries)
-    well_known_actors = [
-        # APT groups
-        'Lazarus', 'Lazarus Group',
-        'Fancy Bear', 'Cozy Bear',
-        'Sandworm', 'Turla',
-        'Kimsuky', 'Charming Kitten',
-        'OceanLotus', 'Ocean Lotus',
-        'Equation Group',
-        'Scattered Spider',
-        'Nobelium', 'Midnight Blizzard',
-        'Volt Typhoon', 'Salt Typhoon',
-        # Ransomware families
-        'ALPHV', 'BlackCat',
-        'LockBit', 'Conti', 'REvil',
-        'CrazyHunter', 'Akira', 'Play',
-        'Royal', 'Black Basta', 'BlackBasta',
-        'Cl0p', 'Clop', 'Cuba', 'Hive',
-        'Medusa', 'Rhysida', 'BianLian',
-        'NoEscape', 'Cactus', 'Hunters International',
-        'Qilin', 'INC Ransom', 'RansomHub',
-        'DragonForce', 'Fog', 'Lynx',
-    ]
-    for actor in well_known_actors:
-        # Use word boundaries to avoid matching "Conti" in "continues"
-        pattern = re.compile(r'\b' + re.escape(actor) + r'\b', re.IGNORECASE)
-        match = pattern.search(text)
-        if match:
-            actors.add(match.group())
+        actors.update(_get_apt_name_matcher(known_apt_names).find(text).values())
+
+    # Strategy 2: Match APT/UNC/FIN/TA/DEV/STORM patterns
+    actors.update(m.upper() for m in APT_ID_PATTERN.findall(text))
+
+    # Strategy 3: Match well-known threat actor names
+    # (word boundaries avoid matching "Conti" in "continues")
+    actors.update(_well_known_actor_matcher.find(text).values())
 
     # Strategy 4: Catch "X ransomware" pattern (e.g., "CrazyHunter ransomware")
-    # Only match proper noun names - CamelCase (CrazyHunter) or capitalized (Akira)
-    # Case-sensitive to avoid matching "the ransomware", "go-based ransomware", etc.
-    ransomware_pattern = re.compile(r'\b([A-Z][a-z]+(?:[A-Z][a-z0-9]*)*)\s+ransomware\b')
-    # Skip common words, verbs (from MITRE descriptions), and generic terms
-    false_positives = {
-        'The', 'This', 'That', 'New', 'Old', 'Some', 'Any', 'Each', 'Our', 'Their',
-        'Executed', 'Propagated', 'Deployed', 'Distributed', 'Disguised', 'Downloaded',
-        'Encrypted', 'Delivered', 'Launched', 'Installed', 'Targeted', 'Modified',
-        'Prince',  # Often appears as "fork of Prince ransomware" - context, not actor
-    }
-    for match in ransomware_pattern.finditer(text):
+    for match in RANSOMWARE_NAME_PATTERN.finditer(text):
         name = match.group(1)
         # Skip false positives and names < 4 chars
-        if name not in false_positives and len(name) >= 4:
+        if name not in RANSOMWARE_NAME_FALSE_POSITIVES and len(name) >= 4:
             actors.add(name)
 
     return list(actors)
@@ -384,56 +515,8 @@ def extract_malware_families(text: str) -> List[str]:
 
     Includes RATs, infostealers, backdoors, loaders, and offensive tools.
     """
-    malware = set()
-
-    # Known malware families, RATs, infostealers, backdoors, loaders
-    known_malware = [
-        # RATs and backdoors
-        'Cobalt Strike', 'CobaltStrike', 'Beacon',
-        'Mimikatz', 'Meterpreter', 'Metasploit',
-        'AsyncRAT', 'QuasarRAT', 'Quasar', 'NjRAT', 'njRAT',
-        'DarkComet', 'Remcos', 'RemcosRAT', 'NanoCore',
-        'Poison Ivy', 'PoisonIvy', 'Gh0st', 'Gh0stRAT',
-        'PlugX', 'ShadowPad', 'Winnti',
-        'InvisibleFerret', 'BeaverTail',  # North Korea tools
-        'AppleJeus', 'TraderTraitor',
-        'KEYMARBLE', 'HARDRAIN', 'BADCALL',
-        # Infostealers
-        'RedLine', 'Redline Stealer', 'Raccoon', 'Raccoon Stealer',
-        'Vidar', 'Lumma', 'LummaC2', 'Lumma Stealer',
-        'StealC', 'Rhadamanthys', 'Stealc',
-        'FormBook', 'Formbook', 'XLoader',
-        'AgentTesla', 'Agent Tesla', 'SnakeKeylogger', 'Snake Keylogger',
-        'Pony', 'Lokibot', 'LokiBot', 'AZORult', 'Azorult',
-        # Loaders and droppers
-        'Emotet', 'TrickBot', 'Trickbot', 'BazarLoader', 'Bazar',
-        'IcedID', 'QakBot', 'Qakbot', 'QBot', 'Qbot',
-        'BumbleBee', 'Bumblebee', 'PikaBot', 'Pikabot',
-        'SmokeLoader', 'Smokeloader', 'GuLoader', 'Guloader',
-        'SocGholish', 'FakeUpdates',
-        # Other malware families
-        'SystemBC', 'Sliver', 'Brute Ratel', 'BruteRatel',
-        'Havoc', 'Nighthawk', 'Mythic',
-        'PyLangGhost', 'GolangGhost',  # North Korea tools
-        'KANDYKORN', 'SugarLoader', 'SUGARLOADER',
-        'RustBucket', 'KandyKorn',
-        # Additional tools and frameworks
-        'Empire', 'PowerShell Empire',
-        'BloodHound', 'SharpHound',
-        'Rubeus', 'Certify', 'Seatbelt',
-        'LaZagne', 'SharpDPAPI',
-        'Impacket', 'PsExec', 'WMIExec',
-        # Windows-based backdoors and frameworks
-        'Winos4.0', 'Winos', 'WinosStager',
-    ]
-
-    for malware_name in known_malware:
-        # Use word boundaries to match whole words only
-        pattern = re.compile(r'\b' + re.escape(malware_name) + r'\b', re.IGNORECASE)
-        match = pattern.search(text)
-        if match:
-            # Normalize the name (use the matched case or standardize)
-            malware.add(match.group())
+    # Whole-word, case-insensitive; keeps the name as matched in the text
+    malware = set(_known_malware_matcher.find(text).values())
 
     return list(malware)
 
@@ -449,17 +532,18 @@ def load_known_apt_names() -> Set[str]:
     """
     Load known APT names from the APT names database.
 
+    Served from the shared APT knowledge cache, so the spreadsheet is only parsed
+    when it changes. The same set object is returned while the database is unchanged.
     Returns empty set if database is not available.
     """
     try:
         import os
-        from src.components.apt_names_fetcher import get_all_apt_names
+        from src.components.apt_names_fetcher import load_apt_knowledge
 
         apt_file = _get_apt_database_path()
 
         if os.path.exists(apt_file):
-            names = get_all_apt_names(file_path=apt_file)
-            return set(names) if names else set()
+            return load_apt_knowledge(apt_file)['common_name_set']
         else:
             logger.debug(f"APT database not found at {apt_file}")
             return set()
@@ -468,38 +552,27 @@ def load_known_apt_names() -> Set[str]:
         return set()
 
 
-# Cache for APT alias index to avoid reloading
-_apt_alias_index_cache: dict = None
-
-
 def load_apt_alias_index() -> dict:
     """
     Load the APT alias index for cross-referencing names.
 
     Returns dict mapping lowercase name -> actor info with all aliases.
-    Cached after first load.
+    Served from the shared APT knowledge cache (reloaded when the database changes);
+    the returned dict is shared, so treat it as read-only.
     """
-    global _apt_alias_index_cache
-
-    if _apt_alias_index_cache is not None:
-        return _apt_alias_index_cache
-
     try:
         import os
-        from src.components.apt_names_fetcher import build_apt_alias_index
+        from src.components.apt_names_fetcher import load_apt_knowledge
 
         apt_file = _get_apt_database_path()
 
         if os.path.exists(apt_file):
-            _apt_alias_index_cache = build_apt_alias_index(file_path=apt_file)
-            return _apt_alias_index_cache
+            return load_apt_knowledge(apt_file)['alias_index']
         else:
             logger.debug(f"APT database not found at {apt_file}")
-            _apt_alias_index_cache = {}
             return {}
     except Exception as e:
         logger.debug(f"Could not load APT alias index: {e}")
-        _apt_alias_index_cache = {}
         return {}
 
 
@@ -553,7 +626,7 @@ def extract_entities(text: str, include_apt_database: bool = True) -> ExtractedE
                 name=actor_name,
                 common_name=common_name,
                 region=actor_info.get('region', ''),
-                all_names=actor_info.get('all_names', []),
+                all_names=list(actor_info.get('all_names', [])),
             )
         else:
             # No database match, just use the raw name
@@ -584,6 +657,90 @@ def extract_entities(text: str, include_apt_database: bool = True) -> ExtractedE
     return entities
 
 
+# Texts handed to a worker process per task by the batch APIs
+BATCH_CHUNK_SIZE = 32
+
+
+def _init_extraction_worker(include_apt_database: bool) -> None:
+    """Build the APT knowledge cache and name matcher once per worker process."""
+    if include_apt_database:
+        _get_apt_name_matcher(load_known_apt_names())
+        load_apt_alias_index()
+
+
+def _extract_entities_chunk(texts: List[str], include_apt_database: bool) -> List[ExtractedEntities]:
+    return [extract_entities(text, include_apt_database) for text in texts]
+
+
+def _chunks(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(texts)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _extraction_pool(workers: int, include_apt_database: bool) -> ProcessPoolExecutor:
+    # Never fork: callers run inside the threaded bot, and a forked child can inherit a lock
+    # some other thread held at fork time and deadlock. Workers build their own matchers instead.
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    context = multiprocessing.get_context(start_method)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_extraction_worker,
+        initargs=(include_apt_database,),
+    )
+
+
+def extract_entities_batch(texts: List[str], workers: Optional[int] = None,
+                           include_apt_database: bool = True) -> List[ExtractedEntities]:
+    """
+    Extract entities from many texts across a pool of worker processes.
+
+    Args:
+        texts: Texts to extract entities from
+        workers: Number of worker processes (default: CPU count; 1 runs in-process)
+        include_apt_database: Whether to match against APT names database
+
+    Returns:
+        ExtractedEntities for each text, in input order
+    """
+    return list(iter_extract_entities(texts, workers, include_apt_database))
+
+
+def iter_extract_entities(texts: Iterable[str], workers: Optional[int] = None,
+                          include_apt_database: bool = True,
+                          chunk_size: int = BATCH_CHUNK_SIZE) -> Iterator[ExtractedEntities]:
+    """
+    Streaming variant of extract_entities_batch for generators and large inputs.
+
+    Texts are consumed lazily in chunks and only a bounded number of chunks are
+    in flight at once, so memory stays flat regardless of input size.
+
+    Args:
+        texts: Iterable of texts (may be a generator)
+        workers: Number of worker processes (default: CPU count; 1 runs in-process)
+        include_apt_database: Whether to match against APT names database
+        chunk_size: Texts per worker task
+
+    Yields:
+        ExtractedEntities for each text, in input order
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for text in texts:
+            yield extract_entities(text, include_apt_database)
+        return
+
+    with _extraction_pool(workers, include_apt_database) as pool:
+        in_flight = deque()
+        for chunk in _chunks(texts, chunk_size):
+            in_flight.append(pool.submit(_extract_entities_chunk, chunk, include_apt_database))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
 # CLI for testing
 if __name__ == "__main__":
     import sys
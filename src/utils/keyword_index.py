@@ -0,0 +1,195 @@
+"""
+In-memory inverted index with BM25 scoring for keyword search.
+
+Used by the tipper index and the rules catalog so keyword lookups don't scan
+(or even touch) their Chroma collections. The index is built at sync time,
+saved as JSON next to the collection, and loaded once per process; a reload only
+happens when the file on disk changes.
+
+Each document has a few named text fields (e.g. title, tags) and a payload
+(usually the Chroma metadata) returned with matches. Query cost depends on the
+postings of the query tokens, not on corpus size.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+KEYWORD_INDEX_VERSION = 2
+
+# BM25 parameters (standard Okapi defaults)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens of a text."""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class KeywordIndex:
+    """Token -> document postings per field, with BM25 statistics."""
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = tuple(fields)
+        self.doc_ids: List[str] = []
+        self.payloads: List[Dict[str, Any]] = []
+        # field -> token -> {doc position: term frequency}
+        self.postings: Dict[str, Dict[str, Dict[int, int]]] = {field: defaultdict(dict) for field in self.fields}
+        # field -> token count per document
+        self.lengths: Dict[str, List[int]] = {field: [] for field in self.fields}
+
+    @classmethod
+    def build(cls, fields: Sequence[str],
+              documents: Iterable[Tuple[str, Dict[str, str], Dict[str, Any]]]) -> 'KeywordIndex':
+        """Build an index from (doc_id, {field: text}, payload) tuples."""
+        index = cls(fields)
+        for doc_id, texts, payload in documents:
+            pos = len(index.doc_ids)
+            index.doc_ids.append(doc_id)
+            index.payloads.append(payload)
+            for field in index.fields:
+                tokens = tokenize(texts.get(field) or '')
+                index.lengths[field].append(len(tokens))
+                for token, tf in Counter(tokens).items():
+                    index.postings[field][token][pos] = tf
+        # Freeze: plain dicts don't grow on lookups
+        index.postings = {field: dict(postings) for field, postings in index.postings.items()}
+        return index
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def matching(self, term: str, field: str) -> Dict[int, int]:
+        """Documents whose field contains every token of term, with the summed term frequency."""
+        tokens = tokenize(term)
+        if not tokens:
+            return {}
+        postings = self.postings[field]
+        candidates = postings.get(tokens[0], {})
+        if len(tokens) == 1:
+            return candidates
+        result = {}
+        for pos, tf in candidates.items():
+            total = tf
+            for token in tokens[1:]:
+                other = postings.get(token, {}).get(pos)
+                if other is None:
+                    break
+                total += other
+            else:
+                result[pos] = total
+        return result
+
+    def bm25(self, terms: Iterable[str], field: str) -> Dict[int, float]:
+        """BM25 score of each document matching at least one term in field."""
+        lengths = self.lengths[field]
+        n_docs = len(lengths)
+        if not n_docs:
+            return {}
+        avg_length = (sum(lengths) / n_docs) or 1.0
+        postings = self.postings[field]
+
+        scores: Dict[int, float] = defaultdict(float)
+        for token in {token for term in terms for token in tokenize(term)}:
+            docs = postings.get(token)
+            if not docs:
+                continue
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for pos, tf in docs.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[pos] / avg_length)
+                scores[pos] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return scores
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form; postings become [[doc position, term frequency], ...] lists."""
+        return {
+            'fields': list(self.fields),
+            'doc_ids': self.doc_ids,
+            'payloads': self.payloads,
+            'postings': {
+                field: {token: list(docs.items()) for token, docs in postings.items()}
+                for field, postings in self.postings.items()
+            },
+            'lengths': self.lengths,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'KeywordIndex':
+        """Inverse of to_dict."""
+        index = cls(data['fields'])
+        index.doc_ids = data['doc_ids']
+        index.payloads = data['payloads']
+        index.postings = {
+            field: {token: {pos: tf for pos, tf in docs} for token, docs in postings.items()}
+            for field, postings in data['postings'].items()
+        }
+        index.lengths = data['lengths']
+        return index
+
+    def save(self, path: Path):
+        """Write the index as JSON atomically and make it the process-wide copy for path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': KEYWORD_INDEX_VERSION, 'index': self.to_dict()}, f)
+        os.replace(tmp_path, path)
+        with _loaded_lock:
+            _loaded[str(path)] = (_file_signature(path), self)
+        logger.info(f"Saved keyword index with {len(self)} documents to {path}")
+
+
+# Process-wide cache: path -> ((mtime_ns, size), index)
+_loaded: Dict[str, Tuple[Tuple[int, int], KeywordIndex]] = {}
+_loaded_lock = threading.Lock()
+
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_keyword_index(path: Path) -> Optional[KeywordIndex]:
+    """Load a saved index, reusing the in-memory copy unless the file changed.
+
+    Returns:
+        The index, or None if it doesn't exist or can't be read
+    """
+    path = Path(path)
+    try:
+        signature = _file_signature(path)
+    except FileNotFoundError:
+        return None
+
+    cached = _loaded.get(str(path))
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    with _loaded_lock:
+        cached = _loaded.get(str(path))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != KEYWORD_INDEX_VERSION:
+                logger.info(f"Keyword index {path} has an old format, ignoring it")
+                return None
+            index = KeywordIndex.from_dict(data['index'])
+        except Exception as e:
+            logger.warning(f"Could not load keyword index {path}: {e}")
+            return None
+        _loaded[str(path)] = (signature, index)
+        logger.info(f"Loaded keyword index with {len(index)} documents from {path}")
+        return index
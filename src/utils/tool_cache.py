@@ -0,0 +1,166 @@
+"""
+Tool Result Cache
+
+Process-wide cache for read-only bot tools, shared across sessions and rooms,
+so repeated lookups (the same IP in VirusTotal a minute later, the current
+staffing, ...) return immediately instead of waiting on the upstream API.
+
+Each tool sets its own TTL. Arguments are bound to the tool's signature and
+normalized (whitespace stripped, optionally lowercased) to build the key.
+Error results are never cached.
+
+Usage:
+    @tool
+    @log_tool_call
+    @cache_tool_result(ttl=HOUR, case_insensitive=True)
+    def lookup_ip_virustotal(ip_address: str) -> str:
+        ...
+"""
+
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+MAX_ENTRIES = 2048
+
+# Results that mean the lookup didn't work; caching them would hide recovery
+ERROR_PREFIXES = ('error', 'unable', 'failed', '❌')
+
+
+def _is_cacheable(result: Any) -> bool:
+    if result is None:
+        return False
+    if isinstance(result, str):
+        return bool(result.strip()) and not result.lstrip().lower().startswith(ERROR_PREFIXES)
+    return True
+
+
+def _normalize(value: Any, case_insensitive: bool) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        return value.lower() if case_insensitive else value
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item, case_insensitive) for item in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v, case_insensitive) for k, v in value.items()}
+    return value
+
+
+class ToolResultCache:
+    """Thread-safe TTL + LRU cache of tool results with per-tool hit/miss counters."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()  # (tool, key) -> (expires_at, result)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    def get(self, tool_name: str, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get((tool_name, key))
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end((tool_name, key))
+                self._stats[tool_name]['hits'] += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[(tool_name, key)]
+            self._stats[tool_name]['misses'] += 1
+            return None
+
+    def put(self, tool_name: str, key: str, result: Any, ttl_seconds: float):
+        if ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[(tool_name, key)] = (time.time() + ttl_seconds, result)
+            self._entries.move_to_end((tool_name, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tool_name: str = None):
+        """Drop cached results for one tool, or everything."""
+        with self._lock:
+            if tool_name is None:
+                self._entries.clear()
+            else:
+                for entry_key in [k for k in self._entries if k[0] == tool_name]:
+                    del self._entries[entry_key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Overall and per-tool hit/miss counts."""
+        with self._lock:
+            tools = {name: dict(counts) for name, counts in self._stats.items()}
+            entries = len(self._entries)
+        hits = sum(counts['hits'] for counts in tools.values())
+        misses = sum(counts['misses'] for counts in tools.values())
+        total = hits + misses
+        return {
+            'entries': entries,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(100 * hits / total, 1) if total else 0.0,
+            'tools': tools,
+        }
+
+
+# Global instance
+_tool_cache = None
+_tool_cache_lock = threading.Lock()
+
+
+def get_tool_cache() -> ToolResultCache:
+    """Get or create global tool result cache instance."""
+    global _tool_cache
+    if _tool_cache is None:
+        with _tool_cache_lock:
+            if _tool_cache is None:
+                _tool_cache = ToolResultCache()
+    return _tool_cache
+
+
+def cache_tool_result(ttl: Union[float, Callable[[], float]], case_insensitive: bool = False) -> Callable:
+    """
+    Decorator to cache a read-only tool's result.
+
+    Args:
+        ttl: Seconds to keep a result, or a callable returning it at call time
+             (e.g. seconds until the next shift change)
+        case_insensitive: Lowercase string arguments for the key (IPs, domains, hashes)
+    """
+    def decorator(tool_func: Callable) -> Callable:
+        signature = inspect.signature(tool_func)
+        tool_name = tool_func.__name__
+
+        @functools.wraps(tool_func)
+        def wrapper(*args, **kwargs) -> Any:
+            try:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = json.dumps(_normalize(dict(bound.arguments), case_insensitive), sort_keys=True, default=str)
+            except (TypeError, ValueError):
+                return tool_func(*args, **kwargs)
+
+            cache = get_tool_cache()
+            cached = cache.get(tool_name, key)
+            if cached is not None:
+                logger.debug(f"Tool cache hit: {tool_name}")
+                return cached
+
+            result = tool_func(*args, **kwargs)
+            if _is_cacheable(result):
+                cache.put(tool_name, key, result, ttl() if callable(ttl) else ttl)
+            return result
+
+        return wrapper
+
+    return decorator
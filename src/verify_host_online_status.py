@@ -34,27 +34,40 @@ def send_webex_notification(host_name, ticket_id):
     )
 
 
+def _parse_offline_hosts(offline_hosts_data):
+    """Parse the offline hosts list into 'hostname-ticket' entries."""
+    # Always treat as comma-separated string
+    if isinstance(offline_hosts_data, str):
+        return [item.strip() for item in offline_hosts_data.split(',') if '-' in item]
+    if isinstance(offline_hosts_data, list):
+        # Defensive: flatten any accidental list (shouldn't happen with save_as_text)
+        return [item.strip() for item in offline_hosts_data if '-' in item]
+    return []
+
+
 def start():
     try:
         offline_hosts_data = prod_list_handler.get_list_data_by_name(offline_hosts_list_name)
         if not offline_hosts_data:
             return
-        # Always treat as comma-separated string
-        if isinstance(offline_hosts_data, str):
-            offline_hosts = [item.strip() for item in offline_hosts_data.split(',') if '-' in item]
-        elif isinstance(offline_hosts_data, list):
-            # Defensive: flatten any accidental list (shouldn't happen with save_as_text)
-            offline_hosts = [item.strip() for item in offline_hosts_data if '-' in item]
-        else:
-            offline_hosts = []
+        offline_hosts = _parse_offline_hosts(offline_hosts_data)
         host_ticket_map = dict(item.split('-', 1) for item in offline_hosts)
+        # One bulk lookup for all hosts instead of two API calls per host
+        online_states = crowdstrike.get_online_states(list(host_ticket_map))
         online_hosts = []
         for hostname, ticket_id in host_ticket_map.items():
-            if crowdstrike.get_device_online_state(hostname) == "online":
+            if online_states.get(hostname) == "online":
                 send_webex_notification(hostname, ticket_id)
                 online_hosts.append(f"{hostname}-{ticket_id}")
         if online_hosts:
-            prod_list_handler.save_as_text(offline_hosts_list_name, list(set(offline_hosts) - set(online_hosts)))
+            # The read above may be cached; remove the hosts from a fresh copy and save it at that
+            # copy's version, so hosts added in the meantime aren't overwritten
+            fresh = prod_list_handler.read_for_update(offline_hosts_list_name)
+            if fresh is None:
+                return
+            version, current_data = fresh
+            remaining = set(_parse_offline_hosts(current_data)) - set(online_hosts)
+            prod_list_handler.save_as_text(offline_hosts_list_name, list(remaining), version)
     except Exception as ex:
         print(f"There was an issue in the VerifyHostOnlineStatus integration. Error: {str(ex)}")
 
@@ -0,0 +1,169 @@
+"""Parity tests: TicketFilterEngine must return exactly what apply_filters_to_incidents returns."""
+
+import math
+import random
+
+import pytest
+
+from src.components.web.meaningful_metrics_handler import apply_filters_to_incidents
+from src.components.web.metrics_filter_engine import TicketFilterEngine
+from src.components.web.metrics_ticket_store import IndexedTickets
+
+COUNTRIES = ['United States', 'India', 'Japan', 'Germany', None, '', '   ', 'Unknown']
+REGIONS = ['NA', 'APAC', 'EMEA', 'LATAM', None, '', 'Unknown']
+IMPACTS = ['Malicious True Positive', 'Benign True Positive', 'False Positive', 'Testing', None, '', 'Unknown']
+SEVERITIES = [0, 1, 2, 3, 4, None, '3']
+TYPES = ['METCIRT CrowdStrike Falcon Detection', 'METCIRT Qradar Alert', 'METCIRT Phishing', None]
+STATUSES = [0, 1, 2, None, '2']
+AUTOMATION_LEVELS = ['Full', 'Partial', 'Manual', None, '', 'Unknown']
+CREATED_DAYS_AGO = [0, 1, 6, 7, 8, 29, 30, 31, 89, 90, 91, 364, 365, 366, 12.5, None, math.nan]
+SECONDS = [None, 0, 1, 60, 179, 180, 181, 299, 300, 301, 899, 900, 901, 7200, math.nan]
+AGING_DAYS = [None, '', 0, 1, 3, 5, 7, 7.5, 30, '5', '12', 'abc', '  ', math.nan]
+
+
+def _make_incidents(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    incidents = []
+    for i in range(count):
+        incident = {
+            'id': str(i),
+            'affected_country': rng.choice(COUNTRIES),
+            'affected_region': rng.choice(REGIONS),
+            'impact': rng.choice(IMPACTS),
+            'severity': rng.choice(SEVERITIES),
+            'type': rng.choice(TYPES),
+            'status': rng.choice(STATUSES),
+            'automation_level': rng.choice(AUTOMATION_LEVELS),
+            'created_days_ago': rng.choice(CREATED_DAYS_AGO),
+            'time_to_respond_secs': rng.choice(SECONDS),
+            'time_to_contain_secs': rng.choice(SECONDS),
+            'has_hostname': rng.choice([True, False, None, 1, 0]),
+            'currently_aging_days': rng.choice(AGING_DAYS),
+        }
+        # Some rows lack fields entirely, as older cache entries do
+        for field in ('created_days_ago', 'time_to_contain_secs', 'currently_aging_days', 'has_hostname'):
+            if rng.random() < 0.05:
+                del incident[field]
+        incidents.append(incident)
+    return incidents
+
+
+INCIDENTS = _make_incidents(2000)
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return TicketFilterEngine(INCIDENTS)
+
+
+def _assert_parity(engine, filters):
+    expected = [item['id'] for item in apply_filters_to_incidents(INCIDENTS, filters)]
+    actual = [INCIDENTS[pos]['id'] for pos in engine.positions(filters)]
+    assert actual == expected, f"Mismatch for filters {filters}"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('filters', [
+    {},
+    {'dateRange': 30},
+    {'countries': [], 'regions': [], 'impacts': [], 'severities': [], 'ticketTypes': [], 'statuses': [],
+     'automationLevels': [], 'mttrFilter': 0, 'mttcFilter': 0, 'ageFilter': 0},
+])
+def test_empty_filters(engine, filters):
+    _assert_parity(engine, filters)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('date_range', [0, 1, 7, 7.5, 30, 90, 365, 366, 10000, -1])
+def test_date_ranges(engine, date_range):
+    _assert_parity(engine, {'dateRange': date_range})
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('filters', [
+    {'countries': ['United States']},
+    {'countries': ['No Country']},
+    {'countries': ['India', 'No Country']},
+    {'regions': ['APAC']},
+    {'regions': ['No Region', 'EMEA']},
+    # Regions decide the location match when both are selected
+    {'countries': ['United States'], 'regions': ['APAC']},
+    {'impacts': ['No Impact']},
+    {'impacts': ['Malicious True Positive', 'No Impact']},
+    {'severities': ['3']},
+    {'severities': ['None', '0']},
+    {'ticketTypes': ['METCIRT Qradar Alert']},
+    {'statuses': ['2', '1']},
+    {'statuses': ['None']},
+    {'automationLevels': ['No Level']},
+    {'automationLevels': ['Full', 'Manual']},
+])
+def test_categorical_filters(engine, filters):
+    _assert_parity(engine, filters)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('filters', [
+    {'countries': ['Atlantis']},
+    {'regions': ['Antarctica']},
+    {'impacts': ['Not An Impact']},
+    {'severities': ['42']},
+    {'ticketTypes': ['Nonexistent Type']},
+    {'statuses': ['closed']},
+    {'automationLevels': ['Robotic']},
+    {'countries': ['Atlantis', 'India']},
+])
+def test_unknown_values(engine, filters):
+    _assert_parity(engine, filters)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('mttr_filter', [0, 1, 2, 3, 4])
+@pytest.mark.parametrize('mttc_filter', [0, 1, 2, 3, 4])
+def test_sla_filters(engine, mttr_filter, mttc_filter):
+    _assert_parity(engine, {'mttrFilter': mttr_filter, 'mttcFilter': mttc_filter, 'dateRange': 365})
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('age_filter', [0, 1, 3, 5, 7, 7.5, 30, 1000])
+def test_age_filter(engine, age_filter):
+    _assert_parity(engine, {'ageFilter': age_filter, 'dateRange': 365})
+
+
+@pytest.mark.unit
+def test_random_filter_combinations(engine):
+    rng = random.Random(11)
+    options = {
+        'countries': ['United States', 'India', 'No Country', 'Atlantis'],
+        'regions': ['NA', 'APAC', 'No Region'],
+        'impacts': ['Malicious True Positive', 'False Positive', 'No Impact'],
+        'severities': ['1', '3', '4', 'None'],
+        'ticketTypes': TYPES[:3],
+        'statuses': ['0', '1', '2'],
+        'automationLevels': ['Full', 'Partial', 'No Level'],
+    }
+    for _ in range(300):
+        filters = {
+            'dateRange': rng.choice([1, 7, 30, 90, 365]),
+            'mttrFilter': rng.choice([0, 0, 1, 2, 3]),
+            'mttcFilter': rng.choice([0, 0, 1, 2, 3]),
+            'ageFilter': rng.choice([0, 0, 3, 7]),
+        }
+        for key, values in options.items():
+            if rng.random() < 0.3:
+                filters[key] = rng.sample(values, rng.randint(1, len(values)))
+        _assert_parity(engine, filters)
+
+
+@pytest.mark.unit
+def test_indexed_tickets_filter_matches_reference():
+    tickets = IndexedTickets(INCIDENTS, len(INCIDENTS), None, 'test')
+    filters = {'dateRange': 90, 'countries': ['India', 'No Country'], 'mttrFilter': 2, 'ageFilter': 3}
+    assert tickets.filter(filters) == apply_filters_to_incidents(INCIDENTS, filters)
+
+
+@pytest.mark.unit
+def test_empty_incident_list():
+    engine = TicketFilterEngine([])
+    assert list(engine.positions({'countries': ['India'], 'mttrFilter': 1, 'ageFilter': 3})) == []
+    assert apply_filters_to_incidents([], {'countries': ['India']}) == []
@@ -99,8 +99,7 @@ def api_pokedex_chat_stream():
                     user_message,
                     session_id,
                     request.remote_addr,
-                    ask_stream,
-                    get_state_manager
+                    ask_stream
                 ):
                     yield f"data: {json.dumps({'token': token})}\n\n"
 
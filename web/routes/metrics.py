@@ -67,6 +67,42 @@ def api_meaningful_metrics_data():
         return jsonify({'success': False, 'error': str(exc)}), 500
 
 
+@metrics_bp.route('/api/meaningful-metrics/data', methods=['POST'])
+@log_web_activity
+def api_meaningful_metrics_filtered_data():
+    """API to get cached security incident data filtered server-side."""
+    try:
+        data = request.get_json()
+        if not data or 'filters' not in data:
+            return jsonify({'success': False, 'error': 'No filters provided'}), 400
+
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = meaningful_metrics_handler.get_filtered_meaningful_metrics_data(base_dir, EASTERN, data['filters'])
+        return jsonify(result)
+    except FileNotFoundError:
+        return jsonify({'success': False, 'error': 'Cache file not found'}), 404
+    except Exception as exc:
+        return jsonify({'success': False, 'error': str(exc)}), 500
+
+
+@metrics_bp.route('/api/meaningful-metrics/aggregates', methods=['POST'])
+@log_web_activity
+def api_meaningful_metrics_aggregates():
+    """API to get chart and KPI aggregates computed server-side for the given filters."""
+    try:
+        data = request.get_json()
+        if not data or 'filters' not in data:
+            return jsonify({'success': False, 'error': 'No filters provided'}), 400
+
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = meaningful_metrics_handler.get_meaningful_metrics_aggregates(base_dir, EASTERN, data['filters'])
+        return jsonify(result)
+    except FileNotFoundError:
+        return jsonify({'success': False, 'error': 'Cache file not found'}), 404
+    except Exception as exc:
+        return jsonify({'success': False, 'error': str(exc)}), 500
+
+
 @metrics_bp.route('/api/meaningful-metrics/export', methods=['POST'])
 @log_web_activity
 def api_meaningful_metrics_export():
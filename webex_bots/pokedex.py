@@ -102,6 +102,7 @@ WEBEX_BOT_EMAIL = CONFIG.webex_bot_email_pokedex
 
 # Network logging configuration - set to False to improve performance
 SHOULD_LOG_NETWORK_TRAFFIC = False  # Change to False to disable network logging
+QUEUE_NOTICE_TIMEOUT_SECONDS = 10  # Webex edit telling a user their place in the LLM queue
 
 if not WEBEX_ACCESS_TOKEN:
     logger.error("WEBEX_ACCESS_TOKEN environment variable is required")
@@ -523,6 +524,7 @@ class Bot(WebexBot):
             import threading
             thinking_msg = None
             thinking_active = threading.Event()
+            queue_status = {'position': 0}  # Position in the LLM queue while waiting for a slot
 
             # Note: Session management is handled inside the ask() function
             # The LLM agent automatically manages conversation context via SQLite
@@ -550,6 +552,8 @@ class Bot(WebexBot):
                         if thinking_active.is_set():  # Check again after sleep
                             try:
                                 new_message = random.choice(THINKING_MESSAGES)
+                                if queue_status['position']:
+                                    new_message = f"⏳ You're #{queue_status['position']} in line for the model - {new_message}"
                                 # Try editing with proper API call format
                                 import requests
                                 update_url = f'https://webexapis.com/v1/messages/{thinking_msg.id}'
@@ -627,11 +631,32 @@ class Bot(WebexBot):
             else:
                 # Process query through LLM agent
                 try:
+                    def on_queued(position):
+                        first_update = not queue_status['position']
+                        queue_status['position'] = position
+                        # Tell the user right away why they're waiting; later updates ride on the thinking edits.
+                        # Posted from its own thread (with a timeout) so a slow Webex never holds up the
+                        # scheduler, which runs this callback while the request waits for its slot
+                        if first_update and position and thinking_msg:
+                            import requests
+                            threading.Thread(
+                                target=requests.put,
+                                args=(f'https://webexapis.com/v1/messages/{thinking_msg.id}',),
+                                kwargs={
+                                    'headers': {'Authorization': f'Bearer {self.access_token}', 'Content-Type': 'application/json'},
+                                    'json': {'roomId': teams_message.roomId,
+                                             'text': f"⏳ The model is busy with other questions - you're #{position} in line"},
+                                    'timeout': QUEUE_NOTICE_TIMEOUT_SECONDS,
+                                },
+                                daemon=True
+                            ).start()
+
                     # ask() now returns a dict with content, token counts, and timing data
                     result = ask(
                         raw_message,
                         user_id=teams_message.personEmail,
-                        room_id=room_name
+                        room_id=room_name,
+                        on_queued=on_queued
                     )
                     response_text = result['content']
                     input_tokens = result['input_tokens']
@@ -535,11 +535,12 @@ class Review(ToodlesCommand):
         curr_date = datetime.now()
         ticket_no = attachment_actions.inputs["incident_id"]
 
-        list_dict = prod_list_handler.get_list_data_by_name("review").get('Tickets')
+        version, review_data = prod_list_handler.read_for_update("review")
+        list_dict = review_data.get('Tickets')
         add_entry_to_reviews(list_dict, ticket_no, get_user_email(activity), curr_date.strftime("%x"),
                              attachment_actions.inputs["review_notes"])
         reformat = {"Tickets": list_dict}
-        prod_list_handler.save(str(reformat), "review")
+        prod_list_handler.save("review", reformat, version)
 
         return f"Ticket {ticket_no} has been added to Reviews."
 